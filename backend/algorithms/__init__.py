@@ -7,20 +7,24 @@ from simple rule-based strategies to more complex machine learning models.
 Each algorithm extends from the BaseAlgorithm class to maintain a consistent interface.
 """
 
+from importlib import import_module
+from typing import Type, Union
+
 from backend.algorithms.base import BaseAlgorithm
-from backend.algorithms.mean_reversion import MeanReversionStrategy
-from backend.algorithms.trend_following import TrendFollowingStrategy
-from backend.algorithms.ml_models.lstm import LSTMPricePredictor
-from backend.algorithms.ml_models.random_forest import RandomForestStrategy
 
-# Dictionary mapping algorithm names to their class implementations
+# Dictionary mapping algorithm names to their class implementations, given as
+# "module:Class" import paths or as classes. Import paths are imported on first
+# use, so only processes that run an ML strategy load TensorFlow or scikit-learn.
 ALGORITHM_REGISTRY = {
-    "mean_reversion": MeanReversionStrategy,
-    "trend_following": TrendFollowingStrategy,
-    "ml_lstm": LSTMPricePredictor,
-    "random_forest": RandomForestStrategy
+    "mean_reversion": "backend.algorithms.mean_reversion:MeanReversionStrategy",
+    "trend_following": "backend.algorithms.trend_following:TrendFollowingStrategy",
+    "ml_lstm": "backend.algorithms.ml_models.lstm:LSTMPricePredictor",
+    "random_forest": "backend.algorithms.ml_models.random_forest:RandomForestStrategy"
 }
 
+# Import paths of the classes exported by this module
+_EXPORTS = {path.split(":")[1]: path for path in ALGORITHM_REGISTRY.values()}
+
 __all__ = [
     "BaseAlgorithm",
     "MeanReversionStrategy",
@@ -32,6 +36,18 @@ __all__ = [
     "create_algorithm_instance"
 ]
 
+def __getattr__(name: str):
+    # Algorithm classes are imported on first access
+    if name in _EXPORTS:
+        return _load_class(_EXPORTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _load_class(entry: Union[str, Type[BaseAlgorithm]]) -> Type[BaseAlgorithm]:
+    if not isinstance(entry, str):
+        return entry
+    module_name, class_name = entry.split(":")
+    return getattr(import_module(module_name), class_name)
+
 def get_algorithm_class(algorithm_type: str):
     """
     Get the algorithm class for a given algorithm type.
@@ -48,7 +64,8 @@ def get_algorithm_class(algorithm_type: str):
     if algorithm_type not in ALGORITHM_REGISTRY:
         raise ValueError(f"Unknown algorithm type: {algorithm_type}")
     
-    return ALGORITHM_REGISTRY[algorithm_type]
+    # Imports the algorithm's module, and its dependencies, on first use
+    return _load_class(ALGORITHM_REGISTRY[algorithm_type])
 
 def create_algorithm_instance(algorithm_type: str, parameters=None):
     """
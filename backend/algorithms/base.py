@@ -2,11 +2,70 @@
 from abc import ABC, abstractmethod
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+from backend.algorithms.engine import (
+    simulate,
+    simulate_portfolio,
+    build_trades,
+    build_portfolio_trades,
+    build_panel
+)
+from backend.algorithms.utils.indicator_graph import Node, plan_indicators
+from backend.algorithms.utils.performance import TRADING_DAYS_PER_YEAR, calculate_performance_metrics
+from backend.algorithms.utils.streaming import Bar
+
+# Market data columns passed to calculate_panel_units
+PANEL_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+class SignalStream(ABC):
+    """
+    Signal generation for one symbol, one bar at a time.
+    
+    A stream updates its indicators incrementally, so each new bar costs the
+    same however long the history is, and produces the same signal that
+    generate_signals gives for that bar over the full history.
+    """
+    
+    def __init__(self):
+        # Latest indicator values, keyed by the columns calculate_indicators adds
+        self.indicators: Dict[str, float] = {}
+    
+    @abstractmethod
+    def update(self, bar: Bar) -> int:
+        """
+        Add a new bar and get its signal.
+        
+        Args:
+            bar: Mapping of the bar's column values (e.g. 'high', 'low', 'close')
+            
+        Returns:
+            Signal for the bar (1 for buy, -1 for sell, 0 for hold)
+        """
+        pass
+    
+    def warm_up(self, data: pd.DataFrame) -> int:
+        """
+        Feed historical bars through the stream before live updates.
+        
+        Args:
+            data: DataFrame of bars in time order
+            
+        Returns:
+            Signal for the last bar, 0 if there are no bars
+        """
+        signal = 0
+        columns = {name: data[name].to_numpy() for name in data.columns}
+        for row in range(len(data)):
+            signal = self.update({name: values[row] for name, values in columns.items()})
+        return signal
 
 class BaseAlgorithm(ABC):
     """Base class for all trading algorithms."""
     
+    # Parameters that determine the columns added by calculate_indicators
+    INDICATOR_PARAMETERS: List[str] = []
+    
     def __init__(self, parameters: Dict[str, Any] = None):
         """
         Initialize the algorithm with parameters.
@@ -35,6 +94,86 @@ class BaseAlgorithm(ABC):
         """
         pass
     
+    def indicator_graph(self) -> Dict[str, Node]:
+        """
+        Declare the indicator columns the strategy needs.
+        
+        The columns are nodes of an indicator graph built with
+        backend.algorithms.utils.indicator_graph. Declaring every indicator
+        in one graph lets the planner compute sub-computations they share,
+        such as an EMA used by both a MACD and a crossover, once.
+        
+        Returns:
+            Dictionary mapping indicator column names to graph nodes
+        """
+        return {}
+    
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculate the indicator columns the signal rules depend on.
+        
+        Strategies whose indicators depend only on INDICATOR_PARAMETERS can
+        split their signal generation into this step and
+        generate_signals_from_indicators, so that parameter sets sharing the
+        same indicator parameters reuse one indicator frame. The default
+        implementation adds the columns declared by indicator_graph.
+        
+        Args:
+            data: DataFrame with market data
+            
+        Returns:
+            DataFrame with added indicator columns
+        """
+        outputs = self.indicator_graph()
+        if not outputs:
+            return data
+        
+        return plan_indicators(outputs).apply(data)
+    
+    def generate_signals_from_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate trading signals from a frame returned by calculate_indicators.
+        
+        Args:
+            data: DataFrame with market data and indicator columns
+            
+        Returns:
+            DataFrame with added signal column
+        """
+        return self.generate_signals(data)
+    
+    def calculate_panel_units(self, panel: Dict[str, pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """
+        Calculate the order sizes of many symbols in one vectorized pass.
+        
+        Strategies whose signals and order sizes depend only on each symbol's
+        own bars can override this with a panel equivalent of
+        generate_signals followed by calculate_position_units, which replaces
+        one call per symbol in portfolio backtests. The default
+        implementation returns None, meaning there is no panel version.
+        
+        Args:
+            panel: Dictionary mapping market data columns ('open', 'high',
+                'low', 'close', 'volume') to time x symbols DataFrames. Each
+                symbol's bars are contiguous with a close price on every bar,
+                and its columns are NaN before its first bar and after its
+                last one
+            
+        Returns:
+            Time x symbols DataFrame of shares to trade per unit of portfolio
+            value, or None
+        """
+        return None
+    
+    def create_signal_stream(self) -> SignalStream:
+        """
+        Create a stream that generates this algorithm's signals bar by bar.
+        
+        Returns:
+            New SignalStream with empty indicator state
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming signals")
+    
     @abstractmethod
     def calculate_position_sizes(self, data: pd.DataFrame, portfolio_value: float) -> pd.DataFrame:
         """
@@ -49,76 +188,257 @@ class BaseAlgorithm(ABC):
         """
         pass
     
-    def backtest(self, data: pd.DataFrame, initial_capital: float = 10000.0) -> Dict[str, Any]:
+    def calculate_position_units(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Calculate the shares to trade at each bar per unit of portfolio value.
+        
+        The default implementation replays calculate_position_sizes over every
+        prefix of the data with a portfolio value of 1, which is O(n^2).
+        Strategies should override it with a vectorized equivalent.
+        
+        Args:
+            data: DataFrame with market data and signals
+            
+        Returns:
+            Series of order sizes aligned with the data index
+        """
+        units = np.zeros(len(data))
+        
+        for i in range(len(data)):
+            position_data = self.calculate_position_sizes(data.iloc[:i + 1], 1.0)
+            units[i] = position_data['position_size'].iloc[-1]
+        
+        return pd.Series(units, index=data.index)
+    
+    def backtest(
+        self,
+        data: pd.DataFrame,
+        initial_capital: float = 10000.0,
+        on_progress: Optional[Callable[[pd.Timestamp, float, float], None]] = None,
+        periods_per_year: int = TRADING_DAYS_PER_YEAR,
+        columnar: bool = False
+    ) -> Dict[str, Any]:
         """
         Run a backtest of the algorithm on historical data.
         
         Args:
             data: DataFrame with market data
             initial_capital: Starting capital for the backtest
+            on_progress: Callback receiving the simulated timestamp, the
+                fraction of bars simulated and the portfolio value, throttled
+                by the engine (optional)
+            periods_per_year: Number of bars per year, for annualized metrics
+            columnar: Return the equity curve as a DataFrame with timestamp
+                and portfolio_value columns instead of a list of points
             
         Returns:
             Dictionary with backtest results
         """
-        # Generate signals
-        data_with_signals = self.generate_signals(data)
-        
-        # Initialize backtest variables
-        portfolio_value = initial_capital
-        cash = initial_capital
-        positions = {}
-        trades = []
-        equity_curve = []
-        
-        # Run backtest simulation
-        for i, row in data_with_signals.iterrows():
-            # Calculate position sizes for this timestamp
-            position_data = self.calculate_position_sizes(
-                data_with_signals.loc[:i],
-                portfolio_value
-            )
-            current_row = position_data.iloc[-1]
-            
-            # Execute trades based on position changes
-            # ... (trade execution logic)
+        return self.simulate_signals(
+            self.generate_signals(data),
+            initial_capital,
+            on_progress=on_progress,
+            periods_per_year=periods_per_year,
+            columnar=columnar
+        )
+    
+    def simulate_signals(
+        self,
+        data_with_signals: pd.DataFrame,
+        initial_capital: float = 10000.0,
+        on_progress: Optional[Callable[[pd.Timestamp, float, float], None]] = None,
+        periods_per_year: int = TRADING_DAYS_PER_YEAR,
+        columnar: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Simulate trading on data that already carries a signal column.
+        
+        Args:
+            data_with_signals: DataFrame with market data and signals
+            initial_capital: Starting capital for the backtest
+            on_progress: Progress callback, as for backtest (optional)
+            periods_per_year: Number of bars per year, as for backtest
+            columnar: Equity curve format, as for backtest
             
-            # Update portfolio value
-            # ... (portfolio value calculation)
+        Returns:
+            Dictionary with backtest results
+        """
+        # Size orders for every bar up front and simulate them in one pass
+        order_units = self.calculate_position_units(data_with_signals)
+        close = data_with_signals['close'].to_numpy(dtype=np.float64)
+        simulation = simulate(
+            close,
+            order_units.to_numpy(dtype=np.float64),
+            initial_capital,
+            on_progress=_bar_progress(data_with_signals.index, on_progress)
+        )
+        
+        trades = build_trades(data_with_signals.index, close, simulation["fills"])
+        
+        # Record equity curve
+        equity_df = pd.DataFrame(
+            {'portfolio_value': simulation["equity"]},
+            index=data_with_signals.index
+        )
+        equity_df.index.name = 'timestamp'
+        
+        return {
+            "equity_curve": _equity_curve(equity_df, columnar),
+            "trades": trades,
+            "metrics": calculate_performance_metrics(
+                simulation["equity"],
+                initial_capital,
+                total_trades=len(trades),
+                position_value=simulation["position_value"],
+                traded_value=simulation["traded_value"],
+                periods_per_year=periods_per_year
+            )
+        }
+    
+    def backtest_portfolio(
+        self,
+        data: Dict[str, pd.DataFrame],
+        initial_capital: float = 10000.0,
+        max_position_pct: Optional[float] = None,
+        max_gross_exposure: Optional[float] = None,
+        on_progress: Optional[Callable[[pd.Timestamp, float, float], None]] = None,
+        periods_per_year: int = TRADING_DAYS_PER_YEAR,
+        columnar: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run a backtest over several symbols sharing one cash account.
+        
+        Signals and order sizes are aligned into a time x symbols panel and
+        simulated together, so every order is sized from the value of the
+        whole portfolio. They are computed for all symbols in one pass when
+        the strategy implements calculate_panel_units, and per symbol
+        otherwise.
+        
+        Args:
+            data: Dictionary mapping symbols to DataFrames with market data
+            initial_capital: Starting capital shared by all symbols
+            max_position_pct: Maximum position value per symbol as a fraction
+                of portfolio value (optional)
+            max_gross_exposure: Maximum gross exposure as a fraction of
+                portfolio value (optional)
+            on_progress: Progress callback, as for backtest (optional)
+            periods_per_year: Number of bars per year, as for backtest
+            columnar: Equity curve format, as for backtest
             
-            # Record equity curve
-            equity_curve.append({
-                'timestamp': row.name,
-                'portfolio_value': portfolio_value
-            })
-        
-        # Calculate performance metrics
-        equity_df = pd.DataFrame(equity_curve).set_index('timestamp')
-        returns = equity_df['portfolio_value'].pct_change().dropna()
-        
-        # Calculate key metrics
-        annualized_return = (equity_df['portfolio_value'].iloc[-1] / initial_capital) ** (252 / len(equity_df)) - 1
-        daily_returns = returns
-        excess_returns = daily_returns - 0.0001  # Assuming 0.01% daily risk-free rate
-        sharpe_ratio = (excess_returns.mean() / excess_returns.std()) * np.sqrt(252) if len(excess_returns) > 0 and excess_returns.std() > 0 else 0
-        
-        # Calculate drawdowns
-        cumulative_returns = (1 + returns).cumprod()
-        running_max = cumulative_returns.cummax()
-        drawdowns = (cumulative_returns / running_max) - 1
-        max_drawdown = drawdowns.min() if not drawdowns.empty else 0
-        
-        # Calculate win rate
-        win_rate = len(daily_returns[daily_returns > 0]) / len(daily_returns) if len(daily_returns) > 0 else 0
+        Returns:
+            Dictionary with backtest results
+        """
+        symbols = list(data.keys())
+        index, close = build_panel({symbol: symbol_data['close'] for symbol, symbol_data in data.items()})
+        order_units = self._portfolio_order_units(data, index, close)
+        
+        simulation = simulate_portfolio(
+            close,
+            order_units,
+            initial_capital,
+            max_position_pct=max_position_pct,
+            max_gross_exposure=max_gross_exposure,
+            on_progress=_bar_progress(index, on_progress)
+        )
+        
+        trades = build_portfolio_trades(index, symbols, close, simulation["fills"])
+        
+        equity_df = pd.DataFrame({'portfolio_value': simulation["equity"]}, index=index)
+        equity_df.index.name = 'timestamp'
         
         return {
-            "equity_curve": equity_df.to_dict(orient='records'),
+            "equity_curve": _equity_curve(equity_df, columnar),
             "trades": trades,
-            "metrics": {
-                "annualized_return": annualized_return,
-                "sharpe_ratio": sharpe_ratio,
-                "max_drawdown": max_drawdown,
-                "win_rate": win_rate,
-                "total_trades": len(trades),
-                "final_portfolio_value": portfolio_value
-            }
-        }
\ No newline at end of file
+            "metrics": calculate_performance_metrics(
+                simulation["equity"],
+                initial_capital,
+                total_trades=len(trades),
+                position_value=simulation["position_value"],
+                traded_value=simulation["traded_value"],
+                periods_per_year=periods_per_year
+            )
+        }
+    
+    def _portfolio_order_units(self, data: Dict[str, pd.DataFrame], index: pd.Index, close: np.ndarray) -> np.ndarray:
+        symbols = list(data.keys())
+        order_units = np.zeros_like(close)
+        
+        # A panel column matches its symbol's own series only while the
+        # symbol's bars are contiguous, so symbols with gaps run separately
+        starts = [_contiguous_start(data[symbol], index) for symbol in symbols]
+        panel_columns = [i for i, start in enumerate(starts) if start is not None]
+        per_symbol = [i for i, start in enumerate(starts) if start is None]
+        
+        if panel_columns:
+            panel = {}
+            for column in PANEL_COLUMNS:
+                if not all(column in data[symbols[i]].columns for i in panel_columns):
+                    continue
+                values = np.full((len(index), len(panel_columns)), np.nan)
+                for j, i in enumerate(panel_columns):
+                    column_values = data[symbols[i]][column].to_numpy(dtype=np.float64)
+                    values[starts[i]:starts[i] + len(column_values), j] = column_values
+                panel[column] = pd.DataFrame(values, index=index, columns=[symbols[i] for i in panel_columns], copy=False)
+            
+            units = self.calculate_panel_units(panel)
+            
+            if units is None:
+                per_symbol = list(range(len(symbols)))
+            else:
+                units = units.to_numpy(dtype=np.float64)
+                order_units[:, panel_columns] = np.where(np.isnan(units), 0.0, units)
+        
+        for i in per_symbol:
+            data_with_signals = self.generate_signals(data[symbols[i]])
+            units = self.calculate_position_units(data_with_signals)
+            order_units[:, i] = units.reindex(index).fillna(0.0).to_numpy(dtype=np.float64)
+        
+        return order_units
+    
+    def evaluate(self, data_with_signals: pd.DataFrame, initial_capital: float = 10000.0) -> Dict[str, Any]:
+        """
+        Simulate precomputed signals and return only the performance metrics.
+        
+        Used by parameter sweeps, which do not need the equity curve and trade
+        records of every parameter set.
+        
+        Args:
+            data_with_signals: DataFrame with market data and signals
+            initial_capital: Starting capital for the backtest
+            
+        Returns:
+            Dictionary with performance metrics
+        """
+        order_units = self.calculate_position_units(data_with_signals)
+        close = data_with_signals['close'].to_numpy(dtype=np.float64)
+        simulation = simulate(close, order_units.to_numpy(dtype=np.float64), initial_capital)
+        
+        return calculate_performance_metrics(
+            simulation["equity"],
+            initial_capital,
+            total_trades=int(np.count_nonzero(simulation["fills"])),
+            position_value=simulation["position_value"],
+            traded_value=simulation["traded_value"]
+        )
+
+def _contiguous_start(symbol_data: pd.DataFrame, index: pd.Index) -> Optional[int]:
+    # Row of the panel index where the symbol's bars start, if they fill one
+    # unbroken run of it and each has a close price
+    positions = index.get_indexer(symbol_data.index)
+    if len(positions) == 0 or not np.all(np.diff(positions) == 1) or symbol_data['close'].isna().any():
+        return None
+    return int(positions[0])
+
+def _bar_progress(
+    index: pd.Index,
+    on_progress: Optional[Callable[[pd.Timestamp, float, float], None]]
+) -> Optional[Callable[[int, float], None]]:
+    """Translate engine bar positions into timestamps and completed fractions."""
+    if on_progress is None:
+        return None
+    return lambda i, value: on_progress(index[i], (i + 1) / len(index), value)
+
+def _equity_curve(equity_df: pd.DataFrame, columnar: bool):
+    """Format an equity curve as a timestamp/portfolio_value frame or a list of points."""
+    curve = equity_df.reset_index()
+    return curve if columnar else curve.to_dict(orient='records')
@@ -0,0 +1,275 @@
+"""
+Array-based simulation engine for backtests.
+
+The engine turns a per-bar order column into fills, positions, cash and an
+equity curve using NumPy arrays. Orders are expressed in shares per unit of
+portfolio value, so a strategy can size every bar up front without knowing
+the path-dependent portfolio value at that bar.
+
+Prices and orders are upcast to float64, so cash, positions and PnL always
+accumulate in float64, including over float32 bars and indicators.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+# Minimum seconds between progress callbacks from a simulation loop
+PROGRESS_INTERVAL = 0.25
+
+def simulate(
+    close: np.ndarray,
+    order_units: np.ndarray,
+    initial_capital: float = 10000.0,
+    on_progress: Optional[Callable[[int, float], None]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate order execution over a single price series.
+
+    Orders are filled at the bar's close, and no orders are placed once the
+    portfolio value is no longer positive. Between orders cash and position are
+    constant, so only bars that carry an order are visited in Python; positions,
+    cash and equity for every bar are then rebuilt with cumulative sums.
+
+    Args:
+        close: Array of fill prices
+        order_units: Array of shares to trade per unit of portfolio value
+            (positive for buy, negative for sell, 0 for no order)
+        initial_capital: Starting cash
+        on_progress: Callback receiving the bar index and portfolio value,
+            called at most every PROGRESS_INTERVAL seconds (optional)
+
+    Returns:
+        Dictionary with 'fills', 'position', 'cash' and 'equity' arrays, plus
+        'position_value' (gross) and 'traded_value' arrays for metrics
+    """
+    prices = np.asarray(close, dtype=np.float64)
+    units = np.asarray(order_units, dtype=np.float64)
+
+    if prices.shape != units.shape:
+        raise ValueError("close and order_units must have the same shape")
+
+    # Orders on missing or non-positive prices cannot be filled
+    tradable = np.isfinite(prices) & (prices > 0)
+    units = np.where(tradable & np.isfinite(units), units, 0.0)
+
+    fills = np.zeros(len(prices))
+    cash = float(initial_capital)
+    position = 0.0
+    last_report = time.monotonic()
+
+    # Size each order from the portfolio value at the moment it is placed
+    for i in np.flatnonzero(units):
+        price = prices[i]
+        value = cash + position * price
+
+        # A wiped-out account places no further orders
+        if value <= 0:
+            break
+
+        if on_progress is not None and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+            on_progress(int(i), value)
+            last_report = time.monotonic()
+
+        quantity = units[i] * value
+        cash -= quantity * price
+        position += quantity
+        fills[i] = quantity
+
+    positions = np.cumsum(fills)
+    cash_balance = initial_capital - np.cumsum(fills * np.where(tradable, prices, 0.0))
+
+    # Carry the last valid price forward so missing bars do not break the equity curve
+    marks = pd.Series(np.where(tradable, prices, np.nan)).ffill().fillna(0.0).to_numpy()
+    equity = cash_balance + positions * marks
+
+    return {
+        "fills": fills,
+        "position": positions,
+        "cash": cash_balance,
+        "equity": equity,
+        "position_value": np.abs(positions * marks),
+        "traded_value": np.abs(fills) * np.where(tradable, prices, 0.0)
+    }
+
+def build_trades(
+    index: pd.Index,
+    close: np.ndarray,
+    fills: np.ndarray
+) -> List[Dict[str, Any]]:
+    """
+    Build the trade list from simulated fills.
+
+    Args:
+        index: Timestamps of the simulated bars
+        close: Array of fill prices
+        fills: Array of filled quantities (positive for buy, negative for sell)
+
+    Returns:
+        List of trade dictionaries
+    """
+    trades = []
+
+    for i in np.flatnonzero(fills):
+        quantity = float(fills[i])
+        price = float(close[i])
+        trades.append({
+            "timestamp": index[i],
+            "type": "buy" if quantity > 0 else "sell",
+            "price": price,
+            "quantity": abs(quantity),
+            "total": abs(quantity) * price
+        })
+
+    return trades
+
+def build_panel(series: Dict[str, pd.Series], fill_value: float = np.nan) -> Tuple[pd.Index, np.ndarray]:
+    """
+    Align per-symbol series into a time x symbols panel.
+
+    Args:
+        series: Dictionary mapping symbols to series indexed by timestamp
+        fill_value: Value for timestamps missing from a symbol's history
+
+    Returns:
+        Tuple of (union timestamp index, 2-D array with one column per symbol)
+    """
+    panel = pd.concat(series, axis=1).sort_index()
+
+    if not np.isnan(fill_value):
+        panel = panel.fillna(fill_value)
+
+    return panel.index, panel.to_numpy(dtype=np.float64)
+
+def simulate_portfolio(
+    close: np.ndarray,
+    order_units: np.ndarray,
+    initial_capital: float = 10000.0,
+    max_position_pct: Optional[float] = None,
+    max_gross_exposure: Optional[float] = None,
+    on_progress: Optional[Callable[[int, float], None]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate order execution for several symbols sharing one cash account.
+
+    Inputs are time x symbols panels. Orders on the same bar are sized from
+    the same portfolio value and executed together. Only bars carrying at
+    least one order are visited in Python, and each visit is vectorized across
+    symbols.
+
+    Args:
+        close: 2-D array of fill prices (NaN where a symbol has no bar)
+        order_units: 2-D array of shares to trade per unit of portfolio value
+        initial_capital: Starting cash shared by all symbols
+        max_position_pct: Maximum absolute position value per symbol as a
+            fraction of portfolio value (optional)
+        max_gross_exposure: Maximum sum of absolute position values as a
+            fraction of portfolio value (optional)
+        on_progress: Callback receiving the bar index and portfolio value,
+            called at most every PROGRESS_INTERVAL seconds (optional)
+
+    Returns:
+        Dictionary with 2-D 'fills' and 'position' arrays and 1-D 'cash',
+        'equity', 'position_value' (gross) and 'traded_value' arrays
+    """
+    prices = np.asarray(close, dtype=np.float64)
+    units = np.asarray(order_units, dtype=np.float64)
+
+    if prices.ndim != 2 or prices.shape != units.shape:
+        raise ValueError("close and order_units must be 2-D arrays of the same shape")
+
+    tradable = np.isfinite(prices) & (prices > 0)
+    units = np.where(tradable & np.isfinite(units), units, 0.0)
+    safe_prices = np.where(tradable, prices, 0.0)
+
+    # Carry the last valid price forward to mark positions on missing bars
+    marks = pd.DataFrame(np.where(tradable, prices, np.nan)).ffill().fillna(0.0).to_numpy()
+
+    fills = np.zeros(prices.shape)
+    cash = float(initial_capital)
+    position = np.zeros(prices.shape[1])
+    last_report = time.monotonic()
+
+    for t in np.flatnonzero(units.any(axis=1)):
+        price = safe_prices[t]
+        value = cash + position @ marks[t]
+
+        # A wiped-out account places no further orders
+        if value <= 0:
+            break
+
+        if on_progress is not None and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+            on_progress(int(t), value)
+            last_report = time.monotonic()
+
+        has_order = units[t] != 0
+        target = position + units[t] * value
+
+        # Cap each symbol's position at a fraction of portfolio value
+        if max_position_pct is not None:
+            cap = np.divide(max_position_pct * value, price, out=np.zeros_like(price), where=price > 0)
+            target = np.where(has_order, np.clip(target, -cap, cap), target)
+
+        # Scale down orders that add exposure when the gross limit is exceeded
+        if max_gross_exposure is not None:
+            gross = np.abs(target) @ marks[t]
+            limit = max_gross_exposure * value
+            added = (np.abs(target) - np.abs(position)) * marks[t]
+            increasing = has_order & (added > 0)
+            added_total = added[increasing].sum()
+            if gross > limit and added_total > 0:
+                scale = max(0.0, 1.0 - (gross - limit) / added_total)
+                target = np.where(increasing, position + (target - position) * scale, target)
+
+        quantity = np.where(has_order, target - position, 0.0)
+        cash -= quantity @ price
+        position += quantity
+        fills[t] = quantity
+
+    positions = np.cumsum(fills, axis=0)
+    cash_balance = initial_capital - np.cumsum((fills * safe_prices).sum(axis=1))
+    equity = cash_balance + (positions * marks).sum(axis=1)
+
+    return {
+        "fills": fills,
+        "position": positions,
+        "cash": cash_balance,
+        "equity": equity,
+        "position_value": (np.abs(positions) * marks).sum(axis=1),
+        "traded_value": (np.abs(fills) * safe_prices).sum(axis=1)
+    }
+
+def build_portfolio_trades(
+    index: pd.Index,
+    symbols: List[str],
+    close: np.ndarray,
+    fills: np.ndarray
+) -> List[Dict[str, Any]]:
+    """
+    Build the trade list from simulated portfolio fills.
+
+    Args:
+        index: Timestamps of the simulated bars
+        symbols: Symbols in panel column order
+        close: 2-D array of fill prices
+        fills: 2-D array of filled quantities
+
+    Returns:
+        List of trade dictionaries ordered by timestamp
+    """
+    trades = []
+
+    for t, s in zip(*np.nonzero(fills)):
+        quantity = float(fills[t, s])
+        price = float(close[t, s])
+        trades.append({
+            "timestamp": index[t],
+            "symbol": symbols[s],
+            "type": "buy" if quantity > 0 else "sell",
+            "price": price,
+            "quantity": abs(quantity),
+            "total": abs(quantity) * price
+        })
+
+    return trades
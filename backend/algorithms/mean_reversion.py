@@ -3,8 +3,10 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any
 
-from backend.algorithms.base import BaseAlgorithm
-from backend.algorithms.utils.indicators import calculate_bollinger_bands, calculate_rsi
+from backend.algorithms.base import BaseAlgorithm, SignalStream
+from backend.algorithms.utils import indicator_graph as graph
+from backend.algorithms.utils.indicators import calculate_panel_bollinger_bands, calculate_panel_rsi
+from backend.algorithms.utils.streaming import Bar, StreamingBollingerBands, StreamingRSI
 
 class MeanReversionStrategy(BaseAlgorithm):
     """
@@ -23,6 +25,9 @@ class MeanReversionStrategy(BaseAlgorithm):
         "position_size_pct": 0.1  # 10% of portfolio per position
     }
     
+    # Parameters that determine the indicator columns
+    INDICATOR_PARAMETERS = ["bollinger_window", "bollinger_std", "rsi_window"]
+    
     def __init__(self, parameters: Dict[str, Any] = None):
         """Initialize with default parameters and override with provided ones."""
         merged_params = {**self.DEFAULT_PARAMETERS, **(parameters or {})}
@@ -59,52 +64,73 @@ class MeanReversionStrategy(BaseAlgorithm):
         if not isinstance(self.parameters["position_size_pct"], (int, float)) or not 0 < self.parameters["position_size_pct"] <= 1:
             raise ValueError("position_size_pct must be a number between 0 and 1")
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+    def indicator_graph(self) -> Dict[str, graph.Node]:
+        """Declare the Bollinger Bands and RSI of the close."""
+        close = graph.column('close')
+        middle, upper, lower = graph.bollinger_bands(close, self.parameters["bollinger_window"], self.parameters["bollinger_std"])
+        
+        return {
+            'middle_band': middle,
+            'upper_band': upper,
+            'lower_band': lower,
+            'rsi': graph.rsi(close, self.parameters["rsi_window"])
+        }
+    
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """
-        Generate trading signals based on Bollinger Bands and RSI.
+        Calculate Bollinger Bands and RSI.
         
         Args:
             data: DataFrame with at least 'close' price column
             
         Returns:
-            DataFrame with added 'signal' column (1 for buy, -1 for sell, 0 for hold)
+            DataFrame with added Bollinger Band and RSI columns
         """
-        # Make a copy to avoid modifying original data
-        df = data.copy()
-        
         # Check if required column exists
-        if 'close' not in df.columns:
+        if 'close' not in data.columns:
             raise ValueError("DataFrame must contain 'close' price column")
         
-        # Calculate Bollinger Bands
-        df = calculate_bollinger_bands(
-            df, 
-            window=self.parameters["bollinger_window"],
-            num_std=self.parameters["bollinger_std"]
-        )
-        
-        # Calculate RSI
-        df = calculate_rsi(df, window=self.parameters["rsi_window"])
+        return super().calculate_indicators(data)
+    
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate trading signals based on Bollinger Bands and RSI.
         
-        # Initialize signal column
-        df['signal'] = 0
+        Args:
+            data: DataFrame with at least 'close' price column
+            
+        Returns:
+            DataFrame with added 'signal' column (1 for buy, -1 for sell, 0 for hold)
+        """
+        return self.generate_signals_from_indicators(self.calculate_indicators(data))
+    
+    def generate_signals_from_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the Bollinger Band and RSI entry rules to precomputed indicators.
         
-        # Generate buy signals (price below lower BB and RSI oversold)
-        buy_condition = (
-            (df['close'] < df['lower_band']) & 
-            (df['rsi'] < self.parameters["rsi_oversold"])
+        Args:
+            data: DataFrame returned by calculate_indicators
+            
+        Returns:
+            DataFrame with added 'signal' column (1 for buy, -1 for sell, 0 for hold)
+        """
+        signal = self._entry_signal(
+            data['close'].to_numpy(),
+            data['lower_band'].to_numpy(),
+            data['upper_band'].to_numpy(),
+            data['rsi'].to_numpy()
         )
-        df.loc[buy_condition, 'signal'] = 1
         
-        # Generate sell signals (price above upper BB and RSI overbought)
-        sell_condition = (
-            (df['close'] > df['upper_band']) & 
-            (df['rsi'] > self.parameters["rsi_overbought"])
-        )
-        df.loc[sell_condition, 'signal'] = -1
+        # A shallow copy leaves shared indicator data untouched without copying it
+        df = data.copy(deep=False)
+        df['signal'] = signal
         
         return df
     
+    def create_signal_stream(self) -> SignalStream:
+        """Create a stream of Bollinger Band and RSI signals for live bars."""
+        return MeanReversionSignalStream(self.parameters)
+    
     def calculate_position_sizes(self, data: pd.DataFrame, portfolio_value: float) -> pd.DataFrame:
         """
         Calculate position sizes based on signals and risk management rules.
@@ -133,4 +159,100 @@ class MeanReversionStrategy(BaseAlgorithm):
         df['signal_change'] = df['signal'].diff().fillna(0)
         df.loc[df['signal_change'] == 0, 'position_size'] = 0
         
-        return df
\ No newline at end of file
+        return df
+
+    def calculate_position_units(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Calculate the shares to trade at each bar per unit of portfolio value.
+        
+        Vectorized equivalent of calculate_position_sizes applied bar by bar.
+        
+        Args:
+            data: DataFrame with market data and signals
+            
+        Returns:
+            Series of order sizes aligned with the data index
+        """
+        close = data['close']
+        shares = (self.parameters["position_size_pct"] / close).where(close > 0, 0)
+        
+        # Only take action on new signals (when signal changes)
+        signal_change = data['signal'].diff().fillna(0)
+        units = data['signal'] * shares
+        
+        return units.where(signal_change != 0, 0)
+    
+    def calculate_panel_units(self, panel: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Calculate entry order sizes for many symbols in one vectorized pass.
+        
+        Panel equivalent of generate_signals followed by calculate_position_units.
+        
+        Args:
+            panel: Dictionary mapping 'close' to a time x symbols DataFrame
+            
+        Returns:
+            Time x symbols DataFrame of order sizes
+        """
+        if 'close' not in panel:
+            raise ValueError("Panel must contain a 'close' column")
+        
+        close_panel = panel['close']
+        bands = calculate_panel_bollinger_bands(close_panel, self.parameters["bollinger_window"], self.parameters["bollinger_std"])
+        rsi = calculate_panel_rsi(close_panel, self.parameters["rsi_window"])
+        
+        close = close_panel.to_numpy(dtype=np.float64)
+        signal = self._entry_signal(close, bands['lower_band'].to_numpy(), bands['upper_band'].to_numpy(), rsi.to_numpy())
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = np.where(close > 0, self.parameters["position_size_pct"] / close, 0.0)
+        
+        # Only take action on new signals; a symbol's first bar has no previous signal
+        signal_on_bars = np.where(np.isnan(close), np.nan, signal)
+        signal_change = np.full_like(signal_on_bars, np.nan)
+        signal_change[1:] = signal_on_bars[1:] - signal_on_bars[:-1]
+        new_signal = (signal_change != 0) & ~np.isnan(signal_change)
+        
+        return pd.DataFrame(np.where(new_signal, signal * shares, 0.0), index=close_panel.index, columns=close_panel.columns)
+    
+    def _entry_signal(self, close: np.ndarray, lower_band: np.ndarray, upper_band: np.ndarray, rsi: np.ndarray) -> np.ndarray:
+        # Works elementwise on a series or a time x symbols panel
+        signal = np.zeros(np.shape(close), dtype=np.int64)
+        
+        # Generate buy signals (price below lower BB and RSI oversold)
+        buy_condition = (close < lower_band) & (rsi < self.parameters["rsi_oversold"])
+        signal[buy_condition] = 1
+        
+        # Generate sell signals (price above upper BB and RSI overbought)
+        sell_condition = (close > upper_band) & (rsi > self.parameters["rsi_overbought"])
+        signal[sell_condition] = -1
+        
+        return signal
+
+class MeanReversionSignalStream(SignalStream):
+    """Bollinger Band and RSI entry signals updated one bar at a time."""
+    
+    def __init__(self, parameters: Dict[str, Any]):
+        super().__init__()
+        self.parameters = parameters
+        self._bands = StreamingBollingerBands(parameters["bollinger_window"], parameters["bollinger_std"])
+        self._rsi = StreamingRSI(parameters["rsi_window"])
+    
+    def update(self, bar: Bar) -> int:
+        """Add a new bar and get its entry signal."""
+        middle_band, upper_band, lower_band = self._bands.update(bar)
+        rsi = self._rsi.update(bar)
+        self.indicators = {
+            "middle_band": middle_band,
+            "upper_band": upper_band,
+            "lower_band": lower_band,
+            "rsi": rsi
+        }
+        
+        close = bar['close']
+        # Sell conditions take precedence, as in generate_signals
+        if close > upper_band and rsi > self.parameters["rsi_overbought"]:
+            return -1
+        if close < lower_band and rsi < self.parameters["rsi_oversold"]:
+            return 1
+        return 0
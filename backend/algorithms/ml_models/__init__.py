@@ -6,10 +6,21 @@ This module contains machine learning-based trading strategy implementations
 that use various ML approaches to predict market movements and generate signals.
 """
 
-from backend.algorithms.ml_models.lstm import LSTMPricePredictor
-from backend.algorithms.ml_models.random_forest import RandomForestStrategy
+from importlib import import_module
+
+# Modules of the exported classes, imported on first access since they load
+# TensorFlow and scikit-learn
+_EXPORTS = {
+    "LSTMPricePredictor": "backend.algorithms.ml_models.lstm",
+    "RandomForestStrategy": "backend.algorithms.ml_models.random_forest"
+}
 
 __all__ = [
     "LSTMPricePredictor",
     "RandomForestStrategy"
-]
\ No newline at end of file
+]
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
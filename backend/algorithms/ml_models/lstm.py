@@ -1,6 +1,8 @@
 # backend/algorithms/ml_models/lstm.py
+import os
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Any, Tuple
 import logging
 from datetime import datetime
@@ -10,13 +12,21 @@ import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.optimizers import Adam
+import joblib
 from sklearn.preprocessing import MinMaxScaler
 
 from backend.algorithms.base import BaseAlgorithm
+from backend.algorithms.ml_models.model_pool import model_pool
+from backend.algorithms.ml_models.model_registry import model_registry
+from backend.algorithms.utils import indicator_graph as graph
 from backend.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+def _sequences(values: np.ndarray, length: int) -> np.ndarray:
+    """Read-only view of every run of length consecutive rows, shaped (n, length, features)."""
+    return sliding_window_view(values, length, axis=0).transpose(0, 2, 1)
+
 class LSTMPricePredictor(BaseAlgorithm):
     """
     Long Short-Term Memory (LSTM) model for price prediction and trading signals.
@@ -31,9 +41,19 @@ class LSTMPricePredictor(BaseAlgorithm):
         "features": ["close", "volume", "rsi", "macd"],
         "epochs": 50,
         "threshold": 0.6,
-        "position_size_pct": 0.1  # 10% of portfolio per position
+        "position_size_pct": 0.1,  # 10% of portfolio per position
+        "force_retrain": False  # Fit the model even if a fitted one is stored
     }
     
+    # Parameters the fitted model depends on; the others only affect signals and sizing
+    MODEL_PARAMETERS = ["sequence_length", "prediction_horizon", "features", "epochs"]
+    
+    # Sequences per training step
+    TRAINING_BATCH_SIZE = 32
+    
+    # Sequences scored per model call when generating signals
+    PREDICTION_BATCH_SIZE = 4096
+    
     def __init__(self, parameters: Dict[str, Any] = None):
         """Initialize with default parameters and override with provided ones."""
         merged_params = {**self.DEFAULT_PARAMETERS, **(parameters or {})}
@@ -48,7 +68,7 @@ class LSTMPricePredictor(BaseAlgorithm):
         """Validate strategy parameters."""
         required_params = [
             "sequence_length", "prediction_horizon", "features",
-            "epochs", "threshold", "position_size_pct"
+            "epochs", "threshold", "position_size_pct", "force_retrain"
         ]
         
         for param in required_params:
@@ -73,6 +93,30 @@ class LSTMPricePredictor(BaseAlgorithm):
         
         if not isinstance(self.parameters["position_size_pct"], (int, float)) or not 0 < self.parameters["position_size_pct"] <= 1:
             raise ValueError("position_size_pct must be between 0 and 1")
+        
+        if not isinstance(self.parameters["force_retrain"], bool):
+            raise ValueError("force_retrain must be a boolean")
+    
+    def indicator_graph(self) -> Dict[str, graph.Node]:
+        """Declare the standard indicators, such as 'rsi' and 'macd', named in features."""
+        standard = graph.standard_indicators()
+        return {feature: standard[feature] for feature in self.parameters["features"] if feature in standard}
+    
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculate the declared indicators, keeping those the data already has.
+        
+        Indicators that need columns the data lacks are left out, so that
+        preprocess_data skips them like any other missing feature.
+        
+        Args:
+            data: DataFrame with market data
+            
+        Returns:
+            DataFrame with added indicator columns
+        """
+        plan = graph.plan_indicators(self.indicator_graph())
+        return plan.apply(data, plan.available(data.columns), keep_existing=True)
     
     def preprocess_data(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -82,7 +126,8 @@ class LSTMPricePredictor(BaseAlgorithm):
             data: DataFrame with market data
             
         Returns:
-            Tuple of (X, y) arrays for training/prediction
+            Tuple of (X, y) arrays for training/prediction, where X is a
+            read-only view over the scaled data
         """
         # Ensure all required features are present
         required_features = ["close"]
@@ -106,25 +151,30 @@ class LSTMPricePredictor(BaseAlgorithm):
         # Get data subset with selected features
         dataset = data[self.feature_columns].values
         
-        # Scale the data
+        # Scale the data with a new scaler, since a pooled one is shared
+        self.scaler = MinMaxScaler(feature_range=(0, 1))
         scaled_data = self.scaler.fit_transform(dataset)
         
         # Create sequences for LSTM
-        X, y = [], []
         seq_length = self.parameters["sequence_length"]
         pred_horizon = self.parameters["prediction_horizon"]
+        n_samples = len(scaled_data) - seq_length - pred_horizon
         
-        for i in range(len(scaled_data) - seq_length - pred_horizon):
-            X.append(scaled_data[i:(i + seq_length)])
-            
-            # Target is the close price 'pred_horizon' steps ahead
-            future_close = scaled_data[i + seq_length + pred_horizon, self.feature_columns.index("close")]
-            current_close = scaled_data[i + seq_length - 1, self.feature_columns.index("close")]
-            
-            # Convert to binary target: 1 if price goes up, 0 if it goes down
-            y.append(1 if future_close > current_close else 0)
+        if n_samples <= 0:
+            return np.empty((0, seq_length, len(self.feature_columns))), np.empty(0, dtype=np.int64)
+        
+        # Sequences are a strided view over the scaled data, not copies of it
+        X = _sequences(scaled_data, seq_length)[:n_samples]
+        
+        # Target is the close price 'pred_horizon' steps ahead
+        close = scaled_data[:, self.feature_columns.index("close")]
+        future_close = close[seq_length + pred_horizon:seq_length + pred_horizon + n_samples]
+        current_close = close[seq_length - 1:seq_length - 1 + n_samples]
         
-        return np.array(X), np.array(y)
+        # Convert to binary target: 1 if price goes up, 0 if it goes down
+        y = (future_close > current_close).astype(np.int64)
+        
+        return X, y
     
     def build_model(self, input_shape: Tuple[int, int]):
         """
@@ -150,6 +200,34 @@ class LSTMPricePredictor(BaseAlgorithm):
         
         self.model = model
     
+    def _sequence_dataset(self, X: np.ndarray, y: np.ndarray, indices: np.ndarray, shuffle: bool) -> "tf.data.Dataset":
+        """
+        Stream batches of sequences, copying only one batch at a time.
+        
+        Args:
+            X: Input sequences, e.g. a strided view
+            y: Target values
+            indices: Indices of the sequences to stream
+            shuffle: Whether to reshuffle the sequences every epoch
+            
+        Returns:
+            Dataset of (sequences, targets) batches
+        """
+        def gather(batch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            return X[batch].astype(np.float32), y[batch].astype(np.float32)
+        
+        def load(batch):
+            sequences, targets = tf.numpy_function(gather, [batch], (tf.float32, tf.float32))
+            sequences.set_shape((None,) + X.shape[1:])
+            targets.set_shape((None,))
+            return sequences, targets
+        
+        dataset = tf.data.Dataset.from_tensor_slices(indices)
+        if shuffle:
+            dataset = dataset.shuffle(len(indices), reshuffle_each_iteration=True)
+        
+        return dataset.batch(self.TRAINING_BATCH_SIZE).map(load).prefetch(tf.data.AUTOTUNE)
+    
     def train_model(self, X: np.ndarray, y: np.ndarray):
         """
         Train LSTM model.
@@ -161,15 +239,65 @@ class LSTMPricePredictor(BaseAlgorithm):
         if self.model is None:
             self.build_model((X.shape[1], X.shape[2]))
         
+        # Hold out the last 20% for validation, as validation_split would,
+        # without converting the sequences into one tensor
+        split = int(len(X) * 0.8)
+        indices = np.arange(len(X))
+        validation = self._sequence_dataset(X, y, indices[split:], shuffle=False) if split < len(X) else None
+        
         # Train the model
         self.model.fit(
-            X, y,
+            self._sequence_dataset(X, y, indices[:split], shuffle=True),
+            validation_data=validation,
             epochs=self.parameters["epochs"],
-            batch_size=32,
-            verbose=0,
-            validation_split=0.2
+            verbose=0
         )
     
+    def save_model(self, directory: str):
+        """
+        Save the fitted model and scaler.
+        
+        Args:
+            directory: Directory to write them into
+        """
+        self.model.save(os.path.join(directory, "model.keras"))
+        joblib.dump(self.scaler, os.path.join(directory, "scaler.joblib"))
+    
+    def load_model(self, directory: str):
+        """
+        Load a fitted model and scaler saved by save_model.
+        
+        Args:
+            directory: Directory they were written into
+        """
+        self.model = tf.keras.models.load_model(os.path.join(directory, "model.keras"))
+        self.scaler = joblib.load(os.path.join(directory, "scaler.joblib"))
+    
+    def load_or_fit_model(self, key: str, X: np.ndarray, y: np.ndarray) -> Tuple[Any, MinMaxScaler]:
+        """
+        Load a stored model and scaler, or fit and store them.
+        
+        Args:
+            key: Model key from model_registry.make_key
+            X: Input sequences
+            y: Target values
+            
+        Returns:
+            Tuple of (model, scaler)
+        """
+        def fit():
+            # Build a new model rather than continue training a pooled one
+            self.model = None
+            self.train_model(X, y)
+        
+        model_registry.load_or_fit(key, fit, self.save_model, self.load_model, force=self.parameters["force_retrain"])
+        return self.model, self.scaler
+    
+    @staticmethod
+    def fitted_nbytes(fitted: Tuple[Any, MinMaxScaler]) -> int:
+        """Estimate the memory held by a fitted model and scaler from the model's weights."""
+        return sum(weights.nbytes for weights in fitted[0].get_weights())
+    
     def predict(self, sequence: np.ndarray) -> float:
         """
         Make a prediction using the trained model.
@@ -180,16 +308,29 @@ class LSTMPricePredictor(BaseAlgorithm):
         Returns:
             Prediction probability (0-1)
         """
+        return self.predict_batch(sequence[np.newaxis])[0]
+    
+    def predict_batch(self, sequences: np.ndarray) -> np.ndarray:
+        """
+        Make predictions for many sequences in batches.
+        
+        Args:
+            sequences: Array of shape (n_sequences, sequence_length, n_features),
+                e.g. a sliding-window view over scaled features
+            
+        Returns:
+            Array of prediction probabilities (0-1)
+        """
         if self.model is None:
             raise ValueError("Model has not been trained")
         
-        # Reshape for prediction
-        sequence = sequence.reshape(1, sequence.shape[0], sequence.shape[1])
-        
-        # Make prediction
-        prediction = self.model.predict(sequence, verbose=0)[0][0]
+        predictions = np.empty(len(sequences))
+        for begin in range(0, len(sequences), self.PREDICTION_BATCH_SIZE):
+            # Windows are copied out of a view one batch at a time
+            batch = np.ascontiguousarray(sequences[begin:begin + self.PREDICTION_BATCH_SIZE], dtype=np.float32)
+            predictions[begin:begin + len(batch)] = np.asarray(self.model.predict_on_batch(batch)).reshape(-1)
         
-        return prediction
+        return predictions
     
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -201,40 +342,58 @@ class LSTMPricePredictor(BaseAlgorithm):
         Returns:
             DataFrame with added signal column
         """
-        # Make a copy to avoid modifying original data
-        df = data.copy()
+        # Indicator columns are added to a copy, leaving the original data unchanged
+        df = self.calculate_indicators(data)
         
         # Initialize signal column
         df['signal'] = 0
         
         # Preprocess data and train model
         try:
-            X, y = self.preprocess_data(df)
+            # Indicator features are undefined until their warm-up period is over
+            indicator_columns = [column for column in self.indicator_graph() if column in df.columns]
+            ready = df[indicator_columns].notna().all(axis=1).to_numpy()
+            start = int(np.argmax(ready)) if ready.any() else len(df)
+            
+            X, y = self.preprocess_data(df.iloc[start:])
             
             if len(X) == 0 or len(y) == 0:
                 logger.warning("Not enough data for LSTM model, returning no signals")
                 return df
             
-            # Train model
-            self.train_model(X, y)
+            # Train model, or reuse a resident or stored one fitted on the same data and parameters
+            key = model_registry.make_key(
+                type(self).__name__,
+                {name: self.parameters[name] for name in self.MODEL_PARAMETERS},
+                self.feature_columns,
+                df[self.feature_columns].to_numpy()[start:]
+            )
+            self.model, self.scaler = model_pool.get_or_load(
+                key,
+                lambda: self.load_or_fit_model(key, X, y),
+                self.fitted_nbytes,
+                force=self.parameters["force_retrain"]
+            )
             
-            # Generate predictions for each sequence
+            # Predict bar i from the seq_length bars before it, for every bar at once
             seq_length = self.parameters["sequence_length"]
             threshold = self.parameters["threshold"]
+            end = len(df) - self.parameters["prediction_horizon"]
             
-            for i in range(seq_length, len(df) - self.parameters["prediction_horizon"]):
-                # Get sequence
-                current_seq = df.iloc[i-seq_length:i][self.feature_columns].values
-                scaled_seq = self.scaler.transform(current_seq)
-                
-                # Make prediction
-                prediction = self.predict(scaled_seq)
+            if end > start + seq_length:
+                # Scaling is per feature, so scaling every row once equals scaling each window
+                scaled = self.scaler.transform(df[self.feature_columns].to_numpy()[start:end - 1])
+                windows = _sequences(scaled, seq_length)
+                predictions = self.predict_batch(windows)
                 
-                # Generate signal based on prediction and threshold
-                if prediction >= threshold:
-                    df.loc[df.index[i], 'signal'] = 1  # Buy signal
-                elif prediction <= (1 - threshold):
-                    df.loc[df.index[i], 'signal'] = -1  # Sell signal
+                # Generate signals based on predictions and threshold
+                signal = np.zeros(len(df), dtype=np.int64)
+                signal[start + seq_length:end] = np.where(
+                    predictions >= threshold,
+                    1,  # Buy signal
+                    np.where(predictions <= 1 - threshold, -1, 0)  # Sell signal
+                )
+                df['signal'] = signal
             
         except Exception as e:
             logger.error(f"Error in LSTM signal generation: {str(e)}")
@@ -276,4 +435,27 @@ class LSTMPricePredictor(BaseAlgorithm):
                 # Set position size (positive for buy, negative for sell)
                 df.loc[df.index[i], 'position_size'] = shares if current_signal > 0 else -shares
         
-        return df
\ No newline at end of file
+        return df
+
+    def calculate_position_units(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Calculate the shares to trade at each bar per unit of portfolio value.
+        
+        Vectorized equivalent of calculate_position_sizes applied bar by bar.
+        
+        Args:
+            data: DataFrame with market data and signals
+            
+        Returns:
+            Series of order sizes aligned with the data index
+        """
+        signal = data['signal']
+        close = data['close']
+        shares = (self.parameters["position_size_pct"] / close).where(close > 0, 0)
+        
+        # Only take action on new signals (when signal changes)
+        new_signal = (signal != signal.shift(1)) & (signal != 0)
+        if len(new_signal) > 0:
+            new_signal.iloc[0] = False
+        
+        return (np.sign(signal) * shares).where(new_signal, 0)
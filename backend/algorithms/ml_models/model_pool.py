@@ -0,0 +1,146 @@
+# backend/algorithms/ml_models/model_pool.py
+"""
+Warm pool of fitted models kept resident in a worker process.
+
+Loading a fitted model from model_registry still deserializes a Keras model
+or a whole random forest. The pool keeps recently used models and their
+scalers in memory, keyed like the registry, so repeated backtests and signal
+generation in a long-lived worker run their batched predict_proba and LSTM
+inference on a resident model. Models are evicted least recently used first
+once their estimated size exceeds MODEL_POOL_MB.
+
+Pooled models are shared by every caller in the process and must not be
+fitted or modified in place.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from backend.config import settings
+
+_COUNTERS = ("hits", "misses", "evictions")
+
+class ModelPool:
+    """In-process LRU of fitted models bounded by their estimated bytes."""
+
+    def __init__(self, max_bytes: int):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._bytes = 0
+        self._counts = dict.fromkeys(_COUNTERS, 0)
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def configure(self, max_bytes: int) -> None:
+        """
+        Set the memory budget, evicting models over the new budget.
+
+        Args:
+            max_bytes: Budget in bytes, 0 to disable the pool
+        """
+        with self._lock:
+            self.max_bytes = max(0, int(max_bytes))
+            self._evict()
+
+    def get_or_load(
+        self,
+        key: str,
+        load: Callable[[], Any],
+        nbytes: Callable[[Any], int],
+        force: bool = False
+    ) -> Any:
+        """
+        Get a resident model, loading it on a miss.
+
+        Concurrent callers asking for the same missing model wait for one
+        load instead of each loading it.
+
+        Args:
+            key: Model key, e.g. from model_registry.make_key
+            load: Function loading or fitting the model, returning what the
+                pool keeps, such as a (model, scaler) tuple
+            nbytes: Function estimating the memory held by a loaded model
+            force: Whether to load the model even if it is resident, replacing it
+
+        Returns:
+            The result of load, possibly from an earlier call
+        """
+        if not self.enabled:
+            return load()
+
+        with self._lock:
+            if not force and key in self._entries:
+                return self._hit(key)
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Loaded by another caller while this one waited
+                if not force and key in self._entries:
+                    return self._hit(key)
+                self._count("misses")
+
+            try:
+                model = load()
+                self._keep(key, model, nbytes(model))
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+
+        return model
+
+    def clear(self) -> None:
+        """Drop every resident model."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get this process's counters, hit rate and memory use."""
+        with self._lock:
+            counts = dict(self._counts)
+            entries, used = len(self._entries), self._bytes
+
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "lookups": lookups,
+            "hit_rate": counts["hits"] / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": used,
+            "max_bytes": self.max_bytes
+        }
+
+    def _hit(self, key: str) -> Any:
+        # Callers hold the lock
+        self._entries.move_to_end(key)
+        self._count("hits")
+        return self._entries[key][0]
+
+    def _keep(self, key: str, model: Any, size: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            # A model larger than the whole budget is not kept
+            if size <= self.max_bytes:
+                self._entries[key] = (model, size)
+                self._bytes += size
+                self._evict()
+
+    def _evict(self) -> None:
+        # Callers hold the lock
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._count("evictions")
+
+    def _count(self, name: str) -> None:
+        # Callers hold the lock
+        self._counts[name] += 1
+
+model_pool = ModelPool(settings.MODEL_POOL_MB * 1024 ** 2)
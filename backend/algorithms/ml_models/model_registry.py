@@ -0,0 +1,207 @@
+# backend/algorithms/ml_models/model_registry.py
+"""
+Persistent registry of fitted models.
+
+ML strategies fit their models inside generate_signals. The registry saves
+each fitted model and its scaler to disk, keyed by the algorithm, the
+hyperparameters the fit depends on, the feature list and a fingerprint of
+the training data, so later backtests of the same strategy on the same data
+load the model instead of fitting it again.
+
+Each model is a directory under MODEL_REGISTRY_DIR, shared by every process.
+It is written under a temporary name and renamed once complete, so readers
+never see a partial model. Once the directories exceed MODEL_REGISTRY_MB,
+the least recently used ones are deleted.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.algorithms.utils.indicator_cache import array_fingerprint
+from backend.config import settings
+from backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_COUNTERS = ("hits", "misses", "evictions")
+_TEMP_PREFIX = ".tmp-"
+
+class ModelRegistry:
+    """On-disk LRU of fitted models bounded by bytes."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(_COUNTERS, 0)
+        self.root = root
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.root) and self.max_bytes > 0
+
+    def configure(self, root: str, max_bytes: int) -> None:
+        """
+        Set the directory and disk budget, evicting models over the new budget.
+
+        Args:
+            root: Directory holding the models, empty to disable the registry
+            max_bytes: Disk budget in bytes, 0 to disable the registry
+        """
+        self.root = root
+        self.max_bytes = max(0, int(max_bytes))
+        if self.enabled:
+            self._evict()
+
+    @staticmethod
+    def make_key(
+        algorithm: str,
+        parameters: Dict[str, Any],
+        feature_columns: Sequence[str],
+        training_data: np.ndarray
+    ) -> str:
+        """
+        Build the key of a fitted model.
+
+        Args:
+            algorithm: Algorithm name
+            parameters: Hyperparameters the fitted model depends on
+            feature_columns: Features the model is fitted on
+            training_data: Array the model and its scaler are fitted from
+
+        Returns:
+            Model key, which is also the name of its directory
+        """
+        payload = json.dumps(
+            [algorithm, parameters, list(feature_columns), array_fingerprint(training_data)],
+            sort_keys=True,
+            default=str
+        )
+        return f"{algorithm}-{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    def load_or_fit(
+        self,
+        key: str,
+        fit: Callable[[], None],
+        save: Callable[[str], None],
+        load: Callable[[str], None],
+        force: bool = False
+    ) -> bool:
+        """
+        Load a fitted model, or fit it and save it on a miss.
+
+        Args:
+            key: Key from make_key
+            fit: Function fitting the model
+            save: Function writing the fitted model and scaler into a directory
+            load: Function reading them back from such a directory
+            force: Whether to fit the model even if it is stored, replacing it
+
+        Returns:
+            Whether the model was loaded rather than fitted
+        """
+        if not self.enabled:
+            fit()
+            return False
+
+        directory = os.path.join(self.root, key)
+        if not force and os.path.isdir(directory):
+            try:
+                load(directory)
+                # Directory times order models for eviction
+                os.utime(directory)
+                self._count("hits")
+                return True
+            except Exception as e:
+                # E.g. evicted by another process while loading
+                logger.warning(f"Could not load model {key}, fitting it again: {str(e)}")
+
+        self._count("misses")
+        fit()
+        self._save(key, save)
+        return False
+
+    def clear(self) -> None:
+        """Delete every stored model."""
+        for _, _, path in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get this process's counters and hit rate, with the models stored on disk."""
+        with self._lock:
+            counts = dict(self._counts)
+
+        entries = self._entries()
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "lookups": lookups,
+            "hit_rate": counts["hits"] / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes
+        }
+
+    def _save(self, key: str, save: Callable[[str], None]) -> None:
+        directory = os.path.join(self.root, key)
+        temp = os.path.join(self.root, f"{_TEMP_PREFIX}{uuid.uuid4().hex}")
+
+        try:
+            os.makedirs(temp)
+            save(temp)
+            # A forced fit replaces the stored model
+            shutil.rmtree(directory, ignore_errors=True)
+            os.rename(temp, directory)
+        except Exception as e:
+            # Renaming also fails if another process stored the model meanwhile
+            logger.warning(f"Could not save model {key}: {str(e)}")
+            shutil.rmtree(temp, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        # (last use, size in bytes, path) of every stored model
+        if not self.root or not os.path.isdir(self.root):
+            return []
+
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(_TEMP_PREFIX) or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(parent, file))
+                    for parent, _, files in os.walk(path)
+                    for file in files
+                )
+                entries.append((os.path.getmtime(path), size, path))
+            except OSError:
+                # Deleted by another process meanwhile
+                continue
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        used = sum(size for _, size, _ in entries)
+
+        # A model larger than the whole budget is not kept either
+        for _, size, path in entries:
+            if used <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            used -= size
+            self._count("evictions")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+model_registry = ModelRegistry(settings.MODEL_REGISTRY_DIR, settings.MODEL_REGISTRY_MB * 1024 ** 2)
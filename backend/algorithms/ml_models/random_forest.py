@@ -1,13 +1,19 @@
 # backend/algorithms/ml_models/random_forest.py
+import os
+import pickle
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import logging
 
+import joblib
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 
 from backend.algorithms.base import BaseAlgorithm
+from backend.algorithms.ml_models.model_pool import model_pool
+from backend.algorithms.ml_models.model_registry import model_registry
+from backend.algorithms.utils import indicator_graph as graph
 from backend.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -29,9 +35,20 @@ class RandomForestStrategy(BaseAlgorithm):
         "lookback_periods": [1, 3, 5, 10, 20],  # Days to look back for features
         "prediction_horizon": 5,  # Days ahead to predict
         "threshold": 0.6,  # Probability threshold for signals
-        "position_size_pct": 0.1  # 10% of portfolio per position
+        "position_size_pct": 0.1,  # 10% of portfolio per position
+        "force_retrain": False  # Fit the model even if a fitted one is stored
     }
     
+    # Parameters the fitted model depends on; the others only affect signals and sizing
+    MODEL_PARAMETERS = [
+        "n_estimators", "max_depth", "min_samples_split", "min_samples_leaf",
+        "features", "lookback_periods", "prediction_horizon"
+    ]
+    
+    # Windows of the moving average and relative strength features
+    MA_PERIODS = [5, 10, 20, 50, 200]
+    RSI_PERIODS = [5, 10, 20]
+    
     def __init__(self, parameters: Dict[str, Any] = None):
         """Initialize with default parameters and override with provided ones."""
         merged_params = {**self.DEFAULT_PARAMETERS, **(parameters or {})}
@@ -47,7 +64,7 @@ class RandomForestStrategy(BaseAlgorithm):
         required_params = [
             "n_estimators", "max_depth", "min_samples_split", "min_samples_leaf",
             "features", "lookback_periods", "prediction_horizon", 
-            "threshold", "position_size_pct"
+            "threshold", "position_size_pct", "force_retrain"
         ]
         
         for param in required_params:
@@ -81,6 +98,38 @@ class RandomForestStrategy(BaseAlgorithm):
         
         if not isinstance(self.parameters["position_size_pct"], (int, float)) or not 0 < self.parameters["position_size_pct"] <= 1:
             raise ValueError("position_size_pct must be between 0 and 1")
+        
+        if not isinstance(self.parameters["force_retrain"], bool):
+            raise ValueError("force_retrain must be a boolean")
+    
+    def indicator_graph(self) -> Dict[str, graph.Node]:
+        """
+        Declare the moving average and relative strength features, and the
+        standard indicators, such as 'rsi' and 'macd', named in features.
+        """
+        close = graph.column('close')
+        standard = graph.standard_indicators()
+        
+        outputs = {feature: standard[feature] for feature in self.parameters["features"] if feature in standard}
+        outputs.update(zip([f"ma_{period}" for period in self.MA_PERIODS], graph.sma_windows(close, self.MA_PERIODS)))
+        outputs.update(zip([f"rsi_{period}" for period in self.RSI_PERIODS], graph.rsi_windows(close, self.RSI_PERIODS)))
+        return outputs
+    
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculate the declared indicators, keeping those the data already has.
+        
+        Indicators that need columns the data lacks are left out, so that
+        create_features skips them like any other missing feature.
+        
+        Args:
+            data: DataFrame with market data
+            
+        Returns:
+            DataFrame with added indicator columns
+        """
+        plan = graph.plan_indicators(self.indicator_graph())
+        return plan.apply(data, plan.available(data.columns), keep_existing=True)
     
     def create_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -92,15 +141,15 @@ class RandomForestStrategy(BaseAlgorithm):
         Returns:
             DataFrame with additional features
         """
-        # Make a copy to avoid modifying original data
-        df = data.copy()
-        
         # Ensure all required base features are present
         required_base_features = ["close"]
         for feature in required_base_features:
-            if feature not in df.columns:
+            if feature not in data.columns:
                 raise ValueError(f"Required feature '{feature}' not found in data")
         
+        # Indicator columns are added to a copy, leaving the original data unchanged
+        df = self.calculate_indicators(data)
+        
         # Get list of base features to use
         base_features = []
         for feature in self.parameters["features"]:
@@ -127,21 +176,9 @@ class RandomForestStrategy(BaseAlgorithm):
             df[price_change_name] = (df["close"] / df["close"].shift(period)) - 1
             self.feature_columns.append(price_change_name)
         
-        # Add moving averages
-        for period in [5, 10, 20, 50, 200]:
-            ma_name = f"ma_{period}"
-            df[ma_name] = df["close"].rolling(window=period).mean()
-            self.feature_columns.append(ma_name)
-        
-        # Add relative strength features
-        for period in [5, 10, 20]:
-            rsi_name = f"rsi_{period}"
-            delta = df["close"].diff()
-            gain = delta.where(delta > 0, 0).rolling(window=period).mean()
-            loss = -delta.where(delta < 0, 0).rolling(window=period).mean()
-            rs = gain / loss.where(loss > 0, 1)
-            df[rsi_name] = 100 - (100 / (1 + rs))
-            self.feature_columns.append(rsi_name)
+        # Moving average and relative strength features, computed by calculate_indicators
+        self.feature_columns.extend(f"ma_{period}" for period in self.MA_PERIODS)
+        self.feature_columns.extend(f"rsi_{period}" for period in self.RSI_PERIODS)
         
         # Add target column (future price direction)
         pred_horizon = self.parameters["prediction_horizon"]
@@ -166,7 +203,8 @@ class RandomForestStrategy(BaseAlgorithm):
         X = df[self.feature_columns].values
         y = df["target"].values
         
-        # Scale features
+        # Scale features with a new scaler, since a pooled one is shared
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
         
         return X_scaled, y
@@ -192,6 +230,50 @@ class RandomForestStrategy(BaseAlgorithm):
         # Train model
         self.model.fit(X, y)
     
+    def save_model(self, directory: str):
+        """
+        Save the fitted model and scaler.
+        
+        Args:
+            directory: Directory to write them into
+        """
+        joblib.dump((self.model, self.scaler), os.path.join(directory, "model.joblib"))
+    
+    def load_model(self, directory: str):
+        """
+        Load a fitted model and scaler saved by save_model.
+        
+        Args:
+            directory: Directory they were written into
+        """
+        self.model, self.scaler = joblib.load(os.path.join(directory, "model.joblib"))
+    
+    def load_or_fit_model(self, key: str, X, y) -> Tuple[RandomForestClassifier, StandardScaler]:
+        """
+        Load a stored model and scaler, or fit and store them.
+        
+        Args:
+            key: Model key from model_registry.make_key
+            X: Feature matrix
+            y: Target vector
+            
+        Returns:
+            Tuple of (model, scaler)
+        """
+        model_registry.load_or_fit(
+            key,
+            lambda: self.train_model(X, y),
+            self.save_model,
+            self.load_model,
+            force=self.parameters["force_retrain"]
+        )
+        return self.model, self.scaler
+    
+    @staticmethod
+    def fitted_nbytes(fitted: Tuple[RandomForestClassifier, StandardScaler]) -> int:
+        """Estimate the memory held by a fitted model and scaler from their pickled size."""
+        return len(pickle.dumps(fitted, protocol=pickle.HIGHEST_PROTOCOL))
+    
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Generate trading signals based on Random Forest predictions.
@@ -219,8 +301,19 @@ class RandomForestStrategy(BaseAlgorithm):
             # Prepare data
             X, y = self.prepare_data(df_with_features)
             
-            # Train model
-            self.train_model(X, y)
+            # Train model, or reuse a resident or stored one fitted on the same data and parameters
+            key = model_registry.make_key(
+                type(self).__name__,
+                {name: self.parameters[name] for name in self.MODEL_PARAMETERS},
+                self.feature_columns,
+                df_with_features[self.feature_columns + ["target"]].to_numpy()
+            )
+            self.model, self.scaler = model_pool.get_or_load(
+                key,
+                lambda: self.load_or_fit_model(key, X, y),
+                self.fitted_nbytes,
+                force=self.parameters["force_retrain"]
+            )
             
             # Generate predictions
             probabilities = self.model.predict_proba(X)
@@ -234,11 +327,11 @@ class RandomForestStrategy(BaseAlgorithm):
             signals[prob_increase >= threshold] = 1  # Buy signal
             signals[prob_increase <= (1 - threshold)] = -1  # Sell signal
             
-            # Map signals back to original DataFrame
-            signal_dates = df_with_features.index
-            for i, date in enumerate(signal_dates):
-                if date in df.index:
-                    df.loc[date, 'signal'] = signals[i]
+            # Map signals back to original DataFrame; rows with features keep their order,
+            # and a mask avoids label lookups on an index other threads may share
+            signal_column = np.zeros(len(df), dtype=np.int64)
+            signal_column[df.index.isin(df_with_features.index)] = signals
+            df['signal'] = signal_column
             
         except Exception as e:
             logger.error(f"Error in Random Forest signal generation: {str(e)}")
@@ -280,4 +373,27 @@ class RandomForestStrategy(BaseAlgorithm):
                 # Set position size (positive for buy, negative for sell)
                 df.loc[df.index[i], 'position_size'] = shares if current_signal > 0 else -shares
         
-        return df
\ No newline at end of file
+        return df
+
+    def calculate_position_units(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Calculate the shares to trade at each bar per unit of portfolio value.
+        
+        Vectorized equivalent of calculate_position_sizes applied bar by bar.
+        
+        Args:
+            data: DataFrame with market data and signals
+            
+        Returns:
+            Series of order sizes aligned with the data index
+        """
+        signal = data['signal']
+        close = data['close']
+        shares = (self.parameters["position_size_pct"] / close).where(close > 0, 0)
+        
+        # Only take action on new signals (when signal changes)
+        new_signal = (signal != signal.shift(1)) & (signal != 0)
+        if len(new_signal) > 0:
+            new_signal.iloc[0] = False
+        
+        return (np.sign(signal) * shares).where(new_signal, 0)
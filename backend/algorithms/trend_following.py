@@ -3,8 +3,10 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any
 
-from backend.algorithms.base import BaseAlgorithm
-from backend.algorithms.utils.indicators import calculate_moving_average, calculate_atr
+from backend.algorithms.base import BaseAlgorithm, SignalStream
+from backend.algorithms.utils import indicator_graph as graph
+from backend.algorithms.utils.indicators import calculate_panel_moving_average, calculate_panel_atr
+from backend.algorithms.utils.streaming import Bar, StreamingATR, StreamingEMA, StreamingSMA
 
 class TrendFollowingStrategy(BaseAlgorithm):
     """
@@ -24,6 +26,9 @@ class TrendFollowingStrategy(BaseAlgorithm):
         "position_size_pct": 0.2  # Max 20% of portfolio per position
     }
     
+    # Parameters that determine the indicator columns
+    INDICATOR_PARAMETERS = ["fast_ma_window", "slow_ma_window", "ma_type", "atr_window"]
+    
     def __init__(self, parameters: Dict[str, Any] = None):
         """Initialize with default parameters and override with provided ones."""
         merged_params = {**self.DEFAULT_PARAMETERS, **(parameters or {})}
@@ -62,6 +67,33 @@ class TrendFollowingStrategy(BaseAlgorithm):
         if not isinstance(self.parameters["position_size_pct"], (int, float)) or not 0 < self.parameters["position_size_pct"] <= 1:
             raise ValueError("position_size_pct must be a number between 0 and 1 (0% to 100%)")
     
+    def indicator_graph(self) -> Dict[str, graph.Node]:
+        """Declare the fast and slow moving averages of the close and the ATR."""
+        average = graph.sma if self.parameters["ma_type"] == 'sma' else graph.ema
+        close = graph.column('close')
+        
+        return {
+            'fast_ma': average(close, self.parameters["fast_ma_window"]),
+            'slow_ma': average(close, self.parameters["slow_ma_window"]),
+            'atr': graph.atr(graph.column('high'), graph.column('low'), close, self.parameters["atr_window"])
+        }
+    
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculate the fast and slow moving averages and ATR.
+        
+        Args:
+            data: DataFrame with at least 'close' price column
+            
+        Returns:
+            DataFrame with added 'fast_ma', 'slow_ma' and 'atr' columns
+        """
+        # Check if required column exists
+        if 'close' not in data.columns:
+            raise ValueError("DataFrame must contain 'close' price column")
+        
+        return super().calculate_indicators(data)
+    
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Generate trading signals based on moving average crossovers.
@@ -72,51 +104,30 @@ class TrendFollowingStrategy(BaseAlgorithm):
         Returns:
             DataFrame with added 'signal' column (1 for buy, -1 for sell, 0 for hold)
         """
-        # Make a copy to avoid modifying original data
-        df = data.copy()
+        return self.generate_signals_from_indicators(self.calculate_indicators(data))
+    
+    def generate_signals_from_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the crossover rules to precomputed moving averages.
         
-        # Check if required column exists
-        if 'close' not in df.columns:
-            raise ValueError("DataFrame must contain 'close' price column")
+        Args:
+            data: DataFrame returned by calculate_indicators
+            
+        Returns:
+            DataFrame with added 'signal' column (1 for buy, -1 for sell, 0 for hold)
+        """
+        signal = _crossover_signal(data['fast_ma'].to_numpy(), data['slow_ma'].to_numpy())
         
-        # Calculate fast moving average
-        df = calculate_moving_average(
-            df, 
-            window=self.parameters["fast_ma_window"],
-            ma_type=self.parameters["ma_type"],
-            column='close',
-            new_column='fast_ma'
-        )
-        
-        # Calculate slow moving average
-        df = calculate_moving_average(
-            df, 
-            window=self.parameters["slow_ma_window"],
-            ma_type=self.parameters["ma_type"],
-            column='close',
-            new_column='slow_ma'
-        )
-        
-        # Calculate Average True Range for position sizing
-        df = calculate_atr(df, window=self.parameters["atr_window"])
-        
-        # Initialize signal column
-        df['signal'] = 0
-        
-        # Generate buy signals (fast MA crosses above slow MA)
-        df['fast_above_slow'] = df['fast_ma'] > df['slow_ma']
-        df['cross_above'] = df['fast_above_slow'] & (~df['fast_above_slow'].shift(1).fillna(False))
-        df.loc[df['cross_above'], 'signal'] = 1
-        
-        # Generate sell signals (fast MA crosses below slow MA)
-        df['cross_below'] = (~df['fast_above_slow']) & (df['fast_above_slow'].shift(1).fillna(False))
-        df.loc[df['cross_below'], 'signal'] = -1
-        
-        # Clean up intermediate columns
-        df = df.drop(['fast_above_slow', 'cross_above', 'cross_below'], axis=1)
+        # A shallow copy leaves shared indicator data untouched without copying it
+        df = data.copy(deep=False)
+        df['signal'] = signal
         
         return df
     
+    def create_signal_stream(self) -> SignalStream:
+        """Create a stream of moving average crossover signals for live bars."""
+        return TrendFollowingSignalStream(self.parameters)
+    
     def calculate_position_sizes(self, data: pd.DataFrame, portfolio_value: float) -> pd.DataFrame:
         """
         Calculate position sizes based on signals and risk management rules.
@@ -163,4 +174,102 @@ class TrendFollowingStrategy(BaseAlgorithm):
         df['position_size'] = 0
         df.iloc[-1, df.columns.get_loc('position_size')] = position_size
         
-        return df
\ No newline at end of file
+        return df
+
+    def calculate_position_units(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Calculate the shares to trade at each bar per unit of portfolio value.
+        
+        Vectorized equivalent of calculate_position_sizes applied bar by bar.
+        Bars where ATR is not yet available produce no order.
+        
+        Args:
+            data: DataFrame with market data, signals and ATR
+            
+        Returns:
+            Series of order sizes aligned with the data index
+        """
+        signal = data['signal']
+        close = data['close']
+        atr = data['atr']
+        
+        # Risk-based size (2 * ATR stop distance) capped by the maximum position size
+        shares_based_on_risk = self.parameters["risk_pct"] / (2 * atr)
+        max_shares = self.parameters["position_size_pct"] / close
+        shares = np.minimum(shares_based_on_risk, max_shares)
+        
+        units = np.sign(signal) * shares
+        valid = (signal != 0) & (close > 0) & (atr > 0)
+        
+        return units.where(valid, 0)
+    
+    def calculate_panel_units(self, panel: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Calculate crossover order sizes for many symbols in one vectorized pass.
+        
+        Panel equivalent of generate_signals followed by calculate_position_units.
+        
+        Args:
+            panel: Dictionary mapping 'high', 'low' and 'close' to time x symbols DataFrames
+            
+        Returns:
+            Time x symbols DataFrame of order sizes
+        """
+        for column in ('high', 'low', 'close'):
+            if column not in panel:
+                raise ValueError(f"Panel must contain a '{column}' column")
+        
+        close_panel = panel['close']
+        fast_ma = calculate_panel_moving_average(close_panel, self.parameters["fast_ma_window"], self.parameters["ma_type"])
+        slow_ma = calculate_panel_moving_average(close_panel, self.parameters["slow_ma_window"], self.parameters["ma_type"])
+        atr = calculate_panel_atr(panel['high'], panel['low'], close_panel, self.parameters["atr_window"]).to_numpy()
+        
+        signal = _crossover_signal(fast_ma.to_numpy(), slow_ma.to_numpy())
+        close = close_panel.to_numpy(dtype=np.float64)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = np.minimum(self.parameters["risk_pct"] / (2 * atr), self.parameters["position_size_pct"] / close)
+        
+        units = np.sign(signal) * shares
+        valid = (signal != 0) & (close > 0) & (atr > 0)
+        
+        return pd.DataFrame(np.where(valid, units, 0.0), index=close_panel.index, columns=close_panel.columns)
+
+def _crossover_signal(fast_ma: np.ndarray, slow_ma: np.ndarray) -> np.ndarray:
+    # Works down the time axis of a series or a time x symbols panel
+    fast_above_slow = fast_ma > slow_ma
+    was_above = np.zeros_like(fast_above_slow)
+    was_above[1:] = fast_above_slow[:-1]
+    
+    # Buy when the fast MA crosses above the slow MA, sell when it crosses below
+    signal = np.zeros(fast_above_slow.shape, dtype=np.int64)
+    signal[fast_above_slow & ~was_above] = 1
+    signal[~fast_above_slow & was_above] = -1
+    return signal
+
+class TrendFollowingSignalStream(SignalStream):
+    """Moving average crossover signals updated one bar at a time."""
+    
+    def __init__(self, parameters: Dict[str, Any]):
+        super().__init__()
+        moving_average = StreamingSMA if parameters["ma_type"] == 'sma' else StreamingEMA
+        self._fast_ma = moving_average(parameters["fast_ma_window"])
+        self._slow_ma = moving_average(parameters["slow_ma_window"])
+        self._atr = StreamingATR(parameters["atr_window"])
+        self._was_above = False
+    
+    def update(self, bar: Bar) -> int:
+        """Add a new bar and get its crossover signal."""
+        fast_ma = self._fast_ma.update(bar)
+        slow_ma = self._slow_ma.update(bar)
+        self.indicators = {"fast_ma": fast_ma, "slow_ma": slow_ma, "atr": self._atr.update(bar)}
+        
+        fast_above_slow = fast_ma > slow_ma
+        signal = 0
+        if fast_above_slow and not self._was_above:
+            signal = 1
+        elif not fast_above_slow and self._was_above:
+            signal = -1
+        
+        self._was_above = fast_above_slow
+        return signal
@@ -3,13 +3,27 @@
 Utility functions for trading algorithms.
 
 This module contains shared utility functions used by various trading algorithms,
-including technical indicators calculation, risk management, and signal generation tools.
+including array indicator kernels, technical indicators calculation, indicator memoization and dependency graphs, streaming indicators
+for live updates, risk management, performance metrics, Monte Carlo robustness analysis,
+and signal generation tools.
 """
 
+from backend.algorithms.utils import kernels
 from backend.algorithms.utils import indicators
+from backend.algorithms.utils import indicator_cache
+from backend.algorithms.utils import indicator_graph
+from backend.algorithms.utils import streaming
 from backend.algorithms.utils import risk_management
+from backend.algorithms.utils import performance
+from backend.algorithms.utils import monte_carlo
 
 __all__ = [
+    "kernels",
     "indicators",
-    "risk_management"
+    "indicator_cache",
+    "indicator_graph",
+    "streaming",
+    "risk_management",
+    "performance",
+    "monte_carlo"
 ]
\ No newline at end of file
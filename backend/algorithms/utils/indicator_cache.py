@@ -0,0 +1,216 @@
+# backend/algorithms/utils/indicator_cache.py
+"""
+Memoization of indicator columns.
+
+Indicators are keyed by their name, their parameters and a fingerprint of
+every input series, so computing calculate_rsi(df, 14) twice on the same
+prices only runs the kernel once. IndicatorPlan in indicator_graph builds the
+keys with make_key and memoizes every output of a plan through lookup and
+store. Results are kept in an in-process LRU
+bounded by their size in bytes. An optional remote tier, such as Redis,
+shares them between processes, e.g. the short-lived process pools of
+independent backtests and parameter sweeps.
+
+Cached arrays are returned read-only, since every caller shares them.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+# In-process budget used until configure() is called
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+
+# Larger results are only kept in process, not sent to the remote tier
+REMOTE_MAX_BYTES = 32 * 1024 ** 2
+
+_COUNTERS = ("hits", "remote_hits", "misses", "evictions")
+
+class RemoteTier(Protocol):
+    """Shared byte store behind the in-process cache."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    def set(self, key: str, value: bytes) -> None:
+        ...
+
+def array_fingerprint(values: np.ndarray) -> str:
+    """
+    Fingerprint an input series.
+
+    Args:
+        values: Array of any shape
+
+    Returns:
+        String made of the shape, dtype, first and last values and a digest
+        of the data, which changes whenever any value changes
+    """
+    if values.size == 0:
+        return f"{values.shape}:{values.dtype}:empty"
+
+    data = values if values.flags.c_contiguous else np.ascontiguousarray(values)
+    digest = hashlib.sha256(memoryview(data).cast("B")).hexdigest()
+    return f"{values.shape}:{values.dtype}:{data.flat[0]!r}:{data.flat[-1]!r}:{digest}"
+
+def _encode(arrays: Tuple[np.ndarray, ...]) -> bytes:
+    buffer = io.BytesIO()
+    np.savez(buffer, **{f"arr_{i}": array for i, array in enumerate(arrays)})
+    return buffer.getvalue()
+
+def _decode(payload: bytes) -> Tuple[np.ndarray, ...]:
+    with np.load(io.BytesIO(payload), allow_pickle=False) as stored:
+        return tuple(stored[f"arr_{i}"] for i in range(len(stored.files)))
+
+class IndicatorCache:
+    """LRU of indicator results bounded by bytes, with an optional remote tier."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, remote: Optional[RemoteTier] = None):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, ...]]" = OrderedDict()
+        self._bytes = 0
+        self._counts = dict.fromkeys(_COUNTERS, 0)
+        self._pending = dict.fromkeys(_COUNTERS, 0)
+        self.max_bytes = max_bytes
+        self.remote = remote
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.remote is not None
+
+    def configure(self, max_bytes: int, remote: Optional[RemoteTier] = None) -> None:
+        """
+        Set the in-process budget and remote tier, evicting entries over the new budget.
+
+        Args:
+            max_bytes: Budget of the in-process LRU in bytes, 0 to disable it
+            remote: Remote tier, or None to only cache in process
+        """
+        with self._lock:
+            self.max_bytes = max(0, int(max_bytes))
+            self.remote = remote
+            self._evict()
+
+    @staticmethod
+    def make_key(name: str, params: Tuple[Any, ...], fingerprints: Sequence[str]) -> str:
+        """
+        Build the cache key of an indicator.
+
+        Args:
+            name: Indicator name
+            params: Parameters that change the indicator's values
+            fingerprints: array_fingerprint of each input series
+
+        Returns:
+            Cache key
+        """
+        digest = hashlib.sha256(f"{name}:{params!r}".encode())
+        for fingerprint in fingerprints:
+            digest.update(fingerprint.encode())
+        return f"indicator:{name}:{digest.hexdigest()}"
+
+    def lookup(self, key: str) -> Optional[Tuple[np.ndarray, ...]]:
+        """
+        Get the arrays stored under a key, counting a hit or a miss.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Tuple of read-only arrays, or None on a miss
+        """
+        with self._lock:
+            arrays = self._entries.get(key)
+            if arrays is not None:
+                self._entries.move_to_end(key)
+                self._count("hits")
+                return arrays
+
+        if self.remote is not None:
+            payload = self.remote.get(key)
+            if payload is not None:
+                arrays = self._keep(key, _decode(payload))
+                with self._lock:
+                    self._count("remote_hits")
+                return arrays
+
+        with self._lock:
+            self._count("misses")
+        return None
+
+    def store(self, key: str, arrays: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+        """
+        Store computed arrays under a key, in process and in the remote tier.
+
+        Args:
+            key: Key from make_key
+            arrays: Tuple of arrays, which are made read-only
+
+        Returns:
+            The stored arrays
+        """
+        arrays = self._keep(key, arrays)
+
+        if self.remote is not None and sum(array.nbytes for array in arrays) <= REMOTE_MAX_BYTES:
+            self.remote.set(key, _encode(arrays))
+
+        return arrays
+
+    def clear(self) -> None:
+        """Drop every in-process entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get this process's counters, hit rate and memory use."""
+        with self._lock:
+            counts = dict(self._counts)
+            entries, used = len(self._entries), self._bytes
+
+        lookups = counts["hits"] + counts["remote_hits"] + counts["misses"]
+        return {
+            **counts,
+            "lookups": lookups,
+            "hit_rate": (counts["hits"] + counts["remote_hits"]) / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": used,
+            "max_bytes": self.max_bytes
+        }
+
+    def take_counts(self) -> Dict[str, int]:
+        """Get the counter increments since the previous call, e.g. to publish them."""
+        with self._lock:
+            pending = self._pending
+            self._pending = dict.fromkeys(_COUNTERS, 0)
+        return pending
+
+    def _keep(self, key: str, arrays: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+        for array in arrays:
+            array.flags.writeable = False
+
+        size = sum(array.nbytes for array in arrays)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = arrays
+                self._bytes += size
+                self._evict()
+
+        return arrays
+
+    def _evict(self) -> None:
+        # Callers hold the lock
+        while self._bytes > self.max_bytes and self._entries:
+            _, arrays = self._entries.popitem(last=False)
+            self._bytes -= sum(array.nbytes for array in arrays)
+            self._count("evictions")
+
+    def _count(self, name: str) -> None:
+        self._counts[name] += 1
+        self._pending[name] += 1
+
+indicator_cache = IndicatorCache()
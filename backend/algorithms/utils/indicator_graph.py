@@ -0,0 +1,353 @@
+# backend/algorithms/utils/indicator_graph.py
+"""
+Indicator dependency graphs.
+
+Strategies declare the indicators they need as a small graph of nodes built
+with the functions below, e.g. macd(column('close')) is made of the 12- and
+26-period EMAs of the close. Nodes are compared by structure, so the same
+sub-computation declared twice, such as a 12-period EMA used by both a MACD
+and an EMA crossover, is a single node. An IndicatorPlan orders the merged
+graph and evaluates every node exactly once per run, releasing intermediate
+results as soon as nothing else depends on them.
+
+Nodes are computed in float64 and requested outputs stored in the price
+dtype of backend.utils.precision. Outputs are memoized in indicator_cache,
+keyed by their node, that dtype and the fingerprints of the columns they are
+computed from.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.algorithms.utils import kernels
+from backend.algorithms.utils.indicator_cache import array_fingerprint, indicator_cache
+from backend.utils.precision import price_dtype, to_price_dtype
+
+@dataclass(frozen=True)
+class Node:
+    """One computation of an indicator graph."""
+
+    op: str
+    inputs: Tuple["Node", ...] = ()
+    params: Tuple[Any, ...] = ()
+
+def column(name: str) -> Node:
+    """A column of the market data."""
+    return Node("column", (), (name,))
+
+def sma(values: Node, window: int) -> Node:
+    """Simple moving average of a node."""
+    return Node("sma", (values,), (window,))
+
+def ema(values: Node, span: int) -> Node:
+    """Exponential moving average of a node."""
+    return Node("ema", (values,), (span,))
+
+def rolling_std(values: Node, window: int) -> Node:
+    """Rolling sample standard deviation of a node."""
+    return Node("rolling_std", (values,), (window,))
+
+def rolling_min(values: Node, window: int) -> Node:
+    """Rolling minimum of a node."""
+    return Node("rolling_min", (values,), (window,))
+
+def rolling_max(values: Node, window: int) -> Node:
+    """Rolling maximum of a node."""
+    return Node("rolling_max", (values,), (window,))
+
+def add(left: Node, right: Node) -> Node:
+    """Element-wise sum of two nodes."""
+    return Node("add", (left, right))
+
+def subtract(left: Node, right: Node) -> Node:
+    """Element-wise difference of two nodes."""
+    return Node("subtract", (left, right))
+
+def scale(values: Node, factor: float) -> Node:
+    """A node multiplied by a constant."""
+    return Node("scale", (values,), (float(factor),))
+
+def rsi(close: Node, window: int = 14, smoothing: str = 'sma') -> Node:
+    """Relative Strength Index of a price node."""
+    return Node("rsi", (close,), (window, smoothing))
+
+def true_range(high: Node, low: Node, close: Node) -> Node:
+    """True range of each bar."""
+    return Node("true_range", (high, low, close))
+
+def atr(high: Node, low: Node, close: Node, window: int = 14) -> Node:
+    """Average True Range as a simple average of true ranges."""
+    return sma(true_range(high, low, close), window)
+
+def bollinger_bands(close: Node, window: int = 20, num_std: float = 2.0) -> Tuple[Node, Node, Node]:
+    """Middle, upper and lower Bollinger Bands of a price node."""
+    middle = sma(close, window)
+    width = scale(rolling_std(close, window), num_std)
+    return middle, add(middle, width), subtract(middle, width)
+
+def macd(
+    close: Node,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9
+) -> Tuple[Node, Node, Node]:
+    """MACD line, signal line and histogram of a price node."""
+    line = subtract(ema(close, fast_period), ema(close, slow_period))
+    signal = ema(line, signal_period)
+    return line, signal, subtract(line, signal)
+
+def stochastic(
+    high: Node,
+    low: Node,
+    close: Node,
+    k_period: int = 14,
+    d_period: int = 3,
+    slowing: int = 3
+) -> Tuple[Node, Node]:
+    """%K and %D of the Stochastic Oscillator."""
+    raw_k = Node("range_position", (close, rolling_min(low, k_period), rolling_max(high, k_period)))
+    k = sma(raw_k, slowing)
+    return k, sma(k, d_period)
+
+def sma_windows(values: Node, windows: Sequence[int]) -> Tuple[Node, ...]:
+    """Simple moving averages of a node over several windows, from one pass."""
+    combined = Node("sma_windows", (values,), (tuple(windows),))
+    return tuple(Node("select", (combined,), (i,)) for i in range(len(windows)))
+
+def rsi_windows(close: Node, windows: Sequence[int]) -> Tuple[Node, ...]:
+    """RSI of a price node over several windows, from one pass."""
+    combined = Node("rsi_windows", (close,), (tuple(windows),))
+    return tuple(Node("select", (combined,), (i,)) for i in range(len(windows)))
+
+def standard_indicators() -> Dict[str, Node]:
+    """
+    Get the columns added by the calculate_* functions with default parameters.
+
+    Returns:
+        Dictionary mapping column names, e.g. 'rsi' and 'macd', to nodes
+    """
+    high, low, close = column('high'), column('low'), column('close')
+    middle, upper, lower = bollinger_bands(close)
+    line, signal, histogram = macd(close)
+    k, d = stochastic(high, low, close)
+
+    return {
+        'middle_band': middle,
+        'upper_band': upper,
+        'lower_band': lower,
+        'rsi': rsi(close),
+        'macd': line,
+        'macd_signal': signal,
+        'macd_histogram': histogram,
+        'atr': atr(high, low, close),
+        'stoch_k': k,
+        'stoch_d': d
+    }
+
+def _range_position(close: np.ndarray, lowest: np.ndarray, highest: np.ndarray) -> np.ndarray:
+    # Same steps as kernels.stochastic, so both give identical values
+    price_range = highest - lowest
+    price_range[~(highest > lowest)] = 1
+
+    position = close - lowest
+    position /= price_range
+    position *= 100
+    return position
+
+_OPERATIONS: Dict[str, Callable[..., np.ndarray]] = {
+    "sma": kernels.sma,
+    "ema": kernels.ema,
+    "rolling_std": kernels.rolling_std,
+    "rolling_min": kernels.rolling_min,
+    "rolling_max": kernels.rolling_max,
+    "add": np.add,
+    "subtract": np.subtract,
+    "scale": np.multiply,
+    "rsi": kernels.rsi,
+    "true_range": kernels.true_range,
+    "range_position": _range_position,
+    "sma_windows": kernels.sma_windows,
+    "rsi_windows": kernels.rsi_windows,
+    "select": lambda values, index: values[:, index]
+}
+
+class IndicatorPlan:
+    """Evaluation order of a merged indicator graph."""
+
+    def __init__(self, outputs: Dict[str, Node]):
+        """
+        Order the nodes the outputs depend on.
+
+        Args:
+            outputs: Dictionary mapping output column names to nodes
+        """
+        for name, node in outputs.items():
+            if not isinstance(node, Node):
+                raise ValueError(f"Indicator '{name}' must be a graph node")
+
+        self.outputs = dict(outputs)
+        self.nodes: List[Node] = []
+        self._columns: Dict[Node, Tuple[str, ...]] = {}
+
+        for node in self.outputs.values():
+            self._visit(node)
+
+    def _visit(self, node: Node) -> Tuple[str, ...]:
+        if node in self._columns:
+            return self._columns[node]
+
+        if node.op == "column":
+            columns = node.params
+        else:
+            if node.op not in _OPERATIONS:
+                raise ValueError(f"Unknown indicator operation: {node.op}")
+            columns = tuple(sorted({name for parent in node.inputs for name in self._visit(parent)}))
+
+        # Parents are visited first, so nodes are in evaluation order
+        self._columns[node] = columns
+        self.nodes.append(node)
+        return columns
+
+    @property
+    def columns(self) -> List[str]:
+        """Market data columns the plan reads."""
+        return [node.params[0] for node in self.nodes if node.op == "column"]
+
+    def available(self, columns: Sequence[str]) -> List[str]:
+        """
+        Get the outputs that can be computed from the given columns.
+
+        Args:
+            columns: Columns of the market data
+
+        Returns:
+            Names of the outputs whose inputs are all among columns
+        """
+        columns = set(columns)
+        return [name for name, node in self.outputs.items() if columns.issuperset(self._columns[node])]
+
+    def evaluate(self, data: pd.DataFrame, names: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Evaluate outputs of the plan, computing every node at most once.
+
+        Args:
+            data: DataFrame with the columns the plan reads
+            names: Outputs to evaluate (default: all)
+
+        Returns:
+            Dictionary mapping output names to arrays, which are read-only
+            when they come from the indicator cache
+        """
+        names = list(self.outputs) if names is None else list(names)
+        wanted = list(dict.fromkeys(self.outputs[name] for name in names))
+
+        results: Dict[Node, np.ndarray] = {}
+        for name in sorted({name for node in wanted for name in self._columns[node]}):
+            if name not in data.columns:
+                raise ValueError(f"Column '{name}' not found in DataFrame")
+            results[column(name)] = data[name].to_numpy(dtype=np.float64)
+
+        # Outputs already memoized need none of their dependencies
+        keys = {}
+        cached: Dict[Node, np.ndarray] = {}
+        if indicator_cache.enabled:
+            fingerprints = {node.params[0]: array_fingerprint(values) for node, values in results.items()}
+            for node in wanted:
+                if node.op == "column":
+                    continue
+                keys[node] = indicator_cache.make_key(
+                    node.op,
+                    (node, price_dtype().name),
+                    [fingerprints[name] for name in self._columns[node]]
+                )
+                arrays = indicator_cache.lookup(keys[node])
+                if arrays is not None:
+                    cached[node] = arrays[0]
+
+        # Memoized outputs are stored in the price dtype, so they are never
+        # inputs of other nodes, which are computed from float64 values alike
+        # whatever the cache holds
+        needed = set()
+        pending = [node for node in wanted if node not in cached]
+        while pending:
+            node = pending.pop()
+            if node not in needed and node not in results:
+                needed.add(node)
+                pending.extend(node.inputs)
+
+        # Count the consumers of each node, to free intermediates after their last use
+        consumers: Dict[Node, int] = {}
+        for node in needed:
+            for parent in node.inputs:
+                consumers[parent] = consumers.get(parent, 0) + 1
+
+        keep = set(wanted)
+        for node in self.nodes:
+            if node not in needed:
+                continue
+
+            results[node] = _OPERATIONS[node.op](*(results[parent] for parent in node.inputs), *node.params)
+
+            for parent in node.inputs:
+                consumers[parent] -= 1
+                if consumers[parent] == 0 and parent not in keep and parent.op != "column":
+                    del results[parent]
+
+        # Nodes are computed in float64, and outputs stored in the price dtype
+        for node in wanted:
+            if node in needed or node.op == "column":
+                results[node] = to_price_dtype(results[node])
+                if node in keys and node not in cached:
+                    results[node], = indicator_cache.store(keys[node], (results[node],))
+            else:
+                results[node] = cached[node]
+
+        return {name: results[self.outputs[name]] for name in names}
+
+    def apply(
+        self,
+        data: pd.DataFrame,
+        names: Optional[Sequence[str]] = None,
+        keep_existing: bool = False
+    ) -> pd.DataFrame:
+        """
+        Add outputs of the plan to market data.
+
+        Args:
+            data: DataFrame with the columns the plan reads
+            names: Outputs to add (default: all)
+            keep_existing: Whether outputs already present in data are kept
+                rather than recomputed
+
+        Returns:
+            Shallow copy of data with the output columns added
+        """
+        names = list(self.outputs) if names is None else list(names)
+        names = [name for name in names if not (keep_existing and name in data.columns)]
+
+        result_df = data.copy(deep=False)
+        if not names:
+            return result_df
+
+        for name, values in self.evaluate(data, names).items():
+            result_df[name] = values
+        return result_df
+
+def plan_indicators(*graphs: Dict[str, Node]) -> IndicatorPlan:
+    """
+    Merge indicator graphs into one plan.
+
+    Args:
+        graphs: Dictionaries mapping output column names to nodes; later
+            graphs override outputs of the same name
+
+    Returns:
+        IndicatorPlan evaluating each shared node once
+    """
+    outputs: Dict[str, Node] = {}
+    for graph in graphs:
+        outputs.update(graph)
+    return IndicatorPlan(outputs)
@@ -1,7 +1,35 @@
 # backend/algorithms/utils/indicators.py
+"""
+DataFrame wrappers around the indicator kernels.
+
+Each calculate_* function returns a shallow copy of the input with the
+indicator columns added. The existing columns share memory with the input, so
+the input is left unchanged without copying its data.
+
+The calculate_panel_* functions compute an indicator for many symbols at once
+from time x symbols panels, such as those returned by build_price_panel, in a
+single kernel call rather than one call per symbol.
+
+The per-series functions evaluate an indicator graph, see indicator_graph,
+so shared sub-computations run once and their columns are memoized in
+indicator_cache.
+"""
+
 import pandas as pd
 import numpy as np
-from typing import Literal
+from typing import Dict, List, Literal
+
+from backend.algorithms.utils import kernels
+from backend.algorithms.utils import indicator_graph as graph
+from backend.utils.precision import to_price_dtype
+
+def _require_columns(df: pd.DataFrame, *columns: str) -> None:
+    for col in columns:
+        if col not in df.columns:
+            raise ValueError(f"Column '{col}' not found in DataFrame")
+
+def _add_columns(df: pd.DataFrame, outputs: Dict[str, graph.Node]) -> pd.DataFrame:
+    return graph.plan_indicators(outputs).apply(df)
 
 def calculate_moving_average(
     df: pd.DataFrame,
@@ -19,16 +47,12 @@ def calculate_moving_average(
         ma_type: Type of moving average - 'sma' or 'ema'
         column: Column to calculate MA for
         new_column: Name of the new column with MA values
-        
+    
     Returns:
         DataFrame with added moving average column
     """
-    # Make a copy to avoid modifying original DataFrame
-    result_df = df.copy()
-    
     # Validate inputs
-    if column not in result_df.columns:
-        raise ValueError(f"Column '{column}' not found in DataFrame")
+    _require_columns(df, column)
     
     # Set new column name if not provided
     if new_column is None:
@@ -36,13 +60,13 @@ def calculate_moving_average(
     
     # Calculate moving average
     if ma_type.lower() == 'sma':
-        result_df[new_column] = result_df[column].rolling(window=window).mean()
+        node = graph.sma(graph.column(column), window)
     elif ma_type.lower() == 'ema':
-        result_df[new_column] = result_df[column].ewm(span=window, adjust=False).mean()
+        node = graph.ema(graph.column(column), window)
     else:
         raise ValueError("ma_type must be either 'sma' or 'ema'")
     
-    return result_df
+    return _add_columns(df, {new_column: node})
 
 def calculate_bollinger_bands(
     df: pd.DataFrame,
@@ -58,39 +82,22 @@ def calculate_bollinger_bands(
         window: Window size for moving average
         num_std: Number of standard deviations for bands
         column: Column to calculate Bollinger Bands for
-        
+    
     Returns:
         DataFrame with added middle_band, upper_band, and lower_band columns
     """
-    # Make a copy to avoid modifying original DataFrame
-    result_df = df.copy()
-    
     # Validate inputs
-    if column not in result_df.columns:
-        raise ValueError(f"Column '{column}' not found in DataFrame")
-    
-    # Calculate middle band (SMA)
-    result_df = calculate_moving_average(
-        result_df,
-        window=window,
-        ma_type='sma',
-        column=column,
-        new_column='middle_band'
-    )
-    
-    # Calculate standard deviation
-    rolling_std = result_df[column].rolling(window=window).std()
+    _require_columns(df, column)
     
-    # Calculate upper and lower bands
-    result_df['upper_band'] = result_df['middle_band'] + (rolling_std * num_std)
-    result_df['lower_band'] = result_df['middle_band'] - (rolling_std * num_std)
+    middle, upper, lower = graph.bollinger_bands(graph.column(column), window, num_std)
     
-    return result_df
+    return _add_columns(df, {'middle_band': middle, 'upper_band': upper, 'lower_band': lower})
 
 def calculate_rsi(
     df: pd.DataFrame,
     window: int = 14,
-    column: str = 'close'
+    column: str = 'close',
+    smoothing: Literal['sma', 'wilder'] = 'sma'
 ) -> pd.DataFrame:
     """
     Calculate Relative Strength Index (RSI).
@@ -99,35 +106,15 @@ def calculate_rsi(
         df: DataFrame with price data
         window: Window size for RSI calculation
         column: Column to calculate RSI for
-        
+        smoothing: Averaging of gains and losses - 'sma' or 'wilder'
+    
     Returns:
         DataFrame with added RSI column
     """
-    # Make a copy to avoid modifying original DataFrame
-    result_df = df.copy()
-    
     # Validate inputs
-    if column not in result_df.columns:
-        raise ValueError(f"Column '{column}' not found in DataFrame")
-    
-    # Calculate price changes
-    delta = result_df[column].diff()
-    
-    # Separate gains and losses
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    
-    # Calculate average gain and loss
-    avg_gain = gain.rolling(window=window).mean()
-    avg_loss = loss.rolling(window=window).mean()
-    
-    # Calculate RS (Relative Strength)
-    rs = avg_gain / avg_loss.where(avg_loss > 0, 1)  # Avoid division by zero
-    
-    # Calculate RSI
-    result_df['rsi'] = 100 - (100 / (1 + rs))
+    _require_columns(df, column)
     
-    return result_df
+    return _add_columns(df, {'rsi': graph.rsi(graph.column(column), window, smoothing)})
 
 def calculate_macd(
     df: pd.DataFrame,
@@ -145,53 +132,16 @@ def calculate_macd(
         slow_period: Slow EMA period
         signal_period: Signal line EMA period
         column: Column to calculate MACD for
-        
+    
     Returns:
         DataFrame with added macd, macd_signal, and macd_histogram columns
     """
-    # Make a copy to avoid modifying original DataFrame
-    result_df = df.copy()
-    
     # Validate inputs
-    if column not in result_df.columns:
-        raise ValueError(f"Column '{column}' not found in DataFrame")
-    
-    # Calculate fast and slow EMAs
-    result_df = calculate_moving_average(
-        result_df,
-        window=fast_period,
-        ma_type='ema',
-        column=column,
-        new_column='ema_fast'
-    )
-    
-    result_df = calculate_moving_average(
-        result_df,
-        window=slow_period,
-        ma_type='ema',
-        column=column,
-        new_column='ema_slow'
-    )
-    
-    # Calculate MACD line
-    result_df['macd'] = result_df['ema_fast'] - result_df['ema_slow']
+    _require_columns(df, column)
     
-    # Calculate signal line
-    result_df = calculate_moving_average(
-        result_df,
-        window=signal_period,
-        ma_type='ema',
-        column='macd',
-        new_column='macd_signal'
-    )
-    
-    # Calculate MACD histogram
-    result_df['macd_histogram'] = result_df['macd'] - result_df['macd_signal']
-    
-    # Clean up intermediate columns
-    result_df = result_df.drop(['ema_fast', 'ema_slow'], axis=1)
+    line, signal, histogram = graph.macd(graph.column(column), fast_period, slow_period, signal_period)
     
-    return result_df
+    return _add_columns(df, {'macd': line, 'macd_signal': signal, 'macd_histogram': histogram})
 
 def calculate_atr(
     df: pd.DataFrame,
@@ -203,33 +153,16 @@ def calculate_atr(
     Args:
         df: DataFrame with price data (must have 'high', 'low', 'close' columns)
         window: Window size for ATR calculation
-        
+    
     Returns:
         DataFrame with added 'atr' column
     """
-    # Make a copy to avoid modifying original DataFrame
-    result_df = df.copy()
-    
     # Validate inputs
-    required_columns = ['high', 'low', 'close']
-    for col in required_columns:
-        if col not in result_df.columns:
-            raise ValueError(f"Column '{col}' not found in DataFrame")
+    _require_columns(df, 'high', 'low', 'close')
     
-    # Calculate True Range
-    result_df['tr1'] = result_df['high'] - result_df['low']  # Current high - current low
-    result_df['tr2'] = abs(result_df['high'] - result_df['close'].shift(1))  # Current high - previous close
-    result_df['tr3'] = abs(result_df['low'] - result_df['close'].shift(1))  # Current low - previous close
+    atr = graph.atr(graph.column('high'), graph.column('low'), graph.column('close'), window)
     
-    result_df['true_range'] = result_df[['tr1', 'tr2', 'tr3']].max(axis=1)
-    
-    # Calculate ATR
-    result_df['atr'] = result_df['true_range'].rolling(window=window).mean()
-    
-    # Clean up intermediate columns
-    result_df = result_df.drop(['tr1', 'tr2', 'tr3', 'true_range'], axis=1)
-    
-    return result_df
+    return _add_columns(df, {'atr': atr})
 
 def calculate_stochastic_oscillator(
     df: pd.DataFrame,
@@ -245,33 +178,144 @@ def calculate_stochastic_oscillator(
         k_period: %K period
         d_period: %D period
         slowing: Slowing period
-        
+    
     Returns:
         DataFrame with added 'stoch_k' and 'stoch_d' columns
     """
-    # Make a copy to avoid modifying original DataFrame
-    result_df = df.copy()
-    
     # Validate inputs
-    required_columns = ['high', 'low', 'close']
-    for col in required_columns:
-        if col not in result_df.columns:
-            raise ValueError(f"Column '{col}' not found in DataFrame")
+    _require_columns(df, 'high', 'low', 'close')
+    
+    k, d = graph.stochastic(
+        graph.column('high'),
+        graph.column('low'),
+        graph.column('close'),
+        k_period,
+        d_period,
+        slowing
+    )
     
-    # Calculate %K
-    lowest_low = result_df['low'].rolling(window=k_period).min()
-    highest_high = result_df['high'].rolling(window=k_period).max()
+    return _add_columns(df, {'stoch_k': k, 'stoch_d': d})
+
+def build_price_panel(data: Dict[str, pd.DataFrame], column: str = 'close') -> pd.DataFrame:
+    """
+    Align one column of many symbols' market data into a panel.
     
-    result_df['stoch_k_raw'] = 100 * ((result_df['close'] - lowest_low) / 
-                                    (highest_high - lowest_low).where(highest_high > lowest_low, 1))
+    Args:
+        data: Dictionary mapping symbols to DataFrames indexed by timestamp
+        column: Column to align
     
-    # Apply slowing to %K
-    result_df['stoch_k'] = result_df['stoch_k_raw'].rolling(window=slowing).mean()
+    Returns:
+        DataFrame indexed by the union of timestamps with one column per
+        symbol, NaN where a symbol has no bar
+    """
+    for symbol, symbol_data in data.items():
+        if column not in symbol_data.columns:
+            raise ValueError(f"Column '{column}' not found in DataFrame for {symbol}")
+    
+    if not data:
+        return pd.DataFrame()
+    
+    return pd.concat({symbol: symbol_data[column] for symbol, symbol_data in data.items()}, axis=1).sort_index()
+
+def _panel_values(*panels: pd.DataFrame) -> List[np.ndarray]:
+    shape = panels[0].shape
+    for panel in panels[1:]:
+        if panel.shape != shape:
+            raise ValueError("Panels must have the same timestamps and symbols")
+    return [panel.to_numpy(dtype=np.float64) for panel in panels]
+
+def _panel_frame(values: np.ndarray, close: np.ndarray, like: pd.DataFrame) -> pd.DataFrame:
+    # Indicators carried past a symbol's last price, or before its first, are not defined
+    priced = ~np.isnan(close)
+    outside = ~np.logical_or.accumulate(priced, axis=0) | ~np.logical_or.accumulate(priced[::-1], axis=0)[::-1]
+    values[outside] = np.nan
+    return pd.DataFrame(to_price_dtype(values), index=like.index, columns=like.columns, copy=False)
+
+def calculate_panel_moving_average(
+    close: pd.DataFrame,
+    window: int,
+    ma_type: Literal['sma', 'ema'] = 'sma'
+) -> pd.DataFrame:
+    """
+    Calculate a moving average for every symbol of a price panel.
     
-    # Calculate %D (SMA of %K)
-    result_df['stoch_d'] = result_df['stoch_k'].rolling(window=d_period).mean()
+    Args:
+        close: Time x symbols panel of prices
+        window: Window size for moving average
+        ma_type: Type of moving average - 'sma' or 'ema'
     
-    # Clean up intermediate columns
-    result_df = result_df.drop(['stoch_k_raw'], axis=1)
+    Returns:
+        Time x symbols panel of moving averages
+    """
+    values, = _panel_values(close)
+    
+    if ma_type.lower() == 'sma':
+        return _panel_frame(kernels.sma(values, window), values, close)
+    if ma_type.lower() == 'ema':
+        return _panel_frame(kernels.ema(values, window), values, close)
+    raise ValueError("ma_type must be either 'sma' or 'ema'")
+
+def calculate_panel_bollinger_bands(
+    close: pd.DataFrame,
+    window: int = 20,
+    num_std: float = 2.0
+) -> Dict[str, pd.DataFrame]:
+    """
+    Calculate Bollinger Bands for every symbol of a price panel.
+    
+    Args:
+        close: Time x symbols panel of prices
+        window: Window size for moving average
+        num_std: Number of standard deviations for bands
     
-    return result_df
\ No newline at end of file
+    Returns:
+        Dictionary with middle_band, upper_band and lower_band panels
+    """
+    values, = _panel_values(close)
+    middle, upper, lower = kernels.bollinger_bands(values, window, num_std)
+    
+    return {
+        'middle_band': _panel_frame(middle, values, close),
+        'upper_band': _panel_frame(upper, values, close),
+        'lower_band': _panel_frame(lower, values, close)
+    }
+
+def calculate_panel_rsi(
+    close: pd.DataFrame,
+    window: int = 14,
+    smoothing: Literal['sma', 'wilder'] = 'sma'
+) -> pd.DataFrame:
+    """
+    Calculate RSI for every symbol of a price panel.
+    
+    Args:
+        close: Time x symbols panel of prices
+        window: Window size for RSI calculation
+        smoothing: Averaging of gains and losses - 'sma' or 'wilder'
+    
+    Returns:
+        Time x symbols panel of RSI values
+    """
+    values, = _panel_values(close)
+    return _panel_frame(kernels.rsi(values, window, smoothing), values, close)
+
+def calculate_panel_atr(
+    high: pd.DataFrame,
+    low: pd.DataFrame,
+    close: pd.DataFrame,
+    window: int = 14
+) -> pd.DataFrame:
+    """
+    Calculate ATR for every symbol of aligned high, low and close panels.
+    
+    Args:
+        high: Time x symbols panel of high prices
+        low: Time x symbols panel of low prices
+        close: Time x symbols panel of close prices
+        window: Window size for ATR calculation
+    
+    Returns:
+        Time x symbols panel of ATR values
+    """
+    high_values, low_values, close_values = _panel_values(high, low, close)
+    return _panel_frame(kernels.atr(high_values, low_values, close_values, window), close_values, close)
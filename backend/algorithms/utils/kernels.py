@@ -0,0 +1,415 @@
+# backend/algorithms/utils/kernels.py
+"""
+Array kernels for technical indicators.
+
+Every kernel takes NumPy arrays and returns new arrays of the same shape,
+with NaN where the indicator is not yet defined. Inputs are either one
+series or a time x symbols panel, whose columns are computed independently
+in the same call. Panel columns may start and end at different times: the
+NaN before a symbol's first bar and after its last one do not affect its
+values, so each column matches the kernel applied to that symbol alone.
+
+Kernels never copy their inputs: rolling and exponential windows run pandas'
+compiled window routines over Series or DataFrames that wrap the input
+arrays, and everything else is plain NumPy, so each call allocates only its
+outputs and a few temporaries.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Sequence, Tuple
+
+# Rows per block of the prefix sums behind the multi-window kernels. Sums
+# restart at every block, so their rounding error grows with the block size
+# rather than with the length of the series.
+PREFIX_BLOCK = 1024
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    # Float64 input passes through without a copy
+    return np.asarray(values, dtype=np.float64)
+
+def _wrap(values: np.ndarray):
+    values = _as_float(values)
+    if values.ndim == 2:
+        return pd.DataFrame(values, copy=False)
+    return pd.Series(values, copy=False)
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculate a simple moving average.
+
+    Args:
+        values: Array of values
+        window: Number of values per average
+
+    Returns:
+        Array of averages, NaN for the first window - 1 values
+    """
+    return _wrap(values).rolling(window=window).mean().to_numpy()
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Calculate an exponential moving average with smoothing 2 / (span + 1).
+
+    Args:
+        values: Array of values
+        span: Span of the average
+
+    Returns:
+        Array of averages, starting from the first value
+    """
+    return _wrap(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+def wilder_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculate Wilder's smoothed average, an exponential average with smoothing 1 / window.
+
+    Args:
+        values: Array of values
+        window: Smoothing window
+
+    Returns:
+        Array of averages, NaN for the first window - 1 values
+    """
+    return _wrap(values).ewm(com=window - 1, adjust=False, min_periods=window).mean().to_numpy()
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculate a rolling sample standard deviation.
+
+    Args:
+        values: Array of values
+        window: Number of values per window
+
+    Returns:
+        Array of standard deviations, NaN for the first window - 1 values
+    """
+    return _wrap(values).rolling(window=window).std().to_numpy()
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Calculate a rolling minimum, NaN for the first window - 1 values."""
+    return _wrap(values).rolling(window=window).min().to_numpy()
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Calculate a rolling maximum, NaN for the first window - 1 values."""
+    return _wrap(values).rolling(window=window).max().to_numpy()
+
+def bollinger_bands(close: np.ndarray, window: int = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate Bollinger Bands.
+
+    Args:
+        close: Array of prices
+        window: Window size for the moving average
+        num_std: Number of standard deviations for the bands
+
+    Returns:
+        Tuple of (middle band, upper band, lower band) arrays
+    """
+    middle = sma(close, window)
+    width = rolling_std(close, window)
+    width *= num_std
+    return middle, middle + width, middle - width
+
+def rsi(close: np.ndarray, window: int = 14, smoothing: str = 'sma') -> np.ndarray:
+    """
+    Calculate the Relative Strength Index from averages of gains and losses.
+
+    Args:
+        close: Array of prices
+        window: Window size for the averages
+        smoothing: 'sma' for simple averages or 'wilder' for Wilder's smoothing
+
+    Returns:
+        Array of RSI values between 0 and 100, NaN for the first window - 1 values
+    """
+    if smoothing == 'sma':
+        average = sma
+    elif smoothing == 'wilder':
+        average = wilder_average
+    else:
+        raise ValueError("smoothing must be either 'sma' or 'wilder'")
+
+    close = _as_float(close)
+    delta = np.empty_like(close)
+    delta[:1] = np.nan
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+
+    # Comparisons with NaN are False, so the first bar counts as no change
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    # Nothing is averaged before the first price
+    before_start = ~np.logical_or.accumulate(~np.isnan(close), axis=0)
+    gain[before_start] = np.nan
+    loss[before_start] = np.nan
+
+    avg_gain = average(gain, window)
+    avg_loss = average(loss, window)
+
+    # Avoid division by zero
+    rs = avg_gain / np.where(avg_loss > 0, avg_loss, 1.0)
+    return 100 - 100 / (1 + rs)
+
+def macd(
+    close: np.ndarray,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate Moving Average Convergence Divergence.
+
+    Args:
+        close: Array of prices
+        fast_period: Fast EMA period
+        slow_period: Slow EMA period
+        signal_period: Signal line EMA period
+
+    Returns:
+        Tuple of (MACD line, signal line, histogram) arrays
+    """
+    line = ema(close, fast_period)
+    line -= ema(close, slow_period)
+    signal = ema(line, signal_period)
+    return line, signal, line - signal
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    Calculate the true range of each bar.
+
+    Args:
+        high: Array of high prices
+        low: Array of low prices
+        close: Array of close prices
+
+    Returns:
+        Array of true ranges; the first bar uses its high - low range
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    previous_close = np.empty_like(close)
+    previous_close[:1] = np.nan
+    previous_close[1:] = close[:-1]
+
+    # fmax ignores the missing previous close on the first bar
+    result = high - low
+    np.fmax(result, np.abs(high - previous_close), out=result)
+    np.fmax(result, np.abs(low - previous_close), out=result)
+    return result
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Calculate the Average True Range as a simple average of true ranges.
+
+    Args:
+        high: Array of high prices
+        low: Array of low prices
+        close: Array of close prices
+        window: Window size for the average
+
+    Returns:
+        Array of ATR values, NaN for the first window - 1 values
+    """
+    return sma(true_range(high, low, close), window)
+
+def stochastic(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int = 14,
+    d_period: int = 3,
+    slowing: int = 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the Stochastic Oscillator.
+
+    Args:
+        high: Array of high prices
+        low: Array of low prices
+        close: Array of close prices
+        k_period: %K period
+        d_period: %D period
+        slowing: Slowing period applied to %K
+
+    Returns:
+        Tuple of (%K, %D) arrays
+    """
+    lowest_low = rolling_min(low, k_period)
+    highest_high = rolling_max(high, k_period)
+
+    price_range = highest_high - lowest_low
+    price_range[~(highest_high > lowest_low)] = 1
+
+    raw_k = _as_float(close) - lowest_low
+    raw_k /= price_range
+    raw_k *= 100
+
+    k = sma(raw_k, slowing)
+    return k, sma(k, d_period)
+
+class _WindowSums:
+    """Sums of a 1-D series over trailing windows of any length, from one prefix sum pass."""
+
+    def __init__(self, values: np.ndarray, max_window: int):
+        values = _as_float(values)
+        if values.ndim != 1:
+            raise ValueError("Multi-window kernels take a 1-D array")
+
+        missing = np.isnan(values)
+        self.length = len(values)
+        self.block = max(PREFIX_BLOCK, max_window)
+
+        # Missing values count towards a window's missing count instead of its sum
+        self._missing = np.zeros(self.length + 1, dtype=np.int64)
+        np.cumsum(missing, out=self._missing[1:])
+
+        blocks = -(-self.length // self.block)
+        padded = np.zeros(blocks * self.block)
+        np.copyto(padded[:self.length], values, where=~missing)
+
+        local = np.cumsum(padded.reshape(blocks, self.block), axis=1)
+        self._prefix = local.ravel()[:self.length]
+        self._block_totals = local[:, -1]
+
+    def sums(self, window: int) -> np.ndarray:
+        """Sum of each window ending at every row, NaN where it is incomplete or has a missing value."""
+        result = np.full(self.length, np.nan)
+        if window > self.length:
+            return result
+
+        prefix = self._prefix
+        ends = result[window - 1:]
+        ends[0] = prefix[window - 1]
+        np.subtract(prefix[window:], prefix[:self.length - window], out=ends[1:])
+
+        # Windows starting in the block before their end need that block's remaining total
+        boundaries = np.arange(self.block, self.length, self.block)
+        starts = (boundaries[:, None] - np.arange(1, window + 1)).ravel()
+        starts = starts[starts < self.length - window]
+        ends[1 + starts] += self._block_totals[starts // self.block]
+
+        if self._missing[-1]:
+            ends[self._missing[window:] - self._missing[:self.length - window + 1] > 0] = np.nan
+        return result
+
+def _check_windows(windows: Sequence[int]) -> None:
+    if len(windows) == 0:
+        raise ValueError("At least one window is required")
+    for window in windows:
+        if not isinstance(window, (int, np.integer)) or window <= 0:
+            raise ValueError("Windows must be positive integers")
+
+def sma_windows(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    Calculate simple moving averages for several windows in one pass.
+
+    The averages come from shared prefix sums rather than one rolling pass
+    per window. They agree with sma to floating-point rounding.
+
+    Args:
+        values: 1-D array of values
+        windows: Window sizes
+
+    Returns:
+        2-D array with one column of averages per window
+    """
+    _check_windows(windows)
+    values = _as_float(values)
+
+    # Centering on the first value keeps the sums small
+    finite = values[np.isfinite(values)]
+    offset = finite[0] if len(finite) else 0.0
+    sums = _WindowSums(values - offset, max(windows))
+
+    result = np.empty((len(values), len(windows)), order='F')
+    for column, window in enumerate(windows):
+        averages = sums.sums(window)
+        averages /= window
+        averages += offset
+        result[:, column] = averages
+    return result
+
+def rolling_std_windows(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    Calculate rolling sample standard deviations for several windows in one pass.
+
+    The deviations come from shared prefix sums of values and their squares,
+    so their rounding error scales with the level of the values rather than
+    with the deviations: on prices it is a tiny fraction of a cent, but
+    deviations close to zero are not accurate relative to themselves.
+
+    Args:
+        values: 1-D array of values
+        windows: Window sizes
+
+    Returns:
+        2-D array with one column of standard deviations per window, NaN for
+        windows of a single value
+    """
+    _check_windows(windows)
+    values = _as_float(values)
+
+    # Centering on the mean keeps the squares small
+    finite = values[np.isfinite(values)]
+    centered = values - (finite.mean() if len(finite) else 0.0)
+    sums = _WindowSums(centered, max(windows))
+    squares = _WindowSums(centered * centered, max(windows))
+
+    result = np.empty((len(values), len(windows)), order='F')
+    for column, window in enumerate(windows):
+        if window == 1:
+            result[:, column] = np.nan
+            continue
+        total = sums.sums(window)
+        np.square(total, out=total)
+        total /= window
+
+        variance = squares.sums(window)
+        variance -= total
+        variance /= window - 1
+
+        # Rounding can leave a tiny negative variance, which counts as zero
+        np.maximum(variance, 0.0, out=variance)
+        np.sqrt(variance, out=result[:, column])
+    return result
+
+def rsi_windows(close: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    Calculate the Relative Strength Index for several windows in one pass.
+
+    Gains and losses are averaged from shared prefix sums. Values agree with
+    rsi using simple averages to floating-point rounding.
+
+    Args:
+        close: 1-D array of prices
+        windows: Window sizes
+
+    Returns:
+        2-D array with one column of RSI values per window
+    """
+    _check_windows(windows)
+    close = _as_float(close)
+    if close.ndim != 1:
+        raise ValueError("Multi-window kernels take a 1-D array")
+
+    delta = np.empty_like(close)
+    delta[:1] = np.nan
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    before_start = ~np.logical_or.accumulate(~np.isnan(close))
+    gain[before_start] = np.nan
+    loss[before_start] = np.nan
+
+    gains = _WindowSums(gain, max(windows))
+    losses = _WindowSums(loss, max(windows))
+
+    result = np.empty((len(close), len(windows)), order='F')
+    for column, window in enumerate(windows):
+        # Sums of non-negative values can round to just below zero
+        avg_gain = np.maximum(gains.sums(window), 0.0) / window
+        avg_loss = np.maximum(losses.sums(window), 0.0) / window
+        rs = avg_gain / np.where(avg_loss > 0, avg_loss, 1.0)
+        result[:, column] = 100 - 100 / (1 + rs)
+    return result
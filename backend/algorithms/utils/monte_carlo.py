@@ -0,0 +1,226 @@
+# backend/algorithms/utils/monte_carlo.py
+"""
+Monte Carlo robustness analysis for backtest equity curves.
+
+Resampled return paths are generated as 2-D arrays (paths x bars) and their
+metrics are computed along the bar axis, so thousands of paths cost a few
+array operations instead of thousands of backtest re-runs. Paths are
+processed in chunks to bound peak memory.
+"""
+
+import numpy as np
+from typing import Dict, Any, Iterator, List, Optional
+
+from backend.algorithms.utils.performance import (
+    TRADING_DAYS_PER_YEAR,
+    DAILY_RISK_FREE_RATE,
+    calculate_returns
+)
+
+RESAMPLING_METHODS = ["block_bootstrap", "trade_shuffle"]
+
+def block_bootstrap_paths(
+    returns: np.ndarray,
+    n_paths: int,
+    block_size: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Resample returns with a moving block bootstrap.
+
+    Each path is built from randomly placed blocks of consecutive returns, so
+    short-range autocorrelation and volatility clustering are preserved.
+
+    Args:
+        returns: Array of per-bar returns
+        n_paths: Number of paths to generate
+        block_size: Number of consecutive returns per block
+        rng: Random number generator
+
+    Returns:
+        2-D array of resampled returns with one row per path
+    """
+    n = len(returns)
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+
+    starts = rng.integers(0, n - block_size + 1, size=(n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, n_blocks * block_size)[:, :n]
+    return returns[index]
+
+def trade_shuffle_paths(
+    returns: np.ndarray,
+    trade_bars: np.ndarray,
+    n_paths: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Resample returns by drawing whole holding periods with replacement.
+
+    The curve is cut at every trade into segments whose returns stay in their
+    original order. Each path draws segments at random until it covers the
+    original number of bars, so paths reflect a different sequence and mix
+    of the strategy's trades.
+
+    Args:
+        returns: Array of per-bar returns
+        trade_bars: Sorted bar positions (in returns) where trades were executed
+        n_paths: Number of paths to generate
+        rng: Random number generator
+
+    Returns:
+        2-D array of resampled returns with one row per path
+    """
+    n = len(returns)
+    bounds = np.unique(np.concatenate(([0], trade_bars[(trade_bars > 0) & (trade_bars < n)], [n])))
+    seg_starts = bounds[:-1]
+    seg_lengths = np.diff(bounds)
+
+    # Draw somewhat more segments than an average path needs, then top up short paths
+    n_draws = int(np.ceil(1.25 * n / seg_lengths.mean())) + 1
+    draws = rng.integers(0, len(seg_starts), size=(n_paths, n_draws))
+    while seg_lengths[draws].sum(axis=1).min() < n:
+        draws = np.hstack([draws, rng.integers(0, len(seg_starts), size=(n_paths, n_draws))])
+
+    lengths = seg_lengths[draws]
+    path_starts = np.cumsum(lengths, axis=1) - lengths
+
+    # Position of every drawn bar in the original series, laid out path after path
+    offsets = (seg_starts[draws] - path_starts).ravel()
+    flat = np.repeat(offsets, lengths.ravel())
+    row_lengths = lengths.sum(axis=1)
+    row_starts = np.cumsum(row_lengths) - row_lengths
+    positions = row_starts[:, None] + np.arange(n)
+    index = flat[positions] + np.arange(n)
+
+    return returns[index]
+
+def path_metrics(
+    paths: np.ndarray,
+    initial_capital: float,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    risk_free_rate: float = DAILY_RISK_FREE_RATE
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate metrics of many return paths at once.
+
+    Args:
+        paths: 2-D array of per-bar returns with one row per path
+        initial_capital: Starting capital of every path
+        periods_per_year: Number of bars per year for annualization
+        risk_free_rate: Risk-free rate per bar
+
+    Returns:
+        Dictionary mapping metric names to arrays with one value per path
+    """
+    equity = initial_capital * np.cumprod(1 + paths, axis=1)
+
+    excess = paths - risk_free_rate
+    std = excess.std(axis=1, ddof=1) if paths.shape[1] > 1 else np.zeros(len(paths))
+    sharpe = np.divide(excess.mean(axis=1), std, out=np.zeros(len(paths)), where=std > 0) * np.sqrt(periods_per_year)
+
+    # Include the starting capital as the first peak
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), initial_capital)
+    max_drawdown = ((peaks - equity) / peaks).max(axis=1)
+
+    return {
+        "sharpe_ratio": sharpe,
+        "max_drawdown": max_drawdown,
+        "final_equity": equity[:, -1]
+    }
+
+def _iter_chunks(n_paths: int, n_bars: int, max_chunk_bytes: int) -> Iterator[int]:
+    # Several float64 arrays of chunk x bars are alive at once while computing metrics
+    chunk = max(1, max_chunk_bytes // (n_bars * 8 * 6))
+    for start in range(0, n_paths, chunk):
+        yield min(chunk, n_paths - start)
+
+def run_monte_carlo(
+    equity: np.ndarray,
+    initial_capital: float,
+    method: str = "block_bootstrap",
+    n_paths: int = 1000,
+    block_size: int = 20,
+    trade_bars: Optional[np.ndarray] = None,
+    confidence_level: float = 0.95,
+    seed: Optional[int] = None,
+    max_chunk_bytes: int = 64 * 1024 * 1024,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    risk_free_rate: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Estimate the distribution of backtest metrics by resampling its returns.
+
+    Args:
+        equity: Array of portfolio values from the backtest
+        initial_capital: Starting capital for every path
+        method: 'block_bootstrap' or 'trade_shuffle'
+        n_paths: Number of resampled paths
+        block_size: Block length for the block bootstrap
+        trade_bars: Bar positions of trades in the equity curve, required for
+            trade shuffling
+        confidence_level: Coverage of the reported confidence intervals
+        seed: Random seed for reproducible results (optional)
+        max_chunk_bytes: Approximate memory budget for one chunk of paths
+        periods_per_year: Number of bars per year for annualization
+        risk_free_rate: Risk-free rate per bar (defaults to the daily rate
+            scaled to the bar length)
+
+    Returns:
+        Dictionary with confidence intervals per metric and the probability of loss
+    """
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(f"Unsupported resampling method: {method}")
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    if risk_free_rate is None:
+        risk_free_rate = DAILY_RISK_FREE_RATE * TRADING_DAYS_PER_YEAR / periods_per_year
+
+    returns = calculate_returns(equity)
+    if len(returns) < 2:
+        raise ValueError("At least 3 equity points are required for Monte Carlo analysis")
+
+    if method == "trade_shuffle":
+        if trade_bars is None or len(trade_bars) == 0:
+            raise ValueError("Trade shuffling requires a backtest with at least one trade")
+        # A trade filled at bar p sets the position for the return from p to p + 1
+        trade_bars = np.sort(np.asarray(trade_bars, dtype=np.int64))
+
+    rng = np.random.default_rng(seed)
+    collected: Dict[str, List[np.ndarray]] = {"sharpe_ratio": [], "max_drawdown": [], "final_equity": []}
+
+    for chunk in _iter_chunks(n_paths, len(returns), max_chunk_bytes):
+        if method == "block_bootstrap":
+            paths = block_bootstrap_paths(returns, chunk, block_size, rng)
+        else:
+            paths = trade_shuffle_paths(returns, trade_bars, chunk, rng)
+
+        for name, values in path_metrics(paths, initial_capital, periods_per_year, risk_free_rate).items():
+            collected[name].append(values)
+
+    observed = path_metrics(returns[None, :], initial_capital, periods_per_year, risk_free_rate)
+    tail = (1 - confidence_level) / 2 * 100
+
+    metrics = {}
+    for name, chunks in collected.items():
+        values = np.concatenate(chunks)
+        lower, median, upper = np.percentile(values, [tail, 50, 100 - tail])
+        metrics[name] = {
+            "observed": float(observed[name][0]),
+            "mean": float(values.mean()),
+            "median": float(median),
+            "std": float(values.std()),
+            "lower": float(lower),
+            "upper": float(upper)
+        }
+
+    final_equity = np.concatenate(collected["final_equity"])
+
+    return {
+        "method": method,
+        "n_paths": n_paths,
+        "block_size": block_size if method == "block_bootstrap" else None,
+        "confidence_level": confidence_level,
+        "probability_of_loss": float(np.mean(final_equity < initial_capital)),
+        "metrics": metrics
+    }
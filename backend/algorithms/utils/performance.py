@@ -0,0 +1,188 @@
+# backend/algorithms/utils/performance.py
+"""
+Performance metrics for backtests.
+
+Every metric is computed from NumPy arrays in a constant number of O(n)
+passes, so the same function serves single-symbol backtests, portfolio
+backtests, combined multi-symbol results and parameter sweeps.
+"""
+
+import numpy as np
+from typing import Dict, Any, Optional
+
+TRADING_DAYS_PER_YEAR = 252
+DAILY_RISK_FREE_RATE = 0.0001  # 0.01% per bar
+
+# Bars per year for each supported bar timeframe (6.5-hour US sessions)
+PERIODS_PER_YEAR = {
+    "1Day": TRADING_DAYS_PER_YEAR,
+    "1Hour": TRADING_DAYS_PER_YEAR * 7,
+    "1Min": TRADING_DAYS_PER_YEAR * 390
+}
+
+def calculate_returns(equity: np.ndarray) -> np.ndarray:
+    """
+    Calculate simple per-bar returns of an equity curve.
+
+    Args:
+        equity: Array of portfolio values
+
+    Returns:
+        Array with one return per bar after the first (0 after a non-positive value)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    return _returns_from_pnl(np.diff(equity), equity[:-1])
+
+def _returns_from_pnl(pnl: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    # The masked divide is several times slower, so only use it when needed
+    if previous.min(initial=1.0) > 0:
+        return pnl / previous
+    return np.divide(pnl, previous, out=np.zeros(len(previous)), where=previous > 0)
+
+def calculate_drawdowns(equity: np.ndarray) -> np.ndarray:
+    """
+    Calculate the drawdown from the running peak at every bar.
+
+    Args:
+        equity: Array of portfolio values
+
+    Returns:
+        Array of drawdowns as positive decimals (0.1 = 10% below the peak)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    return _drawdowns_from_peaks(equity, np.maximum.accumulate(equity))
+
+def _drawdowns_from_peaks(equity: np.ndarray, peaks: np.ndarray) -> np.ndarray:
+    if peaks.min(initial=1.0) > 0:
+        return (peaks - equity) / peaks
+    return np.divide(peaks - equity, peaks, out=np.zeros(len(equity)), where=peaks > 0)
+
+def calculate_max_drawdown_duration(equity: np.ndarray) -> int:
+    """
+    Calculate the longest time spent below a previous peak.
+
+    Args:
+        equity: Array of portfolio values
+
+    Returns:
+        Number of bars in the longest drawdown, including one still open at the end
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) == 0:
+        return 0
+
+    return _max_duration_below_peaks(equity, np.maximum.accumulate(equity))
+
+def _max_duration_below_peaks(equity: np.ndarray, peaks: np.ndarray) -> int:
+    at_peak = np.flatnonzero(equity >= peaks)
+
+    # Bars between consecutive peaks, and from the last peak to the end, are underwater
+    gaps = np.diff(np.append(at_peak, len(equity))) - 1
+    return int(gaps.max())
+
+def calculate_performance_metrics(
+    equity: np.ndarray,
+    initial_capital: float,
+    total_trades: int = 0,
+    position_value: Optional[np.ndarray] = None,
+    traded_value: Optional[np.ndarray] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    risk_free_rate: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Calculate performance metrics from an equity curve.
+
+    Args:
+        equity: Array of portfolio values, one per bar
+        initial_capital: Starting capital for the backtest
+        total_trades: Number of executed trades
+        position_value: Array of gross position value per bar, used for
+            exposure (optional)
+        traded_value: Array of absolute traded value per bar, used for
+            turnover (optional)
+        periods_per_year: Number of bars per year for annualization
+        risk_free_rate: Risk-free rate per bar (defaults to the daily rate
+            scaled to the bar length)
+
+    Returns:
+        Dictionary with performance metrics. Drawdowns are positive decimals
+        and the drawdown duration is in bars; exposure and turnover are None
+        when the arrays they need are not given.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if risk_free_rate is None:
+        risk_free_rate = DAILY_RISK_FREE_RATE * TRADING_DAYS_PER_YEAR / periods_per_year
+
+    if len(equity) == 0:
+        return {
+            "annualized_return": 0,
+            "cagr": 0,
+            "sharpe_ratio": 0,
+            "sortino_ratio": 0,
+            "calmar_ratio": 0,
+            "max_drawdown": 0,
+            "max_drawdown_duration": 0,
+            "volatility": 0,
+            "win_rate": 0,
+            "profit_factor": None,
+            "exposure": None,
+            "turnover": None,
+            "total_trades": total_trades,
+            "final_portfolio_value": initial_capital
+        }
+
+    final_value = float(equity[-1])
+    pnl = np.diff(equity)
+    returns = _returns_from_pnl(pnl, equity[:-1])
+    peaks = np.maximum.accumulate(equity)
+
+    # Compound growth over the length of the curve
+    cagr = (final_value / initial_capital) ** (periods_per_year / len(equity)) - 1 if final_value > 0 else -1.0
+
+    excess_returns = returns - risk_free_rate
+    std = excess_returns.std(ddof=1) if len(excess_returns) > 1 else 0.0
+    sharpe_ratio = excess_returns.mean() / std * np.sqrt(periods_per_year) if std > 0 else 0.0
+
+    # Downside deviation only penalizes returns below the risk-free rate
+    downside = np.sqrt(np.mean(np.minimum(excess_returns, 0.0) ** 2)) if len(excess_returns) > 0 else 0.0
+    sortino_ratio = excess_returns.mean() / downside * np.sqrt(periods_per_year) if downside > 0 else 0.0
+
+    max_drawdown = float(_drawdowns_from_peaks(equity, peaks).max())
+    calmar_ratio = cagr / max_drawdown if max_drawdown > 0 else 0.0
+
+    volatility = returns.std(ddof=1) * np.sqrt(periods_per_year) if len(returns) > 1 else 0.0
+    win_rate = np.count_nonzero(returns > 0) / len(returns) if len(returns) > 0 else 0
+
+    # Profit factor from per-bar profit and loss
+    gross_profit = np.maximum(pnl, 0.0).sum()
+    gross_loss = -np.minimum(pnl, 0.0).sum()
+    if gross_loss > 0:
+        profit_factor = float(gross_profit / gross_loss)
+    else:
+        profit_factor = None if gross_profit > 0 else 0.0
+
+    exposure = None
+    if position_value is not None:
+        exposure = float(np.count_nonzero(np.asarray(position_value) != 0) / len(equity))
+
+    turnover = None
+    if traded_value is not None:
+        average_equity = equity.mean()
+        turnover = float(np.sum(traded_value) / average_equity * periods_per_year / len(equity)) if average_equity > 0 else 0.0
+
+    return {
+        "annualized_return": float(cagr),
+        "cagr": float(cagr),
+        "sharpe_ratio": float(sharpe_ratio),
+        "sortino_ratio": float(sortino_ratio),
+        "calmar_ratio": float(calmar_ratio),
+        "max_drawdown": max_drawdown,
+        "max_drawdown_duration": _max_duration_below_peaks(equity, peaks),
+        "volatility": float(volatility),
+        "win_rate": win_rate,
+        "profit_factor": profit_factor,
+        "exposure": exposure,
+        "turnover": turnover,
+        "total_trades": total_trades,
+        "final_portfolio_value": final_value
+    }
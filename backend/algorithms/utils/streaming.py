@@ -0,0 +1,413 @@
+# backend/algorithms/utils/streaming.py
+"""
+Incremental technical indicators for live bar and tick updates.
+
+Each indicator keeps a fixed amount of state and takes one bar at a time
+through update(), so the cost of a new bar does not depend on how much
+history came before it. Updates reproduce the batch kernels in kernels.py
+value for value: rolling sums and variances follow the same compensated
+add-and-remove steps as pandas' rolling windows, rolling extremes are kept in
+monotonic deques, and exponential averages use the same recurrence as
+pandas' ewm. A live strategy therefore sees exactly the indicator values its
+backtest saw.
+"""
+
+import math
+from collections import deque
+from typing import Any, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# A bar is a mapping of column values, such as a dict or a DataFrame row, or a
+# bare price such as the last trade of a tick stream
+Bar = Union[float, Mapping[str, Any]]
+
+NAN = float("nan")
+
+def _bar_value(bar: Bar, column: str) -> float:
+    if isinstance(bar, (int, float, np.number)):
+        return float(bar)
+
+    try:
+        value = bar[column]
+    except (KeyError, IndexError):
+        raise ValueError(f"Bar has no '{column}' value")
+
+    return NAN if value is None else float(value)
+
+def _fmax(a: float, b: float) -> float:
+    # Like np.fmax, a missing value loses to a present one
+    if a != a:
+        return b
+    if b != b:
+        return a
+    return a if a >= b else b
+
+class _RollingMean:
+    """Mean of the last `window` values, following pandas' rolling mean."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._reset()
+
+    def _reset(self) -> None:
+        self._values = deque()
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self._same_count = 0
+        self._previous = NAN
+
+    def push(self, value: float) -> float:
+        # pandas computes single-value windows from scratch
+        if self.window == 1:
+            self._reset()
+        elif len(self._values) == self.window:
+            self._remove(self._values.popleft())
+
+        self._values.append(value)
+        self._add(value)
+
+        if self._nobs < self.window:
+            return NAN
+        if self._same_count >= self._nobs:
+            return self._previous
+
+        result = self._sum / self._nobs
+        # Keep rounding error from changing the sign of the mean
+        if self._neg_ct == 0 and result < 0:
+            return 0.0
+        if self._neg_ct == self._nobs and result > 0:
+            return 0.0
+        return result
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+
+        self._nobs += 1
+        y = value - self._add_compensation
+        t = self._sum + y
+        self._add_compensation = t - self._sum - y
+        self._sum = t
+
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct += 1
+
+        self._same_count = self._same_count + 1 if value == self._previous else 1
+        self._previous = value
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+
+        self._nobs -= 1
+        y = -value - self._remove_compensation
+        t = self._sum + y
+        self._remove_compensation = t - self._sum - y
+        self._sum = t
+
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct -= 1
+
+class _RollingVariance:
+    """Sample variance of the last `window` values, following pandas' rolling var."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._reset()
+
+    def _reset(self) -> None:
+        self._values = deque()
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self._same_count = 0
+        self._previous = NAN
+
+    def push(self, value: float) -> float:
+        if self.window == 1:
+            self._reset()
+        elif len(self._values) == self.window:
+            self._remove(self._values.popleft())
+
+        self._values.append(value)
+        self._add(value)
+
+        if self._nobs < self.window or self._nobs <= 1:
+            return NAN
+        if self._same_count >= self._nobs:
+            return 0.0
+        return self._ssqdm / (self._nobs - 1)
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+
+        self._same_count = self._same_count + 1 if value == self._previous else 1
+        self._previous = value
+
+        # Welford's update with a compensated mean
+        self._nobs += 1
+        previous_mean = self._mean - self._add_compensation
+        y = value - self._add_compensation
+        t = y - self._mean
+        self._add_compensation = t + self._mean - y
+        self._mean = self._mean + t / self._nobs
+        self._ssqdm = self._ssqdm + (value - previous_mean) * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+
+        self._nobs -= 1
+        if not self._nobs:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+            return
+
+        previous_mean = self._mean - self._remove_compensation
+        y = value - self._remove_compensation
+        t = y - self._mean
+        self._remove_compensation = t + self._mean - y
+        self._mean = self._mean - t / self._nobs
+        self._ssqdm = self._ssqdm - (value - previous_mean) * (value - self._mean)
+
+class _RollingExtreme:
+    """Minimum or maximum of the last `window` values, kept in a monotonic deque."""
+
+    def __init__(self, window: int, maximum: bool):
+        self.window = window
+        self.maximum = maximum
+        self._candidates = deque()
+        self._missing = deque()
+        self._position = 0
+
+    def push(self, value: float) -> float:
+        position = self._position
+        self._position += 1
+
+        # Drop candidates that left the window
+        while self._candidates and self._candidates[0][0] <= position - self.window:
+            self._candidates.popleft()
+        while self._missing and self._missing[0] <= position - self.window:
+            self._missing.popleft()
+
+        if value != value:
+            self._missing.append(position)
+        else:
+            # A value beaten by a newer one can never be the extreme again
+            while self._candidates and (
+                self._candidates[-1][1] <= value if self.maximum else self._candidates[-1][1] >= value
+            ):
+                self._candidates.pop()
+            self._candidates.append((position, value))
+
+        if position + 1 < self.window or self._missing:
+            return NAN
+        return self._candidates[0][1]
+
+class _ExponentialMean:
+    """Exponential average with pandas' ewm(adjust=False) recurrence."""
+
+    def __init__(self, com: float, min_periods: int = 1):
+        alpha = 1. / (1. + com)
+        self._old_weight_factor = 1. - alpha
+        self._new_weight = alpha
+        self._min_periods = max(min_periods, 1)
+        self._old_weight = 1.
+        self._weighted = NAN
+        self._nobs = 0
+
+    def push(self, value: float) -> float:
+        is_observation = value == value
+        self._nobs += is_observation
+
+        if self._weighted == self._weighted:
+            # Missing values still decay the weight of the history
+            self._old_weight *= self._old_weight_factor
+            if is_observation:
+                if self._weighted != value:
+                    weighted = self._old_weight * self._weighted + self._new_weight * value
+                    self._weighted = weighted / (self._old_weight + self._new_weight)
+                self._old_weight = 1.
+        elif is_observation:
+            self._weighted = value
+
+        return self._weighted if self._nobs >= self._min_periods else NAN
+
+class StreamingIndicator:
+    """
+    Base class for indicators updated one bar at a time.
+
+    `value` holds the result of the latest update, None before the first.
+    """
+
+    value: Any = None
+
+    def update(self, bar: Bar) -> Any:
+        """
+        Add a new bar and get the indicator's value for it.
+
+        Args:
+            bar: Mapping of column values, or a bare price for indicators of
+                a single column
+
+        Returns:
+            Indicator value for the bar, NaN where the batch version is NaN
+        """
+        raise NotImplementedError
+
+    def warm_up(self, data: pd.DataFrame) -> Any:
+        """
+        Feed historical bars through the indicator before live updates.
+
+        Args:
+            data: DataFrame of bars in time order
+
+        Returns:
+            Indicator value for the last bar, None if there are no bars
+        """
+        columns = {name: data[name].to_numpy() for name in data.columns}
+        for row in range(len(data)):
+            self.update({name: values[row] for name, values in columns.items()})
+        return self.value
+
+class StreamingSMA(StreamingIndicator):
+    """Simple moving average, matching kernels.sma."""
+
+    def __init__(self, window: int, column: str = 'close'):
+        self.column = column
+        self._mean = _RollingMean(window)
+
+    def update(self, bar: Bar) -> float:
+        self.value = self._mean.push(_bar_value(bar, self.column))
+        return self.value
+
+class StreamingEMA(StreamingIndicator):
+    """Exponential moving average, matching kernels.ema."""
+
+    def __init__(self, span: int, column: str = 'close'):
+        self.column = column
+        self._mean = _ExponentialMean(com=(span - 1) / 2.0)
+
+    def update(self, bar: Bar) -> float:
+        self.value = self._mean.push(_bar_value(bar, self.column))
+        return self.value
+
+class StreamingBollingerBands(StreamingIndicator):
+    """Bollinger Bands as (middle, upper, lower), matching kernels.bollinger_bands."""
+
+    def __init__(self, window: int = 20, num_std: float = 2.0, column: str = 'close'):
+        self.num_std = num_std
+        self.column = column
+        self._mean = _RollingMean(window)
+        self._variance = _RollingVariance(window)
+
+    def update(self, bar: Bar) -> Tuple[float, float, float]:
+        close = _bar_value(bar, self.column)
+        middle = self._mean.push(close)
+        variance = self._variance.push(close)
+
+        # Rounding can leave a tiny negative variance, which counts as zero
+        width = math.sqrt(max(variance, 0.0)) if variance == variance else NAN
+        width *= self.num_std
+
+        self.value = (middle, middle + width, middle - width)
+        return self.value
+
+class StreamingRSI(StreamingIndicator):
+    """Relative Strength Index, matching kernels.rsi."""
+
+    def __init__(self, window: int = 14, smoothing: str = 'sma', column: str = 'close'):
+        if smoothing == 'sma':
+            self._gain, self._loss = _RollingMean(window), _RollingMean(window)
+        elif smoothing == 'wilder':
+            self._gain = _ExponentialMean(com=window - 1, min_periods=window)
+            self._loss = _ExponentialMean(com=window - 1, min_periods=window)
+        else:
+            raise ValueError("smoothing must be either 'sma' or 'wilder'")
+
+        self.column = column
+        self._previous = NAN
+        self._started = False
+
+    def update(self, bar: Bar) -> float:
+        close = _bar_value(bar, self.column)
+        delta = close - self._previous
+        self._previous = close
+        self._started = self._started or close == close
+
+        if self._started:
+            # A missing change counts as no change
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+        else:
+            # Nothing is averaged before the first price
+            gain = loss = NAN
+
+        avg_gain = self._gain.push(gain)
+        avg_loss = self._loss.push(loss)
+
+        rs = avg_gain / (avg_loss if avg_loss > 0 else 1.0)
+        self.value = 100 - 100 / (1 + rs)
+        return self.value
+
+class StreamingMACD(StreamingIndicator):
+    """MACD as (line, signal, histogram), matching kernels.macd."""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9, column: str = 'close'):
+        self.column = column
+        self._fast = _ExponentialMean(com=(fast_period - 1) / 2.0)
+        self._slow = _ExponentialMean(com=(slow_period - 1) / 2.0)
+        self._signal = _ExponentialMean(com=(signal_period - 1) / 2.0)
+
+    def update(self, bar: Bar) -> Tuple[float, float, float]:
+        close = _bar_value(bar, self.column)
+        line = self._fast.push(close) - self._slow.push(close)
+        signal = self._signal.push(line)
+
+        self.value = (line, signal, line - signal)
+        return self.value
+
+class StreamingATR(StreamingIndicator):
+    """Average True Range, matching kernels.atr."""
+
+    def __init__(self, window: int = 14):
+        self._mean = _RollingMean(window)
+        self._previous_close = NAN
+
+    def update(self, bar: Bar) -> float:
+        high, low, close = _bar_value(bar, 'high'), _bar_value(bar, 'low'), _bar_value(bar, 'close')
+
+        true_range = _fmax(high - low, abs(high - self._previous_close))
+        true_range = _fmax(true_range, abs(low - self._previous_close))
+        self._previous_close = close
+
+        self.value = self._mean.push(true_range)
+        return self.value
+
+class StreamingStochastic(StreamingIndicator):
+    """Stochastic Oscillator as (%K, %D), matching kernels.stochastic."""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3, slowing: int = 3):
+        self._lowest_low = _RollingExtreme(k_period, maximum=False)
+        self._highest_high = _RollingExtreme(k_period, maximum=True)
+        self._k = _RollingMean(slowing)
+        self._d = _RollingMean(d_period)
+
+    def update(self, bar: Bar) -> Tuple[float, float]:
+        lowest_low = self._lowest_low.push(_bar_value(bar, 'low'))
+        highest_high = self._highest_high.push(_bar_value(bar, 'high'))
+
+        price_range = highest_high - lowest_low if highest_high > lowest_low else 1.0
+        raw_k = (_bar_value(bar, 'close') - lowest_low) / price_range * 100
+
+        k = self._k.push(raw_k)
+        self.value = (k, self._d.push(k))
+        return self.value
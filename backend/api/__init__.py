@@ -13,6 +13,7 @@ from backend.api import backtesting
 from backend.api import portfolio
 from backend.api import market_data
 from backend.api import user
+from backend.api import optimization
 
 __all__ = [
     "auth",
@@ -20,5 +21,6 @@ __all__ = [
     "backtesting",
     "portfolio",
     "market_data",
-    "user"
+    "user",
+    "optimization"
 ]
\ No newline at end of file
@@ -58,6 +58,10 @@ def create_access_token(data: Dict[str, Any], expires_delta: timedelta | None =
     return encoded_jwt
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    return authenticate_token(db, token)
+
+def authenticate_token(db: Session, token: str) -> User:
+    """Get the active user an access token belongs to, raising 401 for invalid tokens."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
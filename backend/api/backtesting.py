@@ -1,25 +1,44 @@
 # backend/api/backtesting.py
+import asyncio
+import json
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, validator
 from sqlalchemy.orm import Session
 
-from backend.models import get_db
+from backend.models import SessionLocal, get_db
 from backend.models.user import User
-from backend.models.backtest import Backtest
-from backend.api.auth import get_current_active_user
+from backend.models.backtest import Backtest, BacktestMode, BacktestStatus
+from backend.api.auth import authenticate_token, get_current_active_user, oauth2_scheme
 from backend.services.backtest_service import (
     create_backtest,
-    run_backtest,
     get_backtest,
     get_backtests,
-    delete_backtest
+    get_result_page,
+    run_robustness_analysis,
+    delete_backtest,
+    request_cancellation
 )
+from backend.services.job_service import enqueue_backtest
+from backend.services.result_cache import result_cache_stats
+from backend.services.indicator_cache import indicator_cache_stats
+from backend.services.progress_service import FINISHED_STATUSES, get_progress
+from backend.config import settings
+from backend.data.bar_store import validate_symbol
+from backend.algorithms.ml_models.model_pool import model_pool
+from backend.algorithms.ml_models.model_registry import model_registry
+from backend.algorithms.utils.monte_carlo import RESAMPLING_METHODS
+from backend.algorithms.utils.performance import PERIODS_PER_YEAR
 
 router = APIRouter(prefix="/backtesting")
 
+# Seconds between keep-alive comments on idle progress streams
+STREAM_KEEPALIVE_SECONDS = 15
+
 # Pydantic models
 class BacktestBase(BaseModel):
     strategy_id: int
@@ -27,12 +46,19 @@ class BacktestBase(BaseModel):
     end_date: datetime
     symbols: List[str]
     initial_capital: float = 10000.0
+    mode: BacktestMode = BacktestMode.INDEPENDENT
+    max_position_pct: Optional[float] = None
+    max_gross_exposure: Optional[float] = None
+    timeframe: str = "1Day"
 
 class BacktestCreate(BacktestBase):
     @validator('symbols')
     def validate_symbols(cls, v):
         if not v or len(v) == 0:
             raise ValueError("At least one symbol is required")
+        # Intraday symbols name bar store directories
+        for symbol in v:
+            validate_symbol(symbol)
         return v
 
     @validator('initial_capital')
@@ -41,13 +67,31 @@ class BacktestCreate(BacktestBase):
             raise ValueError("Initial capital must be greater than 0")
         return v
 
+    @validator('max_position_pct')
+    def validate_max_position_pct(cls, v):
+        if v is not None and not 0 < v <= 1:
+            raise ValueError("Max position percentage must be between 0 and 1")
+        return v
+
+    @validator('max_gross_exposure')
+    def validate_max_gross_exposure(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError("Max gross exposure must be greater than 0")
+        return v
+
+    @validator('timeframe')
+    def validate_timeframe(cls, v):
+        if v not in PERIODS_PER_YEAR:
+            raise ValueError(f"Timeframe must be one of: {', '.join(PERIODS_PER_YEAR)}")
+        return v
+
     @validator('end_date')
     def validate_dates(cls, v, values):
         if 'start_date' in values and values['start_date'] > v:
             raise ValueError("End date must be after start date")
         return v
 
-class BacktestResponse(BaseModel):
+class BacktestSummaryResponse(BaseModel):
     id: int
     user_id: int
     strategy_id: int
@@ -55,21 +99,120 @@ class BacktestResponse(BaseModel):
     end_date: datetime
     symbols: List[str]
     initial_capital: float
+    mode: Optional[str] = None
+    max_position_pct: Optional[float] = None
+    max_gross_exposure: Optional[float] = None
+    timeframe: Optional[str] = None
     status: str
     error_message: Optional[str] = None
+    progress: Optional[float] = None
+    cache_hit: Optional[bool] = None
+    peak_memory_mb: Optional[float] = None
+    started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     annualized_return: Optional[float] = None
     sharpe_ratio: Optional[float] = None
+    sortino_ratio: Optional[float] = None
     max_drawdown: Optional[float] = None
     win_rate: Optional[float] = None
     total_trades: Optional[int] = None
+    profit_factor: Optional[float] = None
     final_equity: Optional[float] = None
     created_at: datetime
-    results: Optional[Dict[str, Any]] = None
 
     class Config:
         orm_mode = True
 
+class BacktestResponse(BacktestSummaryResponse):
+    results: Optional[Dict[str, Any]] = None
+
+    @validator('results')
+    def strip_result_tables(cls, v):
+        # Equity curves and trades are served by their own paged endpoints
+        if v is not None:
+            v = {key: value for key, value in v.items() if key not in ("equity_curve", "trades")}
+        return v
+
+class RobustnessRequest(BaseModel):
+    method: str = "block_bootstrap"
+    n_paths: int = 1000
+    block_size: int = 20
+    confidence_level: float = 0.95
+    seed: Optional[int] = None
+
+    @validator('method')
+    def validate_method(cls, v):
+        if v not in RESAMPLING_METHODS:
+            raise ValueError(f"method must be one of: {', '.join(RESAMPLING_METHODS)}")
+        return v
+
+    @validator('n_paths')
+    def validate_n_paths(cls, v):
+        if not 0 < v <= 100000:
+            raise ValueError("n_paths must be between 1 and 100000")
+        return v
+
+    @validator('block_size')
+    def validate_block_size(cls, v):
+        if v <= 0:
+            raise ValueError("block_size must be greater than 0")
+        return v
+
+    @validator('confidence_level')
+    def validate_confidence_level(cls, v):
+        if not 0 < v < 1:
+            raise ValueError("confidence_level must be between 0 and 1")
+        return v
+
+class MetricInterval(BaseModel):
+    observed: float
+    mean: float
+    median: float
+    std: float
+    lower: float
+    upper: float
+
+class RobustnessResponse(BaseModel):
+    method: str
+    n_paths: int
+    block_size: Optional[int] = None
+    confidence_level: float
+    probability_of_loss: float
+    metrics: Dict[str, MetricInterval]
+
+class ResultCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    lookups: int
+    hit_rate: float
+
+class IndicatorCacheStatsResponse(BaseModel):
+    hits: int
+    remote_hits: int
+    misses: int
+    evictions: int
+    lookups: int
+    hit_rate: float
+    entries: int
+    bytes: int
+    max_bytes: int
+
+class ModelRegistryStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    lookups: int
+    hit_rate: float
+    entries: int
+    bytes: int
+    max_bytes: int
+
+class ResultPage(BaseModel):
+    total: int
+    skip: int
+    limit: Optional[int] = None
+    items: List[Dict[str, Any]]
+
 # API endpoints
 @router.post("/", response_model=BacktestResponse, status_code=status.HTTP_201_CREATED)
 def create_new_backtest(
@@ -77,23 +220,16 @@ def create_new_backtest(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Create and run a new backtest."""
+    """Create a new backtest and queue it for execution."""
     # Create the backtest
     backtest = create_backtest(db, user_id=current_user.id, strategy_id=backtest_data.strategy_id, backtest_data=backtest_data.dict())
     
-    # Run the backtest asynchronously (in a real-world application, this would be done in a background task)
-    try:
-        backtest = run_backtest(db, backtest_id=backtest.id)
-    except Exception as e:
-        # If backtest fails, update the status and error message
-        backtest.status = "failed"
-        backtest.error_message = str(e)
-        db.commit()
-        db.refresh(backtest)
+    # Run the backtest in the background; clients poll it until it leaves the pending/running states
+    enqueue_backtest(backtest.id)
     
     return backtest
 
-@router.get("/", response_model=List[BacktestResponse])
+@router.get("/", response_model=List[BacktestSummaryResponse])
 def read_backtests(
     strategy_id: Optional[int] = None,
     skip: int = 0,
@@ -101,10 +237,38 @@ def read_backtests(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all backtests for the current user."""
+    """Get all backtests for the current user with summary metrics only."""
     backtests = get_backtests(db, user_id=current_user.id, strategy_id=strategy_id, skip=skip, limit=limit)
     return backtests
 
+@router.get("/cache/stats", response_model=ResultCacheStatsResponse)
+def read_result_cache_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get hit and miss counters of the backtest result cache."""
+    return result_cache_stats.snapshot()
+
+@router.get("/cache/indicators/stats", response_model=IndicatorCacheStatsResponse)
+def read_indicator_cache_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get hit and miss counters and memory use of the indicator cache."""
+    return indicator_cache_stats()
+
+@router.get("/cache/models/stats", response_model=ModelRegistryStatsResponse)
+def read_model_registry_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get hit and miss counters and disk use of the fitted model registry."""
+    return model_registry.stats()
+
+@router.get("/cache/models/pool/stats", response_model=ModelRegistryStatsResponse)
+def read_model_pool_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get hit and miss counters and memory use of this process's warm model pool."""
+    return model_pool.stats()
+
 @router.get("/{backtest_id}", response_model=BacktestResponse)
 def read_backtest(
     backtest_id: int = Path(..., description="The ID of the backtest to get"),
@@ -129,6 +293,216 @@ def read_backtest(
     
     return backtest
 
+@router.get("/{backtest_id}/stream")
+async def stream_backtest_progress(
+    request: Request,
+    backtest_id: int = Path(..., description="The ID of the backtest to follow"),
+    token: str = Depends(oauth2_scheme)
+):
+    """Stream progress snapshots of a backtest as Server-Sent Events until it finishes."""
+    # Yield dependencies such as get_db are only closed once the stream ends, so
+    # every database access here uses its own short-lived session instead
+    def check_access() -> None:
+        db = SessionLocal()
+        try:
+            current_user = authenticate_token(db, token)
+            backtest = get_backtest(db, backtest_id=backtest_id)
+            
+            if not backtest:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Backtest not found"
+                )
+            
+            # Check if user owns the backtest
+            if backtest.user_id != current_user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not enough permissions to access this backtest"
+                )
+        finally:
+            db.close()
+    
+    await run_in_threadpool(check_access)
+    
+    def current_snapshot() -> Dict[str, Any]:
+        snapshot = get_progress(backtest_id)
+        if snapshot is not None:
+            return snapshot
+        
+        # No snapshot yet (still pending, or run by a worker without shared Redis)
+        db = SessionLocal()
+        try:
+            row = db.query(Backtest.status, Backtest.progress, Backtest.error_message).filter(
+                Backtest.id == backtest_id
+            ).first()
+        finally:
+            db.close()
+        
+        # A backtest deleted while followed ends the stream
+        backtest_status, progress, error_message = row or (BacktestStatus.CANCELLED, 0.0, "Backtest was deleted")
+        return {
+            "backtest_id": backtest_id,
+            "status": backtest_status,
+            "progress": progress or 0.0,
+            "current_date": None,
+            "equity_curve": [],
+            "error_message": error_message,
+            "sequence": 0
+        }
+    
+    async def events():
+        last = None
+        idle = 0.0
+        
+        while not await request.is_disconnected():
+            snapshot = await run_in_threadpool(current_snapshot)
+            state = (snapshot["status"], snapshot["sequence"], snapshot["progress"])
+            
+            if state != last:
+                last = state
+                idle = 0.0
+                yield f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+            elif idle >= STREAM_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            
+            if snapshot["status"] in FINISHED_STATUSES:
+                break
+            
+            await asyncio.sleep(settings.PROGRESS_MIN_INTERVAL)
+            idle += settings.PROGRESS_MIN_INTERVAL
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{backtest_id}/equity-curve", response_model=ResultPage)
+def read_backtest_equity_curve(
+    backtest_id: int = Path(..., description="The ID of the backtest"),
+    start: Optional[datetime] = Query(None, description="Only include points at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only include points at or before this time"),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=100000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a time range of a backtest's equity curve."""
+    backtest = get_backtest(db, backtest_id=backtest_id)
+    
+    if not backtest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found"
+        )
+    
+    # Check if user owns the backtest
+    if backtest.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this backtest"
+        )
+    
+    return get_result_page(backtest, "equity_curve", start=start, end=end, skip=skip, limit=limit)
+
+@router.get("/{backtest_id}/trades", response_model=ResultPage)
+def read_backtest_trades(
+    backtest_id: int = Path(..., description="The ID of the backtest"),
+    start: Optional[datetime] = Query(None, description="Only include trades at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only include trades at or before this time"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a page of a backtest's trades."""
+    backtest = get_backtest(db, backtest_id=backtest_id)
+    
+    if not backtest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found"
+        )
+    
+    # Check if user owns the backtest
+    if backtest.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this backtest"
+        )
+    
+    return get_result_page(backtest, "trades", start=start, end=end, skip=skip, limit=limit)
+
+@router.post("/{backtest_id}/monte-carlo", response_model=RobustnessResponse)
+def run_backtest_monte_carlo(
+    request: RobustnessRequest,
+    backtest_id: int = Path(..., description="The ID of the backtest to analyze"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Estimate confidence intervals for Sharpe, drawdown and final equity by resampling returns."""
+    backtest = get_backtest(db, backtest_id=backtest_id)
+    
+    if not backtest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found"
+        )
+    
+    # Check if user owns the backtest
+    if backtest.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this backtest"
+        )
+    
+    try:
+        return run_robustness_analysis(
+            backtest,
+            method=request.method,
+            n_paths=request.n_paths,
+            block_size=request.block_size,
+            confidence_level=request.confidence_level,
+            seed=request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/{backtest_id}/cancel", response_model=BacktestResponse)
+def cancel_backtest(
+    backtest_id: int = Path(..., description="The ID of the backtest to cancel"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Cancel a pending or running backtest."""
+    backtest = get_backtest(db, backtest_id=backtest_id)
+    
+    if not backtest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found"
+        )
+    
+    # Check if user owns the backtest
+    if backtest.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to cancel this backtest"
+        )
+    
+    try:
+        return request_cancellation(db, backtest)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
 @router.delete("/{backtest_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_backtest_endpoint(
     backtest_id: int = Path(..., description="The ID of the backtest to delete"),
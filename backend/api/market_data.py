@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 
 from backend.data.connectors.yahoo_finance import (
     get_historical_data, 
@@ -12,7 +12,9 @@ from backend.data.connectors.yahoo_finance import (
     get_market_overview
 )
 from backend.api.auth import get_current_active_user
+from backend.data import bar_store
 from backend.models.user import User
+from backend.services.market_data_service import import_intraday_bars, get_intraday_bar_inventory
 
 router = APIRouter(prefix="/market-data")
 
@@ -38,6 +40,17 @@ class QuoteResponse(BaseModel):
     low: Optional[float] = None
     timestamp: str
 
+class IntradayImportRequest(BaseModel):
+    symbol: str
+    start_date: datetime
+    end_date: datetime
+    timeframe: str = "1Min"
+    price_dtype: Optional[str] = None
+
+    @validator('symbol')
+    def validate_symbol(cls, v):
+        return bar_store.validate_symbol(v)
+
 # Endpoints
 @router.get("/quote/{symbol}")
 async def get_quote(
@@ -112,6 +125,37 @@ async def get_historical(
         "data": data
     }
 
+@router.get("/intraday-bars")
+async def list_intraday_bars(
+    timeframe: str = Query("1Min", description="Bar timeframe"),
+    current_user: User = Depends(get_current_active_user)
+) -> List[Dict[str, Any]]:
+    """List the symbols with intraday bars in the local bar store."""
+    if timeframe not in ("1Min", "1Hour"):
+        raise HTTPException(status_code=400, detail="Timeframe must be 1Min or 1Hour")
+    
+    return get_intraday_bar_inventory(timeframe)
+
+@router.post("/intraday-bars/import")
+def import_intraday(
+    request: IntradayImportRequest,
+    current_user: User = Depends(get_current_active_user)
+) -> Dict[str, Any]:
+    """Download intraday bars for a symbol into the local bar store for minute-resolution backtests."""
+    if request.timeframe not in ("1Min", "1Hour"):
+        raise HTTPException(status_code=400, detail="Timeframe must be 1Min or 1Hour")
+    
+    try:
+        return import_intraday_bars(
+            request.symbol,
+            request.start_date,
+            request.end_date,
+            timeframe=request.timeframe,
+            price_dtype=request.price_dtype
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/search")
 async def search_symbols(
     query: str = Query(..., min_length=1),
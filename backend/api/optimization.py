@@ -0,0 +1,170 @@
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, validator
+
+from backend.models.user import User
+from backend.api.auth import get_current_active_user
+from backend.algorithms import ALGORITHM_REGISTRY
+from backend.services.optimization_service import optimize_strategy, optimize_walk_forward
+
+router = APIRouter(prefix="/optimization")
+
+RANKING_METRICS = [
+    "annualized_return", "sharpe_ratio", "sortino_ratio", "calmar_ratio", "max_drawdown",
+    "max_drawdown_duration", "win_rate", "profit_factor", "final_portfolio_value"
+]
+
+# Pydantic models
+class ParameterSweepRequest(BaseModel):
+    algorithm_type: str
+    symbol: str
+    start_date: datetime
+    end_date: datetime
+    initial_capital: float = 10000.0
+    parameter_grid: Optional[Dict[str, List[Any]]] = None
+    search_space: Optional[Dict[str, Any]] = None
+    n_samples: int = 100
+    rank_by: str = "sharpe_ratio"
+    top_n: Optional[int] = None
+    seed: Optional[int] = None
+
+    @validator('algorithm_type')
+    def validate_algorithm_type(cls, v):
+        if v not in ALGORITHM_REGISTRY:
+            raise ValueError(f"Invalid algorithm type. Must be one of: {', '.join(ALGORITHM_REGISTRY)}")
+        return v
+
+    @validator('rank_by')
+    def validate_rank_by(cls, v):
+        if v not in RANKING_METRICS:
+            raise ValueError(f"rank_by must be one of: {', '.join(RANKING_METRICS)}")
+        return v
+
+    @validator('n_samples')
+    def validate_n_samples(cls, v):
+        if v <= 0:
+            raise ValueError("n_samples must be greater than 0")
+        return v
+
+    @validator('end_date')
+    def validate_dates(cls, v, values):
+        if 'start_date' in values and values['start_date'] > v:
+            raise ValueError("End date must be after start date")
+        return v
+
+class WalkForwardRequest(ParameterSweepRequest):
+    train_bars: int = 252
+    test_bars: int = 63
+    step_bars: Optional[int] = None
+
+    @validator('train_bars', 'test_bars')
+    def validate_window_size(cls, v):
+        if v <= 0:
+            raise ValueError("Window sizes must be greater than 0")
+        return v
+
+    @validator('step_bars')
+    def validate_step_bars(cls, v, values):
+        if v is not None and v <= 0:
+            raise ValueError("step_bars must be greater than 0")
+        # Overlapping test windows would stitch the same bars more than once
+        if v is not None and 'test_bars' in values and v < values['test_bars']:
+            raise ValueError("step_bars must be at least test_bars")
+        return v
+
+class SweepResult(BaseModel):
+    rank: int
+    parameters: Dict[str, Any]
+    metrics: Dict[str, Any]
+
+class ParameterSweepResponse(BaseModel):
+    algorithm_type: str
+    symbol: str
+    evaluated: int
+    invalid: int
+    indicator_groups: int
+    elapsed_seconds: float
+    rank_by: str
+    results: List[SweepResult]
+
+class WalkForwardWindow(BaseModel):
+    train_start: datetime
+    train_end: datetime
+    test_start: datetime
+    test_end: datetime
+    best_parameters: Dict[str, Any]
+    in_sample_metrics: Dict[str, Any]
+    out_of_sample_metrics: Dict[str, Any]
+    optimize_seconds: float
+    evaluate_seconds: float
+
+class WalkForwardResponse(BaseModel):
+    algorithm_type: str
+    symbol: str
+    invalid: int
+    elapsed_seconds: float
+    rank_by: str
+    windows: List[WalkForwardWindow]
+    equity_curve: List[Dict[str, Any]]
+    metrics: Dict[str, Any]
+
+# API endpoints
+@router.post("/sweep", response_model=ParameterSweepResponse)
+def run_sweep(
+    request: ParameterSweepRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Backtest a grid or random sample of parameter sets and rank them."""
+    try:
+        sweep = optimize_strategy(
+            algorithm_type=request.algorithm_type,
+            symbol=request.symbol,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            initial_capital=request.initial_capital,
+            parameter_grid=request.parameter_grid,
+            search_space=request.search_space,
+            n_samples=request.n_samples,
+            rank_by=request.rank_by,
+            seed=request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if request.top_n is not None:
+        sweep["results"] = sweep["results"][:request.top_n]
+
+    return sweep
+
+@router.post("/walk-forward", response_model=WalkForwardResponse)
+def run_walk_forward_optimization(
+    request: WalkForwardRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Optimize on rolling train windows and evaluate each winner on the following test window."""
+    try:
+        return optimize_walk_forward(
+            algorithm_type=request.algorithm_type,
+            symbol=request.symbol,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            train_bars=request.train_bars,
+            test_bars=request.test_bars,
+            step_bars=request.step_bars,
+            initial_capital=request.initial_capital,
+            parameter_grid=request.parameter_grid,
+            search_space=request.search_space,
+            n_samples=request.n_samples,
+            rank_by=request.rank_by,
+            seed=request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -0,0 +1,6 @@
+# backend/benchmarks/__init__.py
+"""
+Performance benchmarks for Axiom.
+
+Each module is a standalone script, run with `python -m backend.benchmarks.<name>`.
+"""
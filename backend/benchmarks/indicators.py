@@ -0,0 +1,86 @@
+"""
+Benchmark technical indicators and strategy signals on long bar series.
+
+Run with `python -m backend.benchmarks.indicators [--bars N ...] [--repeat R]`.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from backend.algorithms.utils import indicators, kernels
+from backend.algorithms.utils.indicator_cache import indicator_cache
+from backend.algorithms.mean_reversion import MeanReversionStrategy
+from backend.algorithms.trend_following import TrendFollowingStrategy
+
+def make_bars(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Build random-walk minute bars with OHLCV columns."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.0005, n_bars)))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close * (1 + rng.uniform(0.0, 0.001, n_bars)),
+            "low": close * (1 - rng.uniform(0.0, 0.001, n_bars)),
+            "close": close,
+            "volume": rng.integers(100, 10000, n_bars).astype(float)
+        },
+        index=pd.date_range("2020-01-02 09:30", periods=n_bars, freq="min")
+    )
+
+# Windows of the multi-window cases, compared with one call per window
+WINDOWS = [5, 10, 20, 50, 100, 200]
+
+CASES = {
+    "sma": lambda df: indicators.calculate_moving_average(df, 50),
+    "ema": lambda df: indicators.calculate_moving_average(df, 50, ma_type="ema"),
+    "bollinger": indicators.calculate_bollinger_bands,
+    "rsi": indicators.calculate_rsi,
+    "macd": indicators.calculate_macd,
+    "atr": indicators.calculate_atr,
+    "stochastic": indicators.calculate_stochastic_oscillator,
+    "sma per window": lambda df: [kernels.sma(df["close"].to_numpy(), window) for window in WINDOWS],
+    "sma_windows": lambda df: kernels.sma_windows(df["close"].to_numpy(), WINDOWS),
+    "rsi per window": lambda df: [kernels.rsi(df["close"].to_numpy(), window) for window in WINDOWS],
+    "rsi_windows": lambda df: kernels.rsi_windows(df["close"].to_numpy(), WINDOWS),
+    "trend_following": lambda df: TrendFollowingStrategy().generate_signals(df),
+    "mean_reversion": lambda df: MeanReversionStrategy().generate_signals(df)
+}
+
+def run(bars, repeat: int) -> None:
+    # Repeats would otherwise time memoized lookups rather than computation
+    indicator_cache.configure(0)
+
+    for n_bars in bars:
+        df = make_bars(n_bars)
+        data_mb = df.memory_usage(index=True).sum() / 1024 ** 2
+        print(f"{n_bars:,d} bars ({data_mb:.0f} MB of input)")
+
+        for name, case in CASES.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                case(df)
+                timings.append(time.perf_counter() - start)
+
+            # Measured separately, since tracing slows down allocation
+            tracemalloc.start()
+            case(df)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"  {name:<16} {min(timings) * 1000:9.2f} ms  {peak / 1024 ** 2:8.1f} MB allocated at peak")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[100_000, 2_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.bars, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark performance metrics on long equity curves.
+
+Run with `python -m backend.benchmarks.metrics [--points N ...] [--repeat R]`.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.algorithms.utils.performance import calculate_performance_metrics
+
+def make_equity_curve(n_points: int, seed: int = 0) -> np.ndarray:
+    """Build a geometric random-walk equity curve starting near 10,000."""
+    rng = np.random.default_rng(seed)
+    return 10000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, n_points)))
+
+def run(points, repeat: int) -> None:
+    for n_points in points:
+        equity = make_equity_curve(n_points)
+        position_value = np.where(np.arange(n_points) % 3 == 0, 0.0, equity * 0.5)
+        traded_value = np.where(np.arange(n_points) % 20 == 0, equity * 0.1, 0.0)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            calculate_performance_metrics(
+                equity,
+                10000.0,
+                total_trades=n_points // 20,
+                position_value=position_value,
+                traded_value=traded_value
+            )
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        print(f"{n_points:>12,d} points: {best * 1000:9.2f} ms  ({n_points / best / 1e6:6.1f} M points/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[10_000, 1_000_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.points, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Compare float32 and float64 price precision.
+
+Runs the rule-based strategies over a universe of random-walk minute bars
+under both PRICE_DTYPE settings, and reports the memory of bars and
+indicator columns, the time of indicators, signals and backtests, and the
+drift of float32 results from float64 ones.
+
+Only drift that float32 rounding bounds is budgeted: the error of indicator
+values, and the final equity of float32 bars simulated with the float64
+signals. A signal can flip where an indicator lies within rounding of its
+threshold, and a flipped entry or exit changes every later trade, so the
+final equity of float32 backtests on their own signals can differ from
+float64 by several percent. That drift and the fraction of flipped signals
+are reported, not budgeted. The run exits with status 1 if a budget is
+exceeded; backend/tests/test_precision.py runs the same check on a smaller
+universe.
+
+Run with `python -m backend.benchmarks.precision [--symbols N] [--bars N] [--repeat R]`.
+"""
+
+import argparse
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.algorithms.mean_reversion import MeanReversionStrategy
+from backend.algorithms.trend_following import TrendFollowingStrategy
+from backend.algorithms.utils.indicator_cache import indicator_cache
+from backend.benchmarks.indicators import make_bars
+from backend.utils.precision import cast_price_columns, price_dtype, set_price_dtype
+
+# Largest float32 drift accepted from the float64 results
+DRIFT_BUDGETS = {
+    # Absolute error relative to the largest value of the column. Indicators of
+    # price differences, such as ATR and RSI, drift most, since rounding the
+    # prices to float32 changes their differences the most.
+    "indicator": 1e-4,
+    # Relative error of a backtest's final equity with the float64 signals,
+    # i.e. with the same trades, from float32 prices and position sizes
+    "replayed_equity": 1e-5
+}
+
+# Drift that depends on the data rather than on rounding, reported only, with
+# the reason it is not bounded
+REPORTED_DRIFT = {
+    # Fraction of bars with a different signal
+    "signal": "depends on how often indicators lie within rounding of a threshold",
+    # Relative error of the final equity of backtests on their own signals
+    "final_equity": "a flipped signal changes every later trade"
+}
+
+STRATEGIES = {
+    "trend_following": TrendFollowingStrategy,
+    "mean_reversion": MeanReversionStrategy
+}
+
+def _best_time(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run_policy(
+    dtype: str,
+    universe: Dict[str, pd.DataFrame],
+    repeat: int,
+    reference: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Run every strategy over the universe with one price dtype.
+
+    Args:
+        dtype: 'float32' or 'float64'
+        universe: Dictionary mapping symbols to bars
+        repeat: Timing repeats
+        reference: Results of another policy, whose signals are also
+            simulated on this policy's bars (optional)
+
+    Returns:
+        Dictionary with memory use and, per strategy, indicators, signals
+        and final equities
+    """
+    set_price_dtype(dtype)
+    bars = {symbol: cast_price_columns(frame) for symbol, frame in universe.items()}
+    n_bars = sum(len(frame) for frame in bars.values())
+
+    results = {"bar_bytes": sum(int(frame.memory_usage(index=False).sum()) for frame in bars.values())}
+    print(f"{dtype}: {results['bar_bytes'] / 1024 ** 2:.0f} MB of bars")
+
+    for name, strategy_class in STRATEGIES.items():
+        strategy = strategy_class()
+        columns = list(strategy.indicator_graph())
+
+        indicators = {symbol: strategy.calculate_indicators(frame) for symbol, frame in bars.items()}
+        signals = {symbol: strategy.generate_signals(frame) for symbol, frame in bars.items()}
+        backtests = {symbol: strategy.backtest(frame, columnar=True) for symbol, frame in bars.items()}
+        portfolio = strategy.backtest_portfolio(bars, initial_capital=100000.0, columnar=True)
+
+        indicator_seconds = _best_time(lambda: [strategy.calculate_indicators(frame) for frame in bars.values()], repeat)
+        backtest_seconds = _best_time(lambda: [strategy.backtest(frame, columnar=True) for frame in bars.values()], repeat)
+        portfolio_seconds = _best_time(lambda: strategy.backtest_portfolio(bars, initial_capital=100000.0, columnar=True), repeat)
+
+        indicator_bytes = sum(int(frame[columns].memory_usage(index=False).sum()) for frame in indicators.values())
+        print(
+            f"  {name:<16} indicators {indicator_bytes / 1024 ** 2:6.0f} MB {indicator_seconds * 1000:8.1f} ms"
+            f" ({n_bars / indicator_seconds / 1e6:5.1f} M bars/s)"
+            f"  backtests {backtest_seconds * 1000:8.1f} ms  portfolio {portfolio_seconds * 1000:8.1f} ms"
+        )
+
+        results[name] = {
+            "indicators": {symbol: frame[columns] for symbol, frame in indicators.items()},
+            "signals": {symbol: frame["signal"].to_numpy() for symbol, frame in signals.items()},
+            "final_equity": {symbol: result["metrics"]["final_portfolio_value"] for symbol, result in backtests.items()},
+            "portfolio_equity": portfolio["metrics"]["final_portfolio_value"]
+        }
+
+        if reference is not None:
+            # Same trades as the reference, sized and valued with this policy's prices
+            results[name]["replayed_equity"] = {
+                symbol: strategy.simulate_signals(
+                    frame.assign(signal=reference[name]["signals"][symbol])
+                )["metrics"]["final_portfolio_value"]
+                for symbol, frame in signals.items()
+            }
+
+    return results
+
+def measure_drift(reduced: Dict[str, Any], full: Dict[str, Any]) -> Dict[str, float]:
+    """Measure the largest drift of float32 results from float64 ones."""
+    drift = dict.fromkeys([*DRIFT_BUDGETS, *REPORTED_DRIFT], 0.0)
+
+    for name in STRATEGIES:
+        for symbol, expected in full[name]["indicators"].items():
+            actual = reduced[name]["indicators"][symbol]
+            for column in expected.columns:
+                reference = expected[column].to_numpy(dtype=np.float64)
+                error = np.abs(actual[column].to_numpy(dtype=np.float64) - reference)
+                if np.any(np.isfinite(reference)):
+                    drift["indicator"] = max(drift["indicator"], float(np.nanmax(error) / np.nanmax(np.abs(reference))))
+
+        for symbol, expected in full[name]["signals"].items():
+            drift["signal"] = max(drift["signal"], float(np.mean(reduced[name]["signals"][symbol] != expected)))
+
+        pairs = [
+            (reduced[name]["final_equity"][symbol], value)
+            for symbol, value in full[name]["final_equity"].items()
+        ]
+        pairs.append((reduced[name]["portfolio_equity"], full[name]["portfolio_equity"]))
+        for actual, expected in pairs:
+            drift["final_equity"] = max(drift["final_equity"], abs(actual - expected) / abs(expected))
+
+        for symbol, expected in full[name]["final_equity"].items():
+            actual = reduced[name]["replayed_equity"][symbol]
+            drift["replayed_equity"] = max(drift["replayed_equity"], abs(actual - expected) / abs(expected))
+
+    return drift
+
+def compare_policies(universe: Dict[str, pd.DataFrame], repeat: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Run every strategy under float64 and then float32.
+
+    The configured price dtype and indicator cache are restored afterwards.
+
+    Returns:
+        Tuple of the float64 and float32 results of run_policy
+    """
+    configured = price_dtype().name
+    cache_bytes, cache_remote = indicator_cache.max_bytes, indicator_cache.remote
+
+    # Repeats would otherwise time memoized lookups rather than computation
+    indicator_cache.configure(0)
+    try:
+        full = run_policy("float64", universe, repeat)
+        reduced = run_policy("float32", universe, repeat, reference=full)
+    finally:
+        set_price_dtype(configured)
+        indicator_cache.configure(cache_bytes, cache_remote)
+
+    return full, reduced
+
+def run(n_symbols: int, n_bars: int, repeat: int) -> bool:
+    universe = {f"SYM{i}": make_bars(n_bars, seed=i) for i in range(n_symbols)}
+    print(f"{n_symbols} symbols x {n_bars:,d} bars")
+
+    full, reduced = compare_policies(universe, repeat)
+    print(f"bars {reduced['bar_bytes'] / full['bar_bytes']:.2f}x the float64 size")
+
+    within = True
+    for name, value in measure_drift(reduced, full).items():
+        if name in DRIFT_BUDGETS:
+            status = "ok" if value <= DRIFT_BUDGETS[name] else "over budget"
+            within = within and value <= DRIFT_BUDGETS[name]
+            print(f"  {name + ' drift':<24} {value:10.3g}  (budget {DRIFT_BUDGETS[name]:g}, {status})")
+        else:
+            print(f"  {name + ' drift':<24} {value:10.3g}  (not budgeted: {REPORTED_DRIFT[name]})")
+
+    return within
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not run(args.symbols, args.bars, args.repeat):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Measure the import time and memory of API modules and algorithms.
+
+Each module is imported in a fresh interpreter, reporting the import time,
+the resident memory of the process afterwards and which heavy ML
+dependencies the import loaded. Then each algorithm class is resolved from
+ALGORITHM_REGISTRY in turn, showing what the first use of each one loads.
+API processes that never run an ML strategy should load neither TensorFlow
+nor scikit-learn.
+
+Run with `python -m backend.benchmarks.startup [--modules M ...] [--repeat R]`.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+HEAVY_MODULES = ("tensorflow", "sklearn")
+
+# backend.main also creates the database tables, so it needs a database
+DEFAULT_MODULES = ["backend.algorithms", "backend.services.backtest_service", "backend.api.backtesting"]
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+from backend.utils.memory import current_rss_bytes
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_bytes": current_rss_bytes(),
+    "loaded": [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+_FIRST_USE_SCRIPT = """
+import json, sys, time
+import backend.algorithms as algorithms
+from backend.utils.memory import current_rss_bytes
+for name in algorithms.ALGORITHM_REGISTRY:
+    start = time.perf_counter()
+    try:
+        algorithms.get_algorithm_class(name)
+        error = None
+    except ImportError as e:
+        error = str(e)
+    print(json.dumps({{
+        "algorithm": name,
+        "seconds": time.perf_counter() - start,
+        "rss_bytes": current_rss_bytes(),
+        "loaded": [module for module in {heavy!r} if module in sys.modules],
+        "error": error
+    }}))
+"""
+
+def _run_script(script: str) -> List[Dict[str, Any]]:
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        errors = [line for line in lines if re.match(r"[\w.]+(Error|Exception): ", line)]
+        raise RuntimeError((errors or lines or [f"exit status {completed.returncode}"])[-1])
+    return [json.loads(line) for line in completed.stdout.splitlines() if line.startswith("{")]
+
+def _describe(result: Dict[str, Any]) -> str:
+    loaded = ", ".join(result["loaded"]) or "none"
+    return f"{result['seconds']:8.3f} s  {result['rss_bytes'] / 1024 ** 2:6.0f} MB  heavy modules: {loaded}"
+
+def run(modules: List[str], repeat: int) -> None:
+    print("Import of a module in a fresh interpreter (best of repeats)")
+    for module in modules:
+        try:
+            results = [_run_script(_IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES))[0] for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"  {module:<44} failed: {e}")
+            continue
+        print(f"  {module:<44} {_describe(min(results, key=lambda result: result['seconds']))}")
+
+    print("First use of each algorithm after importing backend.algorithms")
+    try:
+        results = _run_script(_FIRST_USE_SCRIPT.format(heavy=HEAVY_MODULES))
+    except RuntimeError as e:
+        print(f"  failed: {e}")
+        return
+    for result in results:
+        if result["error"]:
+            print(f"  {result['algorithm']:<44} unavailable: {result['error']}")
+        else:
+            print(f"  {result['algorithm']:<44} {_describe(result)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.modules, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,33 @@ class Settings(BaseSettings):
     ENABLE_PAPER_TRADING: bool = os.getenv("ENABLE_PAPER_TRADING", "True").lower() == "true"
     ENABLE_LIVE_TRADING: bool = os.getenv("ENABLE_LIVE_TRADING", "False").lower() == "true"
     
+    # Backtest job settings
+    BACKTEST_QUEUE: str = os.getenv("BACKTEST_QUEUE", "local")  # 'local' or 'redis'
+    BACKTEST_WORKERS: int = int(os.getenv("BACKTEST_WORKERS", "2"))
+    RUN_EMBEDDED_WORKERS: bool = os.getenv("RUN_EMBEDDED_WORKERS", "True").lower() == "true"
+    BACKTEST_HEARTBEAT_SECONDS: float = float(os.getenv("BACKTEST_HEARTBEAT_SECONDS", "30"))  # Seconds between a running backtest's heartbeats
+    BACKTEST_LEASE_SECONDS: float = float(os.getenv("BACKTEST_LEASE_SECONDS", "300"))  # Running backtests without a heartbeat this long are run again
+    DATA_FETCH_WORKERS: int = int(os.getenv("DATA_FETCH_WORKERS", "8"))
+    BACKTEST_SIMULATION_WORKERS: int = int(os.getenv("BACKTEST_SIMULATION_WORKERS", str(os.cpu_count() or 1)))
+    BACKTEST_RESULT_CACHE: bool = os.getenv("BACKTEST_RESULT_CACHE", "True").lower() == "true"
+    PROGRESS_MIN_INTERVAL: float = float(os.getenv("PROGRESS_MIN_INTERVAL", "0.5"))  # Seconds between progress snapshots
+    PROGRESS_MAX_POINTS: int = int(os.getenv("PROGRESS_MAX_POINTS", "500"))  # Points in a partial equity curve
+    BACKTEST_CHUNKED_MIN_SYMBOLS: int = int(os.getenv("BACKTEST_CHUNKED_MIN_SYMBOLS", "500"))  # Independent backtests this large run in chunks
+    BACKTEST_MEMORY_LIMIT_MB: int = int(os.getenv("BACKTEST_MEMORY_LIMIT_MB", "2048"))  # Memory ceiling for chunked backtests
+    BACKTEST_SPILL_DIR: str = os.getenv("BACKTEST_SPILL_DIR", "")  # Directory for spilled results (system temp dir if empty)
+    BAR_STORE_DIR: str = os.getenv("BAR_STORE_DIR", "data/bars")  # Memory-mapped intraday bar files
+    PRICE_DTYPE: str = os.getenv("PRICE_DTYPE", "float64")  # 'float32' or 'float64' for prices and indicators
+    INDICATOR_CACHE_MB: int = int(os.getenv("INDICATOR_CACHE_MB", "256"))  # In-process budget of memoized indicators (0 disables)
+    INDICATOR_CACHE_REDIS: bool = os.getenv("INDICATOR_CACHE_REDIS", "False").lower() == "true"  # Share memoized indicators through Redis
+    INDICATOR_CACHE_TTL: int = int(os.getenv("INDICATOR_CACHE_TTL", "86400"))  # Seconds indicators are kept in Redis
+    MODEL_REGISTRY_DIR: str = os.getenv("MODEL_REGISTRY_DIR", "data/models")  # Fitted ML models reused across backtests
+    MODEL_REGISTRY_MB: int = int(os.getenv("MODEL_REGISTRY_MB", "2048"))  # Disk budget of fitted models (0 disables)
+    MODEL_POOL_MB: int = int(os.getenv("MODEL_POOL_MB", "1024"))  # In-process budget of resident fitted models (0 disables)
+    
+    # Optimization settings
+    OPTIMIZATION_MAX_WORKERS: int = int(os.getenv("OPTIMIZATION_MAX_WORKERS", str(os.cpu_count() or 1)))
+    MAX_SWEEP_COMBINATIONS: int = int(os.getenv("MAX_SWEEP_COMBINATIONS", "10000"))
+    
     # Logging settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
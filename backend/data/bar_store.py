@@ -0,0 +1,344 @@
+# backend/data/bar_store.py
+"""
+Memory-mapped columnar storage for intraday OHLCV bars.
+
+Each symbol and timeframe is a directory holding one flat binary file per
+column: timestamps as int64 UTC nanoseconds, prices as float32 or float64
+and volume as float64, plus a small JSON metadata file. Reading a date range
+is a binary search over the mapped timestamps followed by slicing, so a
+backtest touches only the pages of the bars it simulates and never copies
+the file into memory.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.arrays import DatetimeArray
+
+from backend.config import settings
+from backend.utils import precision
+from backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+TIMESTAMP_COLUMN = "timestamp"
+PRICE_COLUMNS = ("open", "high", "low", "close")
+VOLUME_COLUMN = "volume"
+
+_META_FILE = "meta.json"
+
+# Symbols and timeframes name directories, so they must not contain path
+# separators or be "." or ".."
+SYMBOL_PATTERN = re.compile(r"^\^?[A-Z0-9][A-Z0-9.\-=]{0,14}$")
+_TIMEFRAME_PATTERN = re.compile(r"^[0-9A-Za-z]{1,16}$")
+
+def validate_symbol(symbol: str) -> str:
+    """
+    Check that a symbol is a ticker, such as AAPL, BRK.B or ^GSPC.
+
+    Args:
+        symbol: Ticker symbol in any case
+
+    Returns:
+        The symbol in upper case
+    """
+    if not isinstance(symbol, str) or not SYMBOL_PATTERN.match(symbol.upper()):
+        raise ValueError(f"Invalid symbol: {symbol!r}")
+    return symbol.upper()
+
+def _validate_timeframe(timeframe: str) -> str:
+    if not isinstance(timeframe, str) or not _TIMEFRAME_PATTERN.match(timeframe):
+        raise ValueError(f"Invalid timeframe: {timeframe!r}")
+    return timeframe
+
+class BarSlice:
+    """
+    Zero-copy view of a symbol's bars over a date range.
+
+    The slice holds only its location in the store; the column files are
+    mapped on first access. Pickling a slice sends that location rather
+    than the bars, so worker processes map the same files themselves.
+    """
+
+    def __init__(self, root: str, symbol: str, timeframe: str, meta: Dict[str, Any], start_row: int, stop_row: int):
+        self.root = root
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.meta = meta
+        self.start_row = start_row
+        self.stop_row = stop_row
+        self._columns = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_columns"] = None
+        return state
+
+    def __len__(self) -> int:
+        return self.stop_row - self.start_row
+
+    @property
+    def empty(self) -> bool:
+        """Whether the slice holds no bars."""
+        return len(self) == 0
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Mapped column arrays for the rows of the slice."""
+        if self._columns is None:
+            directory = _symbol_dir(self.root, self.symbol, self.timeframe)
+            self._columns = {
+                name: _map_column(directory, name, dtype, self.meta["rows"])[self.start_row:self.stop_row]
+                for name, dtype in _column_dtypes(self.meta).items()
+            }
+        return self._columns
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the slice's bars once paged into memory."""
+        return sum(np.dtype(dtype).itemsize for dtype in _column_dtypes(self.meta).values()) * len(self)
+
+    def index(self) -> pd.DatetimeIndex:
+        """Get the bar timestamps as an index sharing memory with the mapped file."""
+        values = self.columns[TIMESTAMP_COLUMN].view("M8[ns]")
+        index = pd.DatetimeIndex(DatetimeArray(values, dtype=pd.DatetimeTZDtype(tz="UTC"), copy=False), copy=False)
+        tz = self.meta.get("timezone")
+        # Converting an aware index only changes its zone, not its values
+        return index.tz_convert(tz) if tz else index
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get the bars as an OHLCV DataFrame backed by the mapped files.
+
+        Columns are mapped copy-on-write, so code that modifies the frame in
+        place gets private copies of the pages it writes and never changes
+        the store.
+
+        Returns:
+            DataFrame indexed by timestamp
+        """
+        if self.empty:
+            return pd.DataFrame()
+
+        columns = {name: values for name, values in self.columns.items() if name != TIMESTAMP_COLUMN}
+        return pd.DataFrame(columns, index=self.index(), copy=False)
+
+    def fingerprint(self) -> str:
+        """
+        Identify the bars of the slice without reading them.
+
+        Stored bars are never modified, only appended to or deleted along
+        with their store, so the store identity and row range determine the
+        content.
+        """
+        payload = [self.meta["id"], self.symbol, self.timeframe, self.start_row, self.stop_row, self.meta["price_dtype"]]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+class BarStore:
+    """Append-only store of intraday bars under a root directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def symbols(self, timeframe: str = "1Min") -> List[str]:
+        """List the symbols stored for a timeframe."""
+        directory = os.path.join(self.root, _validate_timeframe(timeframe))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if os.path.exists(os.path.join(directory, name, _META_FILE)))
+
+    def info(self, symbol: str, timeframe: str = "1Min") -> Optional[Dict[str, Any]]:
+        """
+        Get the extent of a symbol's stored bars.
+
+        Args:
+            symbol: Stock ticker symbol
+            timeframe: Bar timeframe (e.g. "1Min")
+
+        Returns:
+            Dictionary with the bar count, first and last timestamps and
+            price dtype, or None if the symbol is not stored
+        """
+        meta = _read_meta(self.root, symbol, timeframe)
+        if meta is None:
+            return None
+
+        bars = self.read(symbol, timeframe=timeframe)
+        index = bars.index()
+        return {
+            "symbol": symbol.upper(),
+            "timeframe": timeframe,
+            "bars": meta["rows"],
+            "start": index[0].isoformat() if len(index) else None,
+            "end": index[-1].isoformat() if len(index) else None,
+            "price_dtype": meta["price_dtype"]
+        }
+
+    def write(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        timeframe: str = "1Min",
+        price_dtype: Optional[str] = None
+    ) -> int:
+        """
+        Append bars to a symbol's files.
+
+        Bars at or before the last stored timestamp are skipped, so
+        overlapping downloads can be appended safely. Appended bars become
+        visible to readers only once the metadata is updated.
+
+        Args:
+            symbol: Stock ticker symbol
+            data: DataFrame with OHLCV columns indexed by timestamp
+            timeframe: Bar timeframe (e.g. "1Min")
+            price_dtype: 'float32' or 'float64', used when the symbol is first
+                stored and ignored afterwards (default: PRICE_DTYPE)
+
+        Returns:
+            Number of bars appended
+        """
+        if price_dtype is None:
+            price_dtype = precision.price_dtype().name
+        if price_dtype not in precision.PRICE_DTYPES:
+            raise ValueError(f"Unsupported price dtype: {price_dtype}")
+        if data.empty:
+            return 0
+
+        data = data.sort_index()
+        index = pd.DatetimeIndex(data.index)
+
+        with self._lock:
+            directory = _symbol_dir(self.root, symbol, timeframe)
+            meta = _read_meta(self.root, symbol, timeframe)
+
+            if meta is None:
+                os.makedirs(directory, exist_ok=True)
+                meta = {
+                    "id": uuid.uuid4().hex,
+                    "rows": 0,
+                    "price_dtype": price_dtype,
+                    "timezone": str(index.tz) if index.tz is not None else None
+                }
+                for name in _column_dtypes(meta):
+                    open(os.path.join(directory, f"{name}.bin"), "wb").close()
+
+            timestamps = _utc_ns(index)
+            if meta["rows"]:
+                last = _map_column(directory, TIMESTAMP_COLUMN, "int64", meta["rows"])[-1]
+                keep = timestamps > last
+                data, timestamps = data[keep], timestamps[keep]
+            if len(timestamps) == 0:
+                return 0
+
+            for name, dtype in _column_dtypes(meta).items():
+                values = timestamps if name == TIMESTAMP_COLUMN else data[name].to_numpy(dtype=dtype)
+                # Trim bytes left by an append that failed before its metadata was written
+                path = os.path.join(directory, f"{name}.bin")
+                with open(path, "r+b") as column_file:
+                    column_file.truncate(meta["rows"] * np.dtype(dtype).itemsize)
+                    column_file.seek(0, os.SEEK_END)
+                    np.ascontiguousarray(values).tofile(column_file)
+
+            meta["rows"] += len(timestamps)
+            _write_meta(directory, meta)
+
+        return len(timestamps)
+
+    def read(
+        self,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        timeframe: str = "1Min"
+    ) -> BarSlice:
+        """
+        Get a symbol's bars over a date range without loading them.
+
+        Args:
+            symbol: Stock ticker symbol
+            start_date: Inclusive start of the range (optional)
+            end_date: Inclusive end of the range (optional)
+            timeframe: Bar timeframe (e.g. "1Min")
+
+        Returns:
+            BarSlice over the matching bars, empty if the symbol is not stored
+        """
+        meta = _read_meta(self.root, symbol, timeframe)
+        if meta is None:
+            logger.warning(f"No {timeframe} bars stored for symbol {symbol}")
+            return BarSlice(self.root, symbol, timeframe, {"id": None, "rows": 0, "price_dtype": "float64"}, 0, 0)
+
+        timestamps = _map_column(_symbol_dir(self.root, symbol, timeframe), TIMESTAMP_COLUMN, "int64", meta["rows"])
+        tz = meta.get("timezone")
+
+        # Binary search only touches the pages it probes
+        start_row = int(np.searchsorted(timestamps, _to_utc_ns(start_date, tz), side="left")) if start_date is not None else 0
+        stop_row = int(np.searchsorted(timestamps, _to_utc_ns(end_date, tz), side="right")) if end_date is not None else meta["rows"]
+
+        return BarSlice(self.root, symbol, timeframe, meta, start_row, max(start_row, stop_row))
+
+    def delete(self, symbol: str, timeframe: str = "1Min") -> bool:
+        """Delete a symbol's stored bars, returning whether any existed."""
+        directory = _symbol_dir(self.root, symbol, timeframe)
+        with self._lock:
+            if not os.path.isdir(directory):
+                return False
+            shutil.rmtree(directory)
+            return True
+
+def _symbol_dir(root: str, symbol: str, timeframe: str) -> str:
+    # Every path of a symbol's files is built here, so none leaves the root
+    return os.path.join(root, _validate_timeframe(timeframe), validate_symbol(symbol))
+
+def _column_dtypes(meta: Dict[str, Any]) -> Dict[str, str]:
+    dtypes = {TIMESTAMP_COLUMN: "int64"}
+    dtypes.update({name: meta["price_dtype"] for name in PRICE_COLUMNS})
+    dtypes[VOLUME_COLUMN] = "float64"
+    return dtypes
+
+def _map_column(directory: str, name: str, dtype: str, rows: int) -> np.ndarray:
+    if rows == 0:
+        return np.empty(0, dtype=dtype)
+    # Copy-on-write keeps in-place edits by callers out of the file
+    return np.memmap(os.path.join(directory, f"{name}.bin"), dtype=dtype, mode="c", shape=(rows,))
+
+def _read_meta(root: str, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(_symbol_dir(root, symbol, timeframe), _META_FILE)) as meta_file:
+            return json.load(meta_file)
+    except FileNotFoundError:
+        return None
+
+def _write_meta(directory: str, meta: Dict[str, Any]) -> None:
+    # Replace atomically so readers never see a partial file
+    path = os.path.join(directory, _META_FILE)
+    with open(path + ".tmp", "w") as meta_file:
+        json.dump(meta, meta_file)
+    os.replace(path + ".tmp", path)
+
+def _utc_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+def _to_utc_ns(timestamp, tz: Optional[str]) -> int:
+    timestamp = pd.Timestamp(timestamp)
+    # Naive bounds are read in the zone the bars were stored in
+    if timestamp.tzinfo is None and tz:
+        timestamp = timestamp.tz_localize(tz)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp.value
+
+bar_store = BarStore(settings.BAR_STORE_DIR)
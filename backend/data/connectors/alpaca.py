@@ -19,6 +19,7 @@ from alpaca_trade_api.rest import REST, TimeFrame
 
 from backend.config import settings
 from backend.utils.logging import get_logger
+from backend.utils.precision import cast_price_columns
 
 logger = get_logger(__name__)
 
@@ -111,7 +112,7 @@ def get_historical_data(
         # Add symbol column
         bars['symbol'] = symbol
         
-        return bars
+        return cast_price_columns(bars)
     
     except Exception as e:
         logger.error(f"Error fetching Alpaca data for {symbol}: {str(e)}")
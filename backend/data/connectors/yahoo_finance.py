@@ -5,6 +5,8 @@ import yfinance as yf
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 
+from backend.utils.precision import cast_price_columns
+
 logger = logging.getLogger(__name__)
 
 def get_historical_data(
@@ -61,7 +63,7 @@ def get_historical_data(
         # Calculate additional fields that might be useful
         data['returns'] = data['close'].pct_change()
         
-        return data
+        return cast_price_columns(data)
     
     except Exception as e:
         logger.error(f"Error fetching data for {symbol}: {str(e)}")
@@ -0,0 +1,138 @@
+# backend/data/result_store.py
+"""
+Columnar storage for backtest result tables.
+
+Equity curves and trade lists are stored as compressed NumPy archives with
+one array per column instead of JSON lists of dictionaries. Timestamps are
+kept as int64 nanoseconds, so slicing a time range is a binary search over
+one array rather than a scan over parsed records.
+"""
+
+import io
+import json
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+TIMESTAMP_COLUMN = "timestamp"
+_META_KEY = "__meta__"
+
+def encode_table(records: Union[List[Dict[str, Any]], pd.DataFrame]) -> bytes:
+    """
+    Encode a list of records as a compressed columnar blob.
+
+    Args:
+        records: List of dictionaries sharing the same keys, or a DataFrame
+            with one column per key
+
+    Returns:
+        Compressed NumPy archive bytes
+    """
+    frame = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(records)
+    columns = {}
+    meta = {"columns": list(frame.columns), "rows": len(frame), "timezones": {}}
+
+    for name in frame.columns:
+        column = frame[name]
+
+        if name == TIMESTAMP_COLUMN or pd.api.types.is_datetime64_any_dtype(column):
+            # Store UTC nanoseconds and remember the zone to restore on read
+            timestamps = pd.to_datetime(column, utc=True)
+            tz = getattr(pd.to_datetime(column).dtype, "tz", None)
+            meta["timezones"][name] = str(tz) if tz is not None else None
+            columns[name] = timestamps.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        elif pd.api.types.is_bool_dtype(column) or pd.api.types.is_numeric_dtype(column):
+            columns[name] = column.to_numpy()
+        else:
+            columns[name] = column.fillna("").astype(str).to_numpy(dtype=str)
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **{_META_KEY: np.array(json.dumps(meta))}, **columns)
+    return buffer.getvalue()
+
+class ResultTable:
+    """Read-only view of an encoded result table."""
+
+    def __init__(self, blob: bytes):
+        with np.load(io.BytesIO(blob), allow_pickle=False) as archive:
+            self.meta = json.loads(str(archive[_META_KEY]))
+            self.columns = {name: archive[name] for name in self.meta["columns"]}
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    def time_range(self, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> slice:
+        """
+        Get the row slice covering a time range.
+
+        Rows must be ordered by timestamp, which holds for equity curves and
+        trade lists produced by the simulation engine.
+
+        Args:
+            start: Inclusive start of the range (optional)
+            end: Inclusive end of the range (optional)
+
+        Returns:
+            Slice of matching rows
+        """
+        timestamps = self.columns.get(TIMESTAMP_COLUMN)
+        if timestamps is None:
+            return slice(0, len(self))
+
+        lo = np.searchsorted(timestamps, _to_utc_ns(start), side="left") if start is not None else 0
+        hi = np.searchsorted(timestamps, _to_utc_ns(end), side="right") if end is not None else len(self)
+        return slice(int(lo), int(hi))
+
+    def records(self, rows: slice) -> List[Dict[str, Any]]:
+        """
+        Decode a slice of rows back into records.
+
+        Args:
+            rows: Slice of rows to decode
+
+        Returns:
+            List of dictionaries with JSON-compatible values
+        """
+        decoded = {}
+
+        for name, values in self.columns.items():
+            values = values[rows]
+
+            if name in self.meta["timezones"]:
+                timestamps = pd.to_datetime(values, unit="ns", utc=True)
+                tz = self.meta["timezones"][name]
+                timestamps = timestamps.tz_convert(tz) if tz else timestamps.tz_localize(None)
+                decoded[name] = [timestamp.isoformat() for timestamp in timestamps]
+            elif values.dtype.kind == "f":
+                decoded[name] = [value if np.isfinite(value) else None for value in values.tolist()]
+            else:
+                decoded[name] = values.tolist()
+
+        names = list(decoded)
+        return [dict(zip(names, row)) for row in zip(*decoded.values())]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Decode the whole table into a DataFrame.
+
+        Returns:
+            DataFrame with timestamp columns restored to their original zone
+        """
+        frame = {}
+
+        for name, values in self.columns.items():
+            if name in self.meta["timezones"]:
+                timestamps = pd.to_datetime(values, unit="ns", utc=True)
+                tz = self.meta["timezones"][name]
+                frame[name] = timestamps.tz_convert(tz) if tz else timestamps.tz_localize(None)
+            else:
+                frame[name] = values
+
+        return pd.DataFrame(frame, columns=self.meta["columns"])
+
+def _to_utc_ns(timestamp) -> int:
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp.value
@@ -7,7 +7,8 @@ from sqlalchemy.orm import Session
 
 from backend.config import settings
 from backend.models import Base, engine, get_db
-from backend.api import auth, strategies, backtesting, portfolio, market_data, user
+from backend.api import auth, strategies, backtesting, portfolio, market_data, user, optimization
+from backend.services.job_service import start_worker_pool, stop_worker_pool
 
 # Configure logging
 logging.basicConfig(
@@ -45,6 +46,17 @@ app.include_router(strategies.router, prefix=settings.API_V1_PREFIX, tags=["Stra
 app.include_router(backtesting.router, prefix=settings.API_V1_PREFIX, tags=["Backtesting"])
 app.include_router(portfolio.router, prefix=settings.API_V1_PREFIX, tags=["Portfolio"])
 app.include_router(market_data.router, prefix=settings.API_V1_PREFIX, tags=["Market Data"])
+app.include_router(optimization.router, prefix=settings.API_V1_PREFIX, tags=["Optimization"])
+
+# Run queued backtests in this process unless dedicated workers are deployed
+@app.on_event("startup")
+def start_backtest_workers():
+    if settings.RUN_EMBEDDED_WORKERS:
+        start_worker_pool()
+
+@app.on_event("shutdown")
+def stop_backtest_workers():
+    stop_worker_pool()
 
 # Health check endpoint
 @app.get("/api/health", tags=["Health"])
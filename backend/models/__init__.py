@@ -23,6 +23,6 @@ def get_db():
 # Import models to ensure they are registered with SQLAlchemy
 from backend.models.user import User
 from backend.models.strategy import Strategy
-from backend.models.backtest import Backtest
+from backend.models.backtest import Backtest, BacktestResultData
 from backend.models.portfolio import Portfolio, Position
 from backend.models.trade import Trade
\ No newline at end of file
@@ -1,5 +1,5 @@
 # backend/models/backtest.py
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Enum, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -11,6 +11,11 @@ class BacktestStatus(str, enum.Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class BacktestMode(str, enum.Enum):
+    INDEPENDENT = "independent"  # Each symbol runs with the full initial capital
+    PORTFOLIO = "portfolio"  # All symbols share one cash account
 
 class Backtest(Base):
     """Database model for backtests."""
@@ -25,16 +30,26 @@ class Backtest(Base):
     symbols = Column(JSON, nullable=False)  # List of symbols
     initial_capital = Column(Float, nullable=False, default=10000.0)
     parameters = Column(JSON, nullable=False, default=dict)  # Strategy parameters
+    mode = Column(String, default=BacktestMode.INDEPENDENT)
+    max_position_pct = Column(Float)  # Per-symbol position limit in portfolio mode
+    max_gross_exposure = Column(Float)  # Gross exposure limit in portfolio mode
+    timeframe = Column(String, default="1Day")  # Bar timeframe; intraday bars come from the bar store
     
     # Backtest status
     status = Column(String, default=BacktestStatus.PENDING)
     error_message = Column(String)
+    progress = Column(Float, default=0.0)  # Fraction of the run completed (0-1)
+    cancel_requested = Column(Boolean, default=False)
+    cache_key = Column(String, index=True)  # Hash of the inputs that determine the results
+    cache_hit = Column(Boolean, default=False)  # Results were reused from an identical backtest
+    peak_memory_mb = Column(Float)  # Peak resident memory of the worker process during the run
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))  # Last sign of life from the worker running the backtest
     completed_at = Column(DateTime(timezone=True))
     
     # Backtest results
-    results = Column(JSON)  # Full backtest results
+    results = Column(JSON)  # Summary results (metrics); curves and trades live in result_data
     
     # Performance metrics
     annualized_return = Column(Float)
@@ -51,6 +66,7 @@ class Backtest(Base):
     user = relationship("User", back_populates="backtests")
     strategy_id = Column(Integer, ForeignKey("strategies.id"))
     strategy = relationship("Strategy", back_populates="backtests")
+    result_data = relationship("BacktestResultData", uselist=False, back_populates="backtest", cascade="all, delete-orphan")
     
     def to_dict(self):
         """Convert model to dictionary."""
@@ -61,8 +77,15 @@ class Backtest(Base):
             "symbols": self.symbols,
             "initial_capital": self.initial_capital,
             "parameters": self.parameters,
+            "mode": self.mode,
+            "max_position_pct": self.max_position_pct,
+            "max_gross_exposure": self.max_gross_exposure,
+            "timeframe": self.timeframe,
             "status": self.status,
             "error_message": self.error_message,
+            "progress": self.progress,
+            "cache_hit": self.cache_hit,
+            "peak_memory_mb": self.peak_memory_mb,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -85,4 +108,19 @@ class Backtest(Base):
                 "results": self.results
             })
         
-        return result
\ No newline at end of file
+        return result
+
+class BacktestResultData(Base):
+    """Database model for the columnar equity curve and trades of a backtest."""
+    
+    __tablename__ = "backtest_result_data"
+
+    backtest_id = Column(Integer, ForeignKey("backtests.id", ondelete="CASCADE"), primary_key=True)
+    equity_curve = Column(LargeBinary, nullable=False)  # Compressed columnar blob
+    trades = Column(LargeBinary, nullable=False)  # Compressed columnar blob
+    equity_points = Column(Integer, default=0)
+    trade_count = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    backtest = relationship("Backtest", back_populates="result_data")
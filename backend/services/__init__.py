@@ -12,11 +12,23 @@ from backend.services import strategy_service
 from backend.services import backtest_service
 from backend.services import portfolio_service
 from backend.services import market_data_service
+from backend.services import optimization_service
+from backend.services import job_service
+from backend.services import result_cache
+from backend.services import indicator_cache
+from backend.services import progress_service
+from backend.services import chunked_backtest
 
 __all__ = [
     "auth_service",
     "strategy_service",
     "backtest_service",
     "portfolio_service",
-    "market_data_service"
+    "market_data_service",
+    "optimization_service",
+    "job_service",
+    "result_cache",
+    "indicator_cache",
+    "progress_service",
+    "chunked_backtest"
 ]
\ No newline at end of file
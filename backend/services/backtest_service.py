@@ -1,21 +1,52 @@
 # backend/services/backtest_service.py
+import gc
 import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 
+import numpy as np
 import pandas as pd
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
-from backend.models.backtest import Backtest
+from backend.config import settings
+from backend.models.backtest import Backtest, BacktestMode, BacktestResultData, BacktestStatus
 from backend.models.strategy import Strategy
 from backend.models.user import User
 from backend.data.connectors.yahoo_finance import get_historical_data
+from backend.data.bar_store import BarSlice, bar_store
+from backend.data.result_store import ResultTable, encode_table
+from backend.algorithms import get_algorithm_class
+from backend.algorithms.base import BaseAlgorithm
+from backend.algorithms.engine import build_panel
+from backend.algorithms.utils.performance import (
+    DAILY_RISK_FREE_RATE,
+    PERIODS_PER_YEAR,
+    TRADING_DAYS_PER_YEAR,
+    calculate_performance_metrics
+)
+from backend.algorithms.utils.monte_carlo import run_monte_carlo
 from backend.algorithms.mean_reversion import MeanReversionStrategy
 from backend.algorithms.trend_following import TrendFollowingStrategy
-from backend.algorithms.ml_models.lstm import LSTMPricePredictor
+from backend.services.progress_service import decimate_equity_curve, publish_progress, should_publish
+from backend.services.chunked_backtest import EquityAccumulator, TradeSpill, plan_chunk_size
+from backend.services.indicator_cache import flush_indicator_cache_stats
+from backend.utils.memory import MB, PeakMemoryTracker
+from backend.utils.processes import pool_context
+from backend.services.result_cache import (
+    compute_cache_key,
+    copy_cached_result,
+    data_fingerprint,
+    find_cached_result,
+    result_cache_stats
+)
 
 logger = logging.getLogger(__name__)
 
+class BacktestCancelledError(Exception):
+    """Raised inside a running backtest when cancellation has been requested."""
+    pass
+
 def create_backtest(
     db: Session, 
     user_id: int,
@@ -40,6 +71,10 @@ def create_backtest(
         end_date=backtest_data.get("end_date"),
         symbols=backtest_data.get("symbols"),
         initial_capital=backtest_data.get("initial_capital", 10000.0),
+        mode=backtest_data.get("mode") or BacktestMode.INDEPENDENT,
+        max_position_pct=backtest_data.get("max_position_pct"),
+        max_gross_exposure=backtest_data.get("max_gross_exposure"),
+        timeframe=backtest_data.get("timeframe") or "1Day",
         status="pending",
         parameters=strategy.parameters
     )
@@ -57,13 +92,18 @@ def run_backtest(db: Session, backtest_id: int) -> Backtest:
     if not backtest:
         raise ValueError(f"Backtest with ID {backtest_id} not found")
     
-    # Check if backtest is already completed
-    if backtest.status == "completed":
+    # Check if backtest is already finished
+    if backtest.status in (BacktestStatus.COMPLETED, BacktestStatus.CANCELLED):
         return backtest
     
     # Update status to running
-    backtest.status = "running"
+    backtest.status = BacktestStatus.RUNNING
+    backtest.progress = 0.0
+    if backtest.started_at is None:
+        backtest.started_at = datetime.now()
     db.commit()
+    publish_progress(backtest.id, BacktestStatus.RUNNING, 0.0, force=True)
+    memory = PeakMemoryTracker()
     
     try:
         # Get strategy
@@ -71,108 +111,603 @@ def run_backtest(db: Session, backtest_id: int) -> Backtest:
         if not strategy:
             raise ValueError(f"Strategy with ID {backtest.strategy_id} not found")
         
-        # Get data for each symbol
-        all_results = []
+        # Independent backtests report each symbol's fetch and simulation, portfolio ones a final simulation step
+        n_symbols = len(backtest.symbols)
+        steps = n_symbols + 1 if backtest.mode == BacktestMode.PORTFOLIO else 2 * n_symbols
+        periods_per_year = PERIODS_PER_YEAR[backtest.timeframe or "1Day"]
         
-        for symbol in backtest.symbols:
-            # Get historical data
-            data = get_historical_data(
-                symbol=symbol,
-                start_date=backtest.start_date,
-                end_date=backtest.end_date
+        # Large independent backtests stream symbols through in chunks instead of loading them all
+        chunked = backtest.mode != BacktestMode.PORTFOLIO and n_symbols >= settings.BACKTEST_CHUNKED_MIN_SYMBOLS
+        
+        cached = None
+        if not chunked:
+            data = load_backtest_data(
+                backtest,
+                on_symbol_loaded=lambda loaded: report_progress(db, backtest, loaded / steps)
             )
-            
-            # Run backtest for symbol
-            results = run_algorithm_backtest(
+            algorithm = get_algorithm(strategy.algorithm_type, backtest.parameters)
+        
+        # The cache key needs every symbol's data up front, which chunked backtests never hold
+        if settings.BACKTEST_RESULT_CACHE and not chunked:
+            backtest.cache_key = compute_cache_key(
                 algorithm_type=strategy.algorithm_type,
-                parameters=backtest.parameters,
-                data=data,
-                initial_capital=backtest.initial_capital
+                parameters=algorithm.parameters,
+                symbols=backtest.symbols,
+                start_date=backtest.start_date,
+                end_date=backtest.end_date,
+                initial_capital=backtest.initial_capital,
+                fingerprint=data_fingerprint(data),
+                mode=backtest.mode,
+                max_position_pct=backtest.max_position_pct,
+                max_gross_exposure=backtest.max_gross_exposure,
+                timeframe=backtest.timeframe or "1Day"
             )
-            
-            # Add symbol to results
-            results["symbol"] = symbol
-            all_results.append(results)
+            cached = find_cached_result(db, backtest.cache_key, exclude_id=backtest.id)
         
-        # Combine results
-        combined_results = combine_backtest_results(all_results)
+        if cached is not None:
+            logger.info(f"Backtest ID {backtest_id} reuses the results of backtest ID {cached.id}")
+            result_cache_stats.record_hit()
+            copy_cached_result(cached, backtest)
+            metrics = cached.results["metrics"]
+        else:
+            if settings.BACKTEST_RESULT_CACHE and not chunked:
+                result_cache_stats.record_miss()
+            
+            if chunked:
+                combined_results = run_chunked_backtest(db, backtest, strategy.algorithm_type, steps, memory, periods_per_year)
+            elif backtest.mode == BacktestMode.PORTFOLIO:
+                partial_curve = []
+                
+                def on_bar(timestamp, fraction, value):
+                    # The engine throttles these calls, so the points form a decimated partial curve
+                    partial_curve.append({"timestamp": pd.Timestamp(timestamp).isoformat(), "portfolio_value": float(value)})
+                    report_progress(db, backtest, (n_symbols + fraction) / steps, current_date=timestamp, equity_curve=list(partial_curve))
+                
+                combined_results = run_portfolio_backtest(
+                    backtest,
+                    algorithm,
+                    data,
+                    on_progress=on_bar,
+                    periods_per_year=periods_per_year
+                )
+            else:
+                finished = []
+                
+                def on_symbol_done(done, results):
+                    finished.append(results)
+                    memory.sample()
+                    # Combining is only worth doing when the snapshot will actually be published
+                    partial = partial_equity_curve(finished, backtest.initial_capital, periods_per_year) if should_publish(backtest.id) else None
+                    report_progress(
+                        db,
+                        backtest,
+                        (n_symbols + done) / steps,
+                        current_date=partial[-1]["timestamp"] if partial else None,
+                        equity_curve=partial
+                    )
+                
+                # Run backtest for each symbol, then merge once all have finished
+                all_results = run_symbol_backtests(
+                    strategy.algorithm_type,
+                    backtest.parameters,
+                    backtest.symbols,
+                    data,
+                    backtest.initial_capital,
+                    on_symbol_done=on_symbol_done,
+                    periods_per_year=periods_per_year
+                )
+                
+                # Combine results
+                combined_results = combine_backtest_results(
+                    all_results,
+                    initial_capital=backtest.initial_capital,
+                    periods_per_year=periods_per_year
+                )
+            
+            # Update backtest with results
+            store_results(backtest, combined_results)
+            metrics = combined_results["metrics"]
+            
+            # Extract performance metrics
+            backtest.annualized_return = metrics["annualized_return"]
+            backtest.sharpe_ratio = metrics["sharpe_ratio"]
+            backtest.sortino_ratio = metrics["sortino_ratio"]
+            backtest.max_drawdown = metrics["max_drawdown"]
+            backtest.win_rate = metrics["win_rate"]
+            backtest.total_trades = metrics["total_trades"]
+            backtest.profit_factor = metrics["profit_factor"]
+            backtest.final_equity = metrics["final_portfolio_value"]
         
-        # Update backtest with results
-        backtest.results = combined_results
         backtest.completed_at = datetime.now()
-        backtest.status = "completed"
-        
-        # Extract performance metrics
-        backtest.annualized_return = combined_results["metrics"]["annualized_return"]
-        backtest.sharpe_ratio = combined_results["metrics"]["sharpe_ratio"]
-        backtest.max_drawdown = combined_results["metrics"]["max_drawdown"]
-        backtest.win_rate = combined_results["metrics"]["win_rate"]
-        backtest.total_trades = combined_results["metrics"]["total_trades"]
-        backtest.final_equity = combined_results["metrics"]["final_portfolio_value"]
+        backtest.status = BacktestStatus.COMPLETED
+        backtest.progress = 1.0
+        backtest.peak_memory_mb = memory.peak_mb
+        logger.info(f"Backtest ID {backtest_id} completed with peak RSS {backtest.peak_memory_mb} MB")
         
         # Update strategy performance metrics if this is the latest backtest
-        update_strategy_metrics(db, strategy, combined_results["metrics"])
+        update_strategy_metrics(db, strategy, metrics)
         
         db.commit()
+        publish_progress(backtest.id, BacktestStatus.COMPLETED, 1.0, force=True)
         
+        return backtest
+    except BacktestCancelledError:
+        logger.info(f"Backtest ID {backtest_id} cancelled")
+        db.rollback()
+        backtest.status = BacktestStatus.CANCELLED
+        backtest.completed_at = datetime.now()
+        db.commit()
+        publish_progress(backtest.id, BacktestStatus.CANCELLED, backtest.progress, force=True)
         return backtest
     except Exception as e:
         logger.error(f"Error running backtest ID {backtest_id}: {str(e)}")
-        backtest.status = "failed"
+        db.rollback()
+        backtest.status = BacktestStatus.FAILED
         backtest.error_message = str(e)
         db.commit()
+        publish_progress(backtest.id, BacktestStatus.FAILED, backtest.progress, error_message=str(e), force=True)
         raise
 
-def run_algorithm_backtest(
-    algorithm_type: str,
-    parameters: Dict[str, Any],
-    data: pd.DataFrame,
-    initial_capital: float
+def serialize_results(value: Any) -> Any:
+    """Convert backtest results into values the JSON results column can store."""
+    if isinstance(value, dict):
+        return {key: serialize_results(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [serialize_results(item) for item in value]
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+def store_results(backtest: Backtest, results: Dict[str, Any]) -> None:
+    """Store summary results as JSON and the equity curve and trades as columnar blobs."""
+    equity_curve = results.get("equity_curve", [])
+    trades = results.get("trades", [])
+    
+    backtest.results = serialize_results({
+        key: value for key, value in results.items() if key not in ("equity_curve", "trades")
+    })
+    backtest.result_data = BacktestResultData(
+        equity_curve=encode_table(equity_curve),
+        trades=encode_table(trades),
+        equity_points=len(equity_curve),
+        trade_count=len(trades)
+    )
+
+def get_result_page(
+    backtest: Backtest,
+    table: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """Get a time range and page of a backtest's equity curve or trades."""
+    if backtest.result_data is not None:
+        result_table = ResultTable(getattr(backtest.result_data, table))
+        rows = result_table.time_range(start, end)
+        total = rows.stop - rows.start
+        stop = rows.stop if limit is None else min(rows.stop, rows.start + skip + limit)
+        items = result_table.records(slice(rows.start + skip, stop))
+    else:
+        # Backtests stored before columnar results kept everything in the JSON column
+        records = (backtest.results or {}).get(table, [])
+        if start is not None or end is not None:
+            timestamps = pd.to_datetime([record["timestamp"] for record in records], utc=True)
+            mask = np.ones(len(records), dtype=bool)
+            if start is not None:
+                mask &= timestamps >= _as_utc(start)
+            if end is not None:
+                mask &= timestamps <= _as_utc(end)
+            records = [record for record, keep in zip(records, mask) if keep]
+        total = len(records)
+        items = records[skip:] if limit is None else records[skip:skip + limit]
+    
+    return {
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "items": items
+    }
+
+def get_result_columns(backtest: Backtest, table: str) -> Dict[str, np.ndarray]:
+    """Get a backtest's equity curve or trades as arrays, with timestamps as UTC nanoseconds."""
+    if backtest.result_data is not None:
+        return ResultTable(getattr(backtest.result_data, table)).columns
+    
+    # Backtests stored before columnar results kept everything in the JSON column
+    frame = pd.DataFrame.from_records((backtest.results or {}).get(table, []))
+    columns = {name: frame[name].to_numpy() for name in frame.columns}
+    if "timestamp" in columns:
+        columns["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    return columns
+
+def run_robustness_analysis(
+    backtest: Backtest,
+    method: str = "block_bootstrap",
+    n_paths: int = 1000,
+    block_size: int = 20,
+    confidence_level: float = 0.95,
+    seed: Optional[int] = None
 ) -> Dict[str, Any]:
-    """Run backtest for a specific algorithm and dataset."""
-    # Initialize algorithm
+    """Run a Monte Carlo robustness analysis on a completed backtest."""
+    if backtest.status != BacktestStatus.COMPLETED:
+        raise ValueError("Robustness analysis requires a completed backtest")
+    
+    equity_curve = get_result_columns(backtest, "equity_curve")
+    if "portfolio_value" not in equity_curve:
+        raise ValueError("Backtest has no equity curve")
+    
+    trade_bars = None
+    if method == "trade_shuffle":
+        trades = get_result_columns(backtest, "trades")
+        if "timestamp" in trades:
+            trade_bars = np.searchsorted(equity_curve["timestamp"], trades["timestamp"])
+    
+    # Annualize like the backtest's own metrics, with the risk-free rate per bar of its timeframe
+    periods_per_year = PERIODS_PER_YEAR[backtest.timeframe or "1Day"]
+    
+    return run_monte_carlo(
+        equity_curve["portfolio_value"],
+        backtest.initial_capital,
+        method=method,
+        n_paths=n_paths,
+        block_size=block_size,
+        trade_bars=trade_bars,
+        confidence_level=confidence_level,
+        seed=seed,
+        periods_per_year=periods_per_year,
+        risk_free_rate=DAILY_RISK_FREE_RATE * TRADING_DAYS_PER_YEAR / periods_per_year
+    )
+
+def _as_utc(timestamp: datetime) -> pd.Timestamp:
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+def report_progress(
+    db: Session,
+    backtest: Backtest,
+    progress: float,
+    current_date: Optional[datetime] = None,
+    equity_curve: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """Record and publish the progress of a running backtest and stop it if cancellation was requested."""
+    backtest.progress = progress
+    db.commit()
+    publish_progress(backtest.id, BacktestStatus.RUNNING, progress, current_date=current_date, equity_curve=equity_curve)
+    
+    cancel_requested = db.query(Backtest.cancel_requested).filter(Backtest.id == backtest.id).scalar()
+    if cancel_requested:
+        raise BacktestCancelledError(f"Backtest with ID {backtest.id} was cancelled")
+
+def request_cancellation(db: Session, backtest: Backtest) -> Backtest:
+    """Cancel a pending backtest, or ask a running one to stop at its next progress report."""
+    if backtest.status == BacktestStatus.PENDING:
+        backtest.status = BacktestStatus.CANCELLED
+        backtest.completed_at = datetime.now()
+    elif backtest.status == BacktestStatus.RUNNING:
+        backtest.cancel_requested = True
+    else:
+        raise ValueError(f"Backtest with status '{backtest.status}' cannot be cancelled")
+    
+    db.commit()
+    db.refresh(backtest)
+    return backtest
+
+def get_algorithm(algorithm_type: str, parameters: Dict[str, Any]):
+    """Initialize the algorithm for a backtest."""
     if algorithm_type == "mean_reversion":
         algorithm = MeanReversionStrategy(parameters=parameters)
     elif algorithm_type == "trend_following":
         algorithm = TrendFollowingStrategy(parameters=parameters)
     elif algorithm_type == "ml_lstm":
-        algorithm = LSTMPricePredictor(parameters=parameters)
+        # Resolved on first use, so that TensorFlow is only loaded to run it
+        algorithm = get_algorithm_class(algorithm_type)(parameters=parameters)
     else:
         raise ValueError(f"Unsupported algorithm type: {algorithm_type}")
     
+    return algorithm
+
+def run_algorithm_backtest(
+    algorithm_type: str,
+    parameters: Dict[str, Any],
+    data: pd.DataFrame,
+    initial_capital: float,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> Dict[str, Any]:
+    """Run backtest for a specific algorithm and dataset, returning the equity curve as a DataFrame."""
+    algorithm = get_algorithm(algorithm_type, parameters)
+    
+    # Stored intraday bars are mapped here rather than copied into the caller
+    if isinstance(data, BarSlice):
+        data = data.to_frame()
+    
     # Run backtest
-    return algorithm.backtest(data, initial_capital=initial_capital)
+    return algorithm.backtest(data, initial_capital=initial_capital, periods_per_year=periods_per_year, columnar=True)
 
-def combine_backtest_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Combine results from multiple symbols into a single result."""
+def load_backtest_data(
+    backtest: Backtest,
+    on_symbol_loaded: Optional[Callable[[int], None]] = None,
+    max_workers: Optional[int] = None,
+    symbols: Optional[List[str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """Fetch historical data for the symbols of a backtest (all by default) concurrently, reporting the number loaded so far."""
+    symbols = list(dict.fromkeys(symbols if symbols is not None else backtest.symbols))
+    timeframe = backtest.timeframe or "1Day"
+    
+    if timeframe != "1Day":
+        # Intraday bars come from the local bar store as views, so there is nothing to overlap
+        data = {}
+        for loaded, symbol in enumerate(symbols, start=1):
+            data[symbol] = bar_store.read(symbol, backtest.start_date, backtest.end_date, timeframe=timeframe)
+            if on_symbol_loaded:
+                on_symbol_loaded(loaded)
+        return data
+    
+    max_workers = max(1, min(max_workers or settings.DATA_FETCH_WORKERS, len(symbols)))
+    data = {}
+    
+    # Fetches are network-bound, so threads overlap the round-trips
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                get_historical_data,
+                symbol=symbol,
+                start_date=backtest.start_date,
+                end_date=backtest.end_date
+            ): symbol
+            for symbol in symbols
+        }
+        
+        try:
+            for loaded, future in enumerate(as_completed(futures), start=1):
+                data[futures[future]] = future.result()
+                
+                if on_symbol_loaded:
+                    on_symbol_loaded(loaded)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    
+    return {symbol: data[symbol] for symbol in symbols}
+
+def _run_symbol_backtest(
+    algorithm_type: str,
+    parameters: Dict[str, Any],
+    symbol: str,
+    data: pd.DataFrame,
+    initial_capital: float,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> Dict[str, Any]:
+    results = run_algorithm_backtest(algorithm_type, parameters, data, initial_capital, periods_per_year)
+    results["symbol"] = symbol
+    
+    # Counters of pool workers would otherwise be lost with the process
+    flush_indicator_cache_stats()
+    return results
+
+def run_symbol_backtests(
+    algorithm_type: str,
+    parameters: Dict[str, Any],
+    symbols: List[str],
+    data: Dict[str, pd.DataFrame],
+    initial_capital: float,
+    on_symbol_done: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    max_workers: Optional[int] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> List[Dict[str, Any]]:
+    """Backtest each symbol independently on a process pool, returning results in symbol order."""
+    max_workers = max(1, min(max_workers or settings.BACKTEST_SIMULATION_WORKERS, len(symbols)))
+    
+    if max_workers == 1:
+        all_results = []
+        for done, symbol in enumerate(symbols, start=1):
+            all_results.append(_run_symbol_backtest(algorithm_type, parameters, symbol, data[symbol], initial_capital, periods_per_year))
+            if on_symbol_done:
+                on_symbol_done(done, all_results[-1])
+        return all_results
+    
+    # Simulation is CPU-bound, so symbols run in separate processes
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=pool_context()) as executor:
+        futures = {
+            executor.submit(_run_symbol_backtest, algorithm_type, parameters, symbol, data[symbol], initial_capital, periods_per_year): i
+            for i, symbol in enumerate(symbols)
+        }
+        all_results = [None] * len(symbols)
+        
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                all_results[futures[future]] = future.result()
+                
+                if on_symbol_done:
+                    on_symbol_done(done, all_results[futures[future]])
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    
+    return all_results
+
+def run_chunked_backtest(
+    db: Session,
+    backtest: Backtest,
+    algorithm_type: str,
+    steps: int,
+    memory: PeakMemoryTracker,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> Dict[str, Any]:
+    """
+    Backtest symbols independently a chunk at a time within the memory ceiling, merging results incrementally.
+
+    Chunks are simulated in this process rather than the simulation pool,
+    whose workers would each receive a pickled copy of their symbols' data
+    outside the memory this process measures and sizes chunks from.
+    """
+    symbols = list(dict.fromkeys(backtest.symbols))
+    memory_limit = settings.BACKTEST_MEMORY_LIMIT_MB * MB
+    equity = EquityAccumulator()
+    total_trades = 0
+    exposures = []
+    turnovers = []
+    
+    # Size the first chunk to keep the fetch threads busy, then from the data actually seen
+    chunk_size = max(1, settings.DATA_FETCH_WORKERS)
+    position = 0
+    
+    with TradeSpill(settings.BACKTEST_SPILL_DIR) as spill:
+        while position < len(symbols):
+            chunk = symbols[position:position + chunk_size]
+            done_before = 2 * position
+            baseline = memory.sample() or 0
+            
+            data = load_backtest_data(
+                backtest,
+                symbols=chunk,
+                on_symbol_loaded=lambda loaded: report_progress(db, backtest, (done_before + loaded) / steps)
+            )
+            next_chunk_size = plan_chunk_size(data, memory_limit, baseline)
+            
+            def on_symbol_done(done, results):
+                # The chunk's data and results so far are all resident here
+                memory.sample()
+                report_progress(db, backtest, (done_before + len(chunk) + done) / steps)
+            
+            all_results = run_symbol_backtests(
+                algorithm_type,
+                backtest.parameters,
+                chunk,
+                data,
+                backtest.initial_capital,
+                on_symbol_done=on_symbol_done,
+                max_workers=1,
+                periods_per_year=periods_per_year
+            )
+            del data
+            
+            # Fold the chunk into the running totals, then release it
+            chunk_trades = []
+            for results in all_results:
+                curve = results["equity_curve"]
+                equity.add(pd.DatetimeIndex(curve["timestamp"]), curve["portfolio_value"].to_numpy())
+                for trade in results["trades"]:
+                    trade["symbol"] = results["symbol"]
+                    chunk_trades.append(trade)
+                
+                total_trades += results["metrics"]["total_trades"]
+                if results["metrics"].get("exposure") is not None:
+                    exposures.append(results["metrics"]["exposure"])
+                if results["metrics"].get("turnover") is not None:
+                    turnovers.append(results["metrics"]["turnover"])
+            
+            spill.write(chunk_trades)
+            del all_results, chunk_trades
+            gc.collect()
+            
+            position += len(chunk)
+            current = memory.sample()
+            if current is not None and current > memory_limit and len(chunk) > 1:
+                # The estimate was too optimistic; shrink rather than grow
+                next_chunk_size = max(1, len(chunk) // 2)
+                logger.warning(
+                    f"Backtest ID {backtest.id} at {current / MB:.0f} MB exceeds the "
+                    f"{settings.BACKTEST_MEMORY_LIMIT_MB} MB ceiling, reducing chunks to {next_chunk_size} symbols"
+                )
+            chunk_size = next_chunk_size
+            
+            # Chunks are coarse, so every merged curve is worth publishing
+            publish_progress(
+                backtest.id,
+                BacktestStatus.RUNNING,
+                backtest.progress,
+                current_date=equity.index()[-1] if equity.count else None,
+                equity_curve=decimate_equity_curve(equity.index(), equity.values()),
+                force=True
+            )
+        
+        trades = spill.merge()
+        logger.info(
+            f"Backtest ID {backtest.id} ran {len(symbols)} symbols in chunks, "
+            f"spilling {spill.trade_count} trades ({spill.spilled_bytes / MB:.1f} MB)"
+        )
+    
+    equity_curve = equity.to_frame()
+    metrics = calculate_performance_metrics(
+        equity_curve["portfolio_value"].to_numpy(),
+        backtest.initial_capital,
+        total_trades=total_trades,
+        periods_per_year=periods_per_year
+    )
+    
+    # Each symbol trades an equal share of the capital, so exposure and turnover average across symbols
+    metrics["exposure"] = float(np.mean(exposures)) if exposures else None
+    metrics["turnover"] = float(np.mean(turnovers)) if turnovers else None
+    
+    return {
+        "equity_curve": equity_curve,
+        "trades": trades,
+        "metrics": metrics
+    }
+
+def run_portfolio_backtest(
+    backtest: Backtest,
+    algorithm: BaseAlgorithm,
+    data: Dict[str, pd.DataFrame],
+    on_progress: Optional[Callable[[pd.Timestamp, float, float], None]] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> Dict[str, Any]:
+    """Run all symbols of a backtest as one portfolio sharing a cash account."""
+    available = {}
+    
+    for symbol, symbol_data in data.items():
+        if symbol_data.empty:
+            logger.warning(f"No data for {symbol}, excluding it from portfolio backtest {backtest.id}")
+            continue
+        
+        available[symbol] = symbol_data.to_frame() if isinstance(symbol_data, BarSlice) else symbol_data
+    
+    if not available:
+        raise ValueError("No market data available for any backtest symbol")
+    
+    return algorithm.backtest_portfolio(
+        available,
+        initial_capital=backtest.initial_capital,
+        max_position_pct=backtest.max_position_pct,
+        max_gross_exposure=backtest.max_gross_exposure,
+        on_progress=on_progress,
+        periods_per_year=periods_per_year,
+        columnar=True
+    )
+
+def combine_backtest_results(
+    results: List[Dict[str, Any]],
+    initial_capital: Optional[float] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> Dict[str, Any]:
+    """Combine results from multiple symbols into a single result, each symbol holding an equal share."""
     if not results:
         return {
-            "equity_curve": [],
+            "equity_curve": pd.DataFrame(columns=["timestamp", "portfolio_value"]),
             "trades": [],
-            "metrics": {
-                "annualized_return": 0,
-                "sharpe_ratio": 0,
-                "max_drawdown": 0,
-                "win_rate": 0,
-                "total_trades": 0,
-                "final_portfolio_value": 0
-            }
+            "metrics": calculate_performance_metrics(np.array([]), initial_capital or 0, periods_per_year=periods_per_year)
         }
     
-    # Combine equity curves
-    combined_equity_curve = {}
-    for result in results:
-        for point in result["equity_curve"]:
-            timestamp = point["timestamp"]
-            if timestamp not in combined_equity_curve:
-                combined_equity_curve[timestamp] = 0
-            combined_equity_curve[timestamp] += point["portfolio_value"] / len(results)
-    
-    combined_equity_curve_list = [
-        {"timestamp": timestamp, "portfolio_value": value}
-        for timestamp, value in combined_equity_curve.items()
-    ]
-    combined_equity_curve_list.sort(key=lambda x: x["timestamp"])
+    # Align equity curves on a common index, holding each symbol's value flat outside its own bars
+    curves = {
+        i: pd.Series(
+            result["equity_curve"]["portfolio_value"].to_numpy(dtype=np.float64),
+            index=pd.Index(result["equity_curve"]["timestamp"])
+        )
+        for i, result in enumerate(results)
+    }
+    index, panel = build_panel(curves)
+    panel = pd.DataFrame(panel).ffill().bfill().to_numpy()
+    combined_equity = np.nanmean(panel, axis=1) if len(index) else np.array([])
+    
+    combined_equity_curve = pd.DataFrame({"timestamp": index, "portfolio_value": combined_equity})
     
     # Combine trades
     combined_trades = []
@@ -184,55 +719,42 @@ def combine_backtest_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     
     combined_trades.sort(key=lambda x: x["timestamp"])
     
-    # Calculate combined metrics
-    total_trades = sum(result["metrics"]["total_trades"] for result in results)
-    win_rate = sum(result["metrics"]["win_rate"] * result["metrics"]["total_trades"] for result in results) / total_trades if total_trades > 0 else 0
-    
-    # Get final portfolio value
-    final_portfolio_value = combined_equity_curve_list[-1]["portfolio_value"] if combined_equity_curve_list else 0
-    
-    # Calculate annualized return
-    initial_portfolio_value = combined_equity_curve_list[0]["portfolio_value"] if combined_equity_curve_list else 0
-    days = (combined_equity_curve_list[-1]["timestamp"] - combined_equity_curve_list[0]["timestamp"]).days if combined_equity_curve_list else 0
-    annualized_return = (final_portfolio_value / initial_portfolio_value) ** (365 / days) - 1 if days > 0 else 0
-    
-    # Calculate max drawdown
-    max_drawdown = 0
-    peak = 0
-    for point in combined_equity_curve_list:
-        value = point["portfolio_value"]
-        if value > peak:
-            peak = value
-        drawdown = (peak - value) / peak if peak > 0 else 0
-        max_drawdown = max(max_drawdown, drawdown)
-    
-    # Calculate Sharpe ratio
-    returns = []
-    for i in range(1, len(combined_equity_curve_list)):
-        prev_value = combined_equity_curve_list[i-1]["portfolio_value"]
-        curr_value = combined_equity_curve_list[i]["portfolio_value"]
-        returns.append((curr_value / prev_value) - 1)
-    
-    sharpe_ratio = (sum(returns) / len(returns)) / (pd.Series(returns).std() or 1) * (252 ** 0.5) if returns else 0
+    if initial_capital is None:
+        initial_capital = combined_equity[0] if len(combined_equity) else 0
+    
+    metrics = calculate_performance_metrics(
+        combined_equity,
+        initial_capital,
+        total_trades=sum(result["metrics"]["total_trades"] for result in results),
+        periods_per_year=periods_per_year
+    )
+    
+    # Each symbol trades an equal share of the capital, so exposure and turnover average across symbols
+    for name in ("exposure", "turnover"):
+        values = [result["metrics"].get(name) for result in results if result["metrics"].get(name) is not None]
+        metrics[name] = float(np.mean(values)) if values else None
     
     return {
-        "equity_curve": combined_equity_curve_list,
+        "equity_curve": combined_equity_curve,
         "trades": combined_trades,
-        "metrics": {
-            "annualized_return": annualized_return,
-            "sharpe_ratio": sharpe_ratio,
-            "max_drawdown": max_drawdown,
-            "win_rate": win_rate,
-            "total_trades": total_trades,
-            "final_portfolio_value": final_portfolio_value
-        }
+        "metrics": metrics
     }
 
+def partial_equity_curve(
+    results: List[Dict[str, Any]],
+    initial_capital: float,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> List[Dict[str, Any]]:
+    """Combine the equity curves of the symbols finished so far into a decimated curve."""
+    curve = combine_backtest_results(results, initial_capital=initial_capital, periods_per_year=periods_per_year)["equity_curve"]
+    return decimate_equity_curve(pd.DatetimeIndex(curve["timestamp"]), curve["portfolio_value"].to_numpy())
+
 def update_strategy_metrics(db: Session, strategy: Strategy, metrics: Dict[str, Any]) -> None:
     """Update strategy performance metrics based on latest backtest."""
     strategy.annualized_return = metrics["annualized_return"]
     strategy.max_drawdown = metrics["max_drawdown"]
     strategy.sharpe_ratio = metrics["sharpe_ratio"]
+    strategy.sortino_ratio = metrics.get("sortino_ratio")
     strategy.win_rate = metrics["win_rate"]
     db.commit()
 
@@ -247,8 +769,8 @@ def get_backtests(
     skip: int = 0,
     limit: int = 100
 ) -> List[Backtest]:
-    """Get list of backtests with filters."""
-    query = db.query(Backtest)
+    """Get list of backtests with filters, without loading their results."""
+    query = db.query(Backtest).options(defer(Backtest.results))
     
     if user_id is not None:
         query = query.filter(Backtest.user_id == user_id)
@@ -0,0 +1,167 @@
+"""
+Building blocks for out-of-core backtests over large symbol universes.
+
+Independent backtests over thousands of symbols are run a chunk of symbols at
+a time. Each finished chunk is folded into a running equity total whose size
+depends only on the number of bars, and its trades are spilled to disk, so
+memory stays bounded by the chunk size rather than the universe size.
+"""
+
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.data.bar_store import BarSlice
+from backend.data.result_store import ResultTable, encode_table
+
+# Peak memory of a symbol's simulation (signals, indicators, result lists)
+# relative to the size of its market data frame
+SYMBOL_MEMORY_FACTOR = 12
+
+def plan_chunk_size(
+    data: Dict[str, pd.DataFrame],
+    memory_limit_bytes: int,
+    used_bytes: int,
+    max_chunk_size: Optional[int] = None
+) -> int:
+    """
+    Estimate how many symbols fit in memory at once.
+
+    Args:
+        data: Market data of symbols loaded so far, used as a size sample
+        memory_limit_bytes: Memory ceiling for the whole process
+        used_bytes: Memory already in use by the process
+        max_chunk_size: Upper bound on the chunk size (optional)
+
+    Returns:
+        Number of symbols per chunk, at least 1
+    """
+    sizes = [_data_bytes(frame) for frame in data.values() if not frame.empty]
+    if not sizes:
+        return max_chunk_size or 1
+
+    per_symbol = max(1, int(np.mean(sizes) * SYMBOL_MEMORY_FACTOR))
+    chunk_size = max(1, (memory_limit_bytes - used_bytes) // per_symbol)
+    return int(min(chunk_size, max_chunk_size)) if max_chunk_size else int(chunk_size)
+
+def _data_bytes(frame) -> int:
+    if isinstance(frame, BarSlice):
+        return frame.nbytes
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+class EquityAccumulator:
+    """
+    Running equal-weight combination of per-symbol equity curves.
+
+    Curves are aligned on the union of their timestamps, holding each symbol's
+    value flat outside its own bars, which matches combining all curves at
+    once with forward and backward filling.
+    """
+
+    def __init__(self):
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.total = np.empty(0, dtype=np.float64)
+        self.count = 0
+        self.tz = None
+
+    def add(self, timestamps: pd.DatetimeIndex, values: np.ndarray) -> None:
+        """
+        Add one symbol's equity curve.
+
+        Args:
+            timestamps: Sorted timestamps of the curve
+            values: Portfolio values of the curve
+        """
+        if len(timestamps) == 0:
+            return
+
+        timestamps = pd.DatetimeIndex(timestamps)
+        if self.count == 0:
+            self.tz = timestamps.tz
+        ns = _utc_ns(timestamps)
+
+        union = np.union1d(self.timestamps, ns)
+        total = _hold(self.timestamps, self.total, union) if self.count else np.zeros(len(union))
+        total += _hold(ns, np.asarray(values, dtype=np.float64), union)
+
+        self.timestamps = union
+        self.total = total
+        self.count += 1
+
+    def index(self) -> pd.DatetimeIndex:
+        """Get the combined timestamps in the zone of the first curve."""
+        index = pd.to_datetime(self.timestamps, unit="ns", utc=True)
+        return index.tz_convert(self.tz) if self.tz is not None else index.tz_localize(None)
+
+    def values(self) -> np.ndarray:
+        """Get the combined equity, the mean of all curves added so far."""
+        return self.total / self.count if self.count else np.array([])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the combined equity curve as a DataFrame."""
+        return pd.DataFrame({"timestamp": self.index(), "portfolio_value": self.values()})
+
+def _utc_ns(timestamps: pd.DatetimeIndex) -> np.ndarray:
+    if timestamps.tz is not None:
+        timestamps = timestamps.tz_convert("UTC").tz_localize(None)
+    return timestamps.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+def _hold(timestamps: np.ndarray, values: np.ndarray, at: np.ndarray) -> np.ndarray:
+    # Last value at or before each point, or the first value before the curve starts
+    positions = np.searchsorted(timestamps, at, side="right") - 1
+    return values[np.maximum(positions, 0)]
+
+class TradeSpill:
+    """Trades of finished chunks, spilled to columnar files in a temporary directory."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = tempfile.TemporaryDirectory(prefix="axiom-backtest-", dir=directory or None)
+        self._paths: List[str] = []
+        self.trade_count = 0
+        self.spilled_bytes = 0
+
+    def __enter__(self) -> "TradeSpill":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, trades: List[Dict[str, Any]]) -> None:
+        """Spill the trades of one chunk to disk."""
+        if not trades:
+            return
+
+        path = os.path.join(self._directory.name, f"trades-{len(self._paths):06d}.npz")
+        blob = encode_table(trades)
+        with open(path, "wb") as spill_file:
+            spill_file.write(blob)
+
+        self._paths.append(path)
+        self.trade_count += len(trades)
+        self.spilled_bytes += len(blob)
+
+    def merge(self) -> pd.DataFrame:
+        """
+        Read back every spilled chunk as one trade table.
+
+        Returns:
+            DataFrame of all trades ordered by timestamp, keeping chunk order
+            for trades at the same timestamp
+        """
+        frames = []
+        for path in self._paths:
+            with open(path, "rb") as spill_file:
+                frames.append(ResultTable(spill_file.read()).to_frame())
+
+        if not frames:
+            return pd.DataFrame()
+
+        trades = pd.concat(frames, ignore_index=True)
+        return trades.sort_values("timestamp", kind="mergesort", ignore_index=True)
+
+    def close(self) -> None:
+        """Delete the spill directory."""
+        self._directory.cleanup()
@@ -0,0 +1,95 @@
+"""
+Configuration and metrics of the indicator memoization cache.
+
+Applies the INDICATOR_CACHE_* settings to the indicator_cache shared by the
+indicator functions, backing it with Redis when INDICATOR_CACHE_REDIS is set
+so that the worker processes of backtests and sweeps reuse each other's
+indicators. Hit and miss counters are published to Redis as well, so that
+those of worker processes are included in the stats.
+"""
+
+from typing import Any, Dict, Optional
+
+import redis
+from redis.exceptions import RedisError
+
+from backend.algorithms.utils.indicator_cache import indicator_cache
+from backend.config import settings
+from backend.data.cache import redis_client
+from backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_STATS_KEY = "stats:indicator_cache"
+
+class RedisIndicatorTier:
+    """Remote tier of the indicator cache storing encoded arrays in Redis."""
+
+    def __init__(self, client, ttl: int):
+        self.client = client
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(key)
+        except RedisError as e:
+            logger.error(f"Redis indicator cache error: {str(e)}")
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        try:
+            self.client.set(key, value, ex=self.ttl)
+        except RedisError as e:
+            logger.error(f"Redis indicator cache error: {str(e)}")
+
+def configure_indicator_cache() -> None:
+    """Apply the indicator cache settings."""
+    remote = None
+
+    if settings.INDICATOR_CACHE_REDIS and redis_client is not None:
+        # Values are raw array bytes, so responses must not be decoded
+        remote = RedisIndicatorTier(redis.from_url(settings.REDIS_URL), settings.INDICATOR_CACHE_TTL)
+
+    indicator_cache.configure(settings.INDICATOR_CACHE_MB * 1024 ** 2, remote)
+
+def flush_indicator_cache_stats() -> None:
+    """Publish this process's counter increments to Redis."""
+    counts = indicator_cache.take_counts()
+
+    if redis_client is None or not any(counts.values()):
+        return
+
+    try:
+        pipeline = redis_client.pipeline()
+        for name, count in counts.items():
+            if count:
+                pipeline.hincrby(_STATS_KEY, name, count)
+        pipeline.execute()
+    except RedisError as e:
+        logger.error(f"Redis stats error: {str(e)}")
+
+def indicator_cache_stats() -> Dict[str, Any]:
+    """
+    Get the indicator cache counters and hit rate.
+
+    Returns:
+        Dictionary of counters across processes when Redis is available,
+        with the in-process entries and memory use of this process
+    """
+    flush_indicator_cache_stats()
+    stats = indicator_cache.stats()
+
+    if redis_client is not None:
+        try:
+            stored = redis_client.hgetall(_STATS_KEY)
+            for name in ("hits", "remote_hits", "misses", "evictions"):
+                stats[name] = int(stored.get(name, 0))
+        except RedisError as e:
+            logger.error(f"Redis stats error: {str(e)}")
+
+    lookups = stats["hits"] + stats["remote_hits"] + stats["misses"]
+    stats["lookups"] = lookups
+    stats["hit_rate"] = (stats["hits"] + stats["remote_hits"]) / lookups if lookups else 0.0
+    return stats
+
+configure_indicator_cache()
@@ -0,0 +1,309 @@
+"""
+Background execution of backtests.
+
+Backtests are queued by ID and executed by a pool of worker threads, so the
+HTTP request that creates a backtest returns while it is still pending. The
+backtests table is the durable record of the queue: pending rows are
+re-enqueued when a pool starts, and a worker only runs a backtest after
+atomically moving it from pending to running.
+
+A running backtest holds a lease that its worker renews with a heartbeat
+every BACKTEST_HEARTBEAT_SECONDS. When a pool starts, running backtests whose
+heartbeat is older than BACKTEST_LEASE_SECONDS belong to a worker that
+stopped mid-run, so they are returned to pending and queued again. With
+Redis, a taken ID also stays in a processing list until its backtest
+finishes, so no ID is lost between the queue and the database.
+"""
+
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import func
+
+from backend.config import settings
+from backend.data.cache import redis_client
+from backend.models import SessionLocal
+from backend.models.backtest import Backtest, BacktestStatus
+from backend.services.backtest_service import run_backtest
+from backend.services.indicator_cache import flush_indicator_cache_stats
+from backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+class LocalJobQueue:
+    """In-process job queue, used when Redis is not configured and in tests."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def enqueue(self, backtest_id: int) -> None:
+        """Add a backtest to the queue."""
+        self._queue.put(backtest_id)
+
+    def dequeue(self, timeout: float = 1.0) -> Optional[int]:
+        """Take the next backtest ID, or return None after the timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def ack(self, backtest_id: int) -> None:
+        """Mark a taken backtest as finished."""
+
+    def requeue(self, backtest_id: int) -> None:
+        """Queue a backtest again, e.g. one whose worker stopped."""
+        self.enqueue(backtest_id)
+
+    def processing(self) -> List[int]:
+        """Get the IDs taken but not yet finished by any worker."""
+        return []
+
+class RedisJobQueue:
+    """
+    Job queue backed by Redis lists, shared by API and worker processes.
+
+    A taken ID moves to a processing list and is only removed once its
+    backtest finishes, so IDs taken by a worker that stopped are not lost.
+    """
+
+    def __init__(self, client, key: str = "jobs:backtests"):
+        self.client = client
+        self.key = key
+        self.processing_key = f"{key}:processing"
+
+    def enqueue(self, backtest_id: int) -> None:
+        """Add a backtest to the queue."""
+        self.client.lpush(self.key, backtest_id)
+
+    def dequeue(self, timeout: float = 1.0) -> Optional[int]:
+        """Take the next backtest ID into the processing list, or return None after the timeout."""
+        try:
+            item = self.client.blmove(self.key, self.processing_key, max(1, int(timeout)), "RIGHT", "LEFT")
+        except RedisError as e:
+            logger.error(f"Redis dequeue error: {str(e)}")
+            return None
+
+        return int(item) if item is not None else None
+
+    def ack(self, backtest_id: int) -> None:
+        """Remove a finished backtest from the processing list."""
+        try:
+            self.client.lrem(self.processing_key, 1, backtest_id)
+        except RedisError as e:
+            logger.error(f"Redis ack error: {str(e)}")
+
+    def requeue(self, backtest_id: int) -> None:
+        """Move a backtest from the processing list back onto the queue."""
+        pipeline = self.client.pipeline()
+        pipeline.lrem(self.processing_key, 0, backtest_id)
+        pipeline.lpush(self.key, backtest_id)
+        pipeline.execute()
+
+    def processing(self) -> List[int]:
+        """Get the IDs taken but not yet finished by any worker."""
+        return [int(item) for item in self.client.lrange(self.processing_key, 0, -1)]
+
+_job_queue = None
+
+def get_job_queue():
+    """Get the configured job queue, falling back to a local queue without Redis."""
+    global _job_queue
+
+    if _job_queue is None:
+        if settings.BACKTEST_QUEUE == "redis" and redis_client is not None:
+            _job_queue = RedisJobQueue(redis_client)
+        else:
+            if settings.BACKTEST_QUEUE == "redis":
+                logger.warning("Redis is not available, using a local backtest queue")
+            _job_queue = LocalJobQueue()
+
+    return _job_queue
+
+def enqueue_backtest(backtest_id: int) -> None:
+    """Queue a pending backtest for execution."""
+    get_job_queue().enqueue(backtest_id)
+
+def claim_backtest(db, backtest_id: int) -> bool:
+    """Atomically move a backtest from pending to running."""
+    claimed = db.query(Backtest).filter(
+        Backtest.id == backtest_id,
+        Backtest.status == BacktestStatus.PENDING
+    ).update(
+        {
+            Backtest.status: BacktestStatus.RUNNING,
+            Backtest.started_at: datetime.now(),
+            Backtest.heartbeat_at: datetime.now()
+        },
+        synchronize_session=False
+    )
+    db.commit()
+    return claimed == 1
+
+def _renew_lease(backtest_id: int, stop_event: threading.Event) -> None:
+    # Runs in its own thread, so the lease is renewed however long a step of the backtest takes
+    while not stop_event.wait(settings.BACKTEST_HEARTBEAT_SECONDS):
+        db = SessionLocal()
+        try:
+            db.query(Backtest).filter(
+                Backtest.id == backtest_id,
+                Backtest.status == BacktestStatus.RUNNING
+            ).update({Backtest.heartbeat_at: datetime.now()}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Could not renew the lease of backtest ID {backtest_id}: {str(e)}")
+        finally:
+            db.close()
+
+def process_backtest_job(backtest_id: int) -> None:
+    """Run one queued backtest in its own database session, renewing its lease meanwhile."""
+    db = SessionLocal()
+    stop_event = threading.Event()
+    try:
+        if not claim_backtest(db, backtest_id):
+            logger.info(f"Backtest ID {backtest_id} is no longer pending, skipping")
+            return
+
+        threading.Thread(
+            target=_renew_lease,
+            args=(backtest_id, stop_event),
+            name=f"backtest-lease-{backtest_id}",
+            daemon=True
+        ).start()
+        run_backtest(db, backtest_id=backtest_id)
+    except Exception as e:
+        # run_backtest has already recorded the failure on the backtest
+        logger.error(f"Backtest job {backtest_id} failed: {str(e)}")
+    finally:
+        stop_event.set()
+        flush_indicator_cache_stats()
+        db.close()
+
+def recover_stale_backtests() -> int:
+    """
+    Return running backtests whose lease expired to pending, e.g. after a worker stopped mid-run.
+
+    Backtests whose cancellation was requested are cancelled instead.
+
+    Returns:
+        Number of backtests returned to pending
+    """
+    cutoff = datetime.now() - timedelta(seconds=settings.BACKTEST_LEASE_SECONDS)
+    stale = (
+        Backtest.status == BacktestStatus.RUNNING,
+        func.coalesce(Backtest.heartbeat_at, Backtest.started_at) < cutoff
+    )
+
+    db = SessionLocal()
+    recovered = 0
+    try:
+        for backtest_id, cancel_requested in db.query(Backtest.id, Backtest.cancel_requested).filter(*stale).all():
+            if cancel_requested:
+                values = {Backtest.status: BacktestStatus.CANCELLED, Backtest.completed_at: datetime.now()}
+            else:
+                values = {
+                    Backtest.status: BacktestStatus.PENDING,
+                    Backtest.progress: 0.0,
+                    Backtest.started_at: None,
+                    Backtest.heartbeat_at: None
+                }
+
+            # Another starting pool may have recovered it meanwhile
+            updated = db.query(Backtest).filter(Backtest.id == backtest_id, *stale).update(values, synchronize_session=False)
+            db.commit()
+            if updated and not cancel_requested:
+                logger.warning(f"Backtest ID {backtest_id} stopped without finishing, returning it to pending")
+                recovered += 1
+    finally:
+        db.close()
+
+    return recovered
+
+def requeue_pending_backtests() -> int:
+    """Queue every backtest still pending, e.g. after a restart, and release finished ones still marked as processing."""
+    job_queue = get_job_queue()
+
+    db = SessionLocal()
+    try:
+        pending = [backtest_id for (backtest_id,) in db.query(Backtest.id).filter(Backtest.status == BacktestStatus.PENDING).all()]
+        taken = job_queue.processing()
+        # Running backtests with a live lease still belong to their worker
+        running = {
+            backtest_id for (backtest_id,) in db.query(Backtest.id).filter(
+                Backtest.id.in_(taken),
+                Backtest.status == BacktestStatus.RUNNING
+            ).all()
+        } if taken else set()
+    finally:
+        db.close()
+
+    for backtest_id in pending:
+        job_queue.requeue(backtest_id)
+
+    for backtest_id in set(taken) - running - set(pending):
+        job_queue.ack(backtest_id)
+
+    return len(pending)
+
+class BacktestWorkerPool:
+    """Pool of threads that execute queued backtests."""
+
+    def __init__(self, job_queue=None, num_workers: int = 2):
+        self.job_queue = job_queue or get_job_queue()
+        self.num_workers = num_workers
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        self._stop_event.clear()
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._work, name=f"backtest-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.num_workers} backtest workers")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers once their current backtest finishes."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self) -> None:
+        while not self._stop_event.is_set():
+            backtest_id = self.job_queue.dequeue(timeout=1.0)
+            if backtest_id is not None:
+                try:
+                    process_backtest_job(backtest_id)
+                finally:
+                    self.job_queue.ack(backtest_id)
+
+_worker_pool: Optional[BacktestWorkerPool] = None
+
+def start_worker_pool(num_workers: Optional[int] = None) -> BacktestWorkerPool:
+    """Start the process-wide worker pool and queue any leftover pending or stale running backtests."""
+    global _worker_pool
+
+    if _worker_pool is None:
+        _worker_pool = BacktestWorkerPool(num_workers=num_workers or settings.BACKTEST_WORKERS)
+        recovered = recover_stale_backtests()
+        if recovered:
+            logger.info(f"Recovered {recovered} backtests stopped mid-run")
+        requeued = requeue_pending_backtests()
+        if requeued:
+            logger.info(f"Re-queued {requeued} pending backtests")
+        _worker_pool.start()
+
+    return _worker_pool
+
+def stop_worker_pool() -> None:
+    """Stop the process-wide worker pool."""
+    global _worker_pool
+
+    if _worker_pool is not None:
+        _worker_pool.stop()
+        _worker_pool = None
@@ -11,6 +11,7 @@ from backend.data.connectors.yahoo_finance import (
     get_latest_quote,
     get_market_overview
 )
+from backend.data.bar_store import bar_store
 from backend.data.cache import Cache, cached
 from backend.utils.logging import get_logger
 
@@ -218,4 +219,68 @@ def clear_market_data_cache() -> bool:
     Returns:
         True if successful, False otherwise
     """
-    return Cache.clear_pattern("cache:get_*")
\ No newline at end of file
+    return Cache.clear_pattern("cache:get_*")
+
+def import_intraday_bars(
+    symbol: str,
+    start_date: datetime,
+    end_date: datetime,
+    timeframe: str = "1Min",
+    price_dtype: Optional[str] = None,
+    window_days: int = 5
+) -> Dict[str, Any]:
+    """
+    Download intraday bars from Alpaca into the local bar store.
+    
+    Bars are requested in windows of a few days, so each request stays under
+    Alpaca's page limit, and appended as they arrive. Bars already stored are
+    skipped, so an interrupted import can simply be run again.
+    
+    Args:
+        symbol: Stock ticker symbol
+        start_date: Start date for the import
+        end_date: End date for the import
+        timeframe: Bar timeframe ("1Min" or "1Hour")
+        price_dtype: 'float32' or 'float64' price storage for a new symbol
+            (default: PRICE_DTYPE)
+        window_days: Number of days requested per Alpaca call
+        
+    Returns:
+        Dictionary with the number of bars appended and the stored extent
+    """
+    # Imported here so the rest of the service works without Alpaca installed
+    from backend.data.connectors import alpaca
+    
+    appended = 0
+    window_start = start_date
+    
+    while window_start < end_date:
+        window_end = min(window_start + timedelta(days=window_days), end_date)
+        bars = alpaca.get_historical_data(
+            symbol,
+            start_date=window_start,
+            end_date=window_end,
+            timeframe=timeframe,
+            limit=10000
+        )
+        appended += bar_store.write(symbol, bars, timeframe=timeframe, price_dtype=price_dtype)
+        window_start = window_end
+    
+    logger.info(f"Imported {appended} {timeframe} bars for {symbol}")
+    
+    return {
+        "appended": appended,
+        **(bar_store.info(symbol, timeframe=timeframe) or {"symbol": symbol.upper(), "timeframe": timeframe, "bars": 0})
+    }
+
+def get_intraday_bar_inventory(timeframe: str = "1Min") -> List[Dict[str, Any]]:
+    """
+    List the intraday bars available in the local bar store.
+    
+    Args:
+        timeframe: Bar timeframe ("1Min" or "1Hour")
+        
+    Returns:
+        List of dictionaries with each symbol's stored extent
+    """
+    return [bar_store.info(symbol, timeframe=timeframe) for symbol in bar_store.symbols(timeframe)]
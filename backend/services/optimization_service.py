@@ -0,0 +1,472 @@
+import itertools
+import logging
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+from backend.algorithms import create_algorithm_instance
+from backend.algorithms.utils.performance import calculate_performance_metrics
+from backend.data.connectors.yahoo_finance import get_historical_data
+from backend.services.indicator_cache import flush_indicator_cache_stats
+from backend.utils.processes import pool_context
+
+logger = logging.getLogger(__name__)
+
+# Metrics where a smaller value ranks higher
+LOWER_IS_BETTER_METRICS = {"max_drawdown", "max_drawdown_duration", "volatility"}
+
+# Market data for sweep worker processes, set once per worker by the pool initializer
+_worker_data: Optional[pd.DataFrame] = None
+
+def expand_parameter_grid(parameter_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Expand a grid of candidate values into every parameter combination."""
+    if not parameter_grid:
+        return [{}]
+
+    names = list(parameter_grid.keys())
+    for name in names:
+        if not isinstance(parameter_grid[name], list) or len(parameter_grid[name]) == 0:
+            raise ValueError(f"Grid values for '{name}' must be a non-empty list")
+
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(parameter_grid[name] for name in names))
+    ]
+
+def sample_parameter_space(
+    search_space: Dict[str, Any],
+    n_samples: int,
+    seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Draw random parameter sets from a search space.
+
+    Each entry is either a list of choices or a {"min": ..., "max": ...} range.
+    Ranges with integer bounds are sampled as integers, others uniformly.
+    """
+    rng = random.Random(seed)
+    samples = []
+
+    for _ in range(n_samples):
+        parameters = {}
+        for name, space in search_space.items():
+            if isinstance(space, list) and space:
+                parameters[name] = rng.choice(space)
+            elif isinstance(space, dict) and "min" in space and "max" in space:
+                low, high = space["min"], space["max"]
+                if low > high:
+                    raise ValueError(f"Search range for '{name}' has min greater than max")
+                if isinstance(low, int) and isinstance(high, int):
+                    parameters[name] = rng.randint(low, high)
+                else:
+                    parameters[name] = rng.uniform(low, high)
+            else:
+                raise ValueError(f"Search space for '{name}' must be a list of choices or a min/max range")
+        samples.append(parameters)
+
+    return samples
+
+def build_parameter_sets(
+    parameter_grid: Optional[Dict[str, List[Any]]] = None,
+    search_space: Optional[Dict[str, Any]] = None,
+    n_samples: int = 100,
+    seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Build the parameter sets of a sweep from a grid or a random search space."""
+    if parameter_grid:
+        parameter_sets = expand_parameter_grid(parameter_grid)
+    elif search_space:
+        parameter_sets = sample_parameter_space(search_space, n_samples, seed)
+    else:
+        raise ValueError("Either parameter_grid or search_space is required")
+
+    if len(parameter_sets) > settings.MAX_SWEEP_COMBINATIONS:
+        raise ValueError(
+            f"Sweep has {len(parameter_sets)} parameter sets, "
+            f"the maximum is {settings.MAX_SWEEP_COMBINATIONS}"
+        )
+
+    return parameter_sets
+
+def group_parameter_sets(
+    algorithm_type: str,
+    parameter_sets: List[Dict[str, Any]]
+) -> Tuple[List[List[Dict[str, Any]]], int]:
+    """
+    Group parameter sets that share the same indicator parameters.
+
+    Invalid parameter sets are dropped. Returns the groups and the number of
+    dropped sets.
+    """
+    groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+    invalid = 0
+
+    for parameters in parameter_sets:
+        try:
+            algorithm = create_algorithm_instance(algorithm_type, parameters)
+        except ValueError as e:
+            logger.debug(f"Skipping invalid parameter set {parameters}: {str(e)}")
+            invalid += 1
+            continue
+
+        key = tuple(repr(algorithm.parameters.get(name)) for name in algorithm.INDICATOR_PARAMETERS)
+        groups.setdefault(key, []).append(parameters)
+
+    return list(groups.values()), invalid
+
+def _init_sweep_worker(data: pd.DataFrame) -> None:
+    """Store the sweep's market data in a worker process."""
+    global _worker_data
+    _worker_data = data
+
+def _evaluate_parameter_group(
+    algorithm_type: str,
+    parameter_sets: List[Dict[str, Any]],
+    initial_capital: float,
+    data: Optional[pd.DataFrame] = None
+) -> List[Dict[str, Any]]:
+    """Evaluate parameter sets that share one indicator frame."""
+    if data is None:
+        data = _worker_data
+
+    # Indicator columns only depend on the parameters the group shares
+    indicator_data = create_algorithm_instance(algorithm_type, parameter_sets[0]).calculate_indicators(data)
+
+    rows = []
+    for parameters in parameter_sets:
+        algorithm = create_algorithm_instance(algorithm_type, parameters)
+        signals = algorithm.generate_signals_from_indicators(indicator_data)
+        rows.append({
+            "parameters": parameters,
+            "metrics": algorithm.evaluate(signals, initial_capital=initial_capital)
+        })
+
+    # Counters of pool workers would otherwise be lost with the process
+    flush_indicator_cache_stats()
+    return rows
+
+def _split_groups(groups: List[List[Dict[str, Any]]], max_workers: int) -> List[List[Dict[str, Any]]]:
+    """Split large groups so every worker gets a share of the sweep."""
+    total = sum(len(group) for group in groups)
+    chunk_size = max(1, math.ceil(total / (max_workers * 4)))
+
+    return [
+        group[i:i + chunk_size]
+        for group in groups
+        for i in range(0, len(group), chunk_size)
+    ]
+
+def rank_results(results: List[Dict[str, Any]], rank_by: str = "sharpe_ratio") -> List[Dict[str, Any]]:
+    """Sort sweep results by a metric, best first, and number them."""
+    sign = -1 if rank_by in LOWER_IS_BETTER_METRICS else 1
+
+    def sort_key(row):
+        value = row["metrics"].get(rank_by)
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return float("-inf")
+        return sign * value
+
+    ranked = sorted(results, key=sort_key, reverse=True)
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+
+    return ranked
+
+def run_parameter_sweep(
+    algorithm_type: str,
+    data: pd.DataFrame,
+    parameter_sets: List[Dict[str, Any]],
+    initial_capital: float = 10000.0,
+    rank_by: str = "sharpe_ratio",
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Backtest many parameter sets of one algorithm on the same data.
+
+    Parameter sets sharing indicator parameters are evaluated together against
+    a single indicator frame, and groups are fanned out over a process pool.
+    """
+    max_workers = max_workers or settings.OPTIMIZATION_MAX_WORKERS
+    groups, invalid = group_parameter_sets(algorithm_type, parameter_sets)
+    tasks = _split_groups(groups, max_workers)
+
+    start_time = time.perf_counter()
+    results = []
+
+    if max_workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            results.extend(_evaluate_parameter_group(algorithm_type, task, initial_capital, data))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(tasks)),
+            mp_context=pool_context(),
+            initializer=_init_sweep_worker,
+            initargs=(data,)
+        ) as executor:
+            futures = [
+                executor.submit(_evaluate_parameter_group, algorithm_type, task, initial_capital)
+                for task in tasks
+            ]
+            for future in futures:
+                results.extend(future.result())
+
+    elapsed = time.perf_counter() - start_time
+    logger.info(
+        f"Parameter sweep for {algorithm_type}: {len(results)} sets in {len(groups)} indicator groups, "
+        f"{elapsed:.2f}s"
+    )
+
+    return {
+        "algorithm_type": algorithm_type,
+        "evaluated": len(results),
+        "invalid": invalid,
+        "indicator_groups": len(groups),
+        "elapsed_seconds": elapsed,
+        "rank_by": rank_by,
+        "results": rank_results(results, rank_by)
+    }
+
+def optimize_strategy(
+    algorithm_type: str,
+    symbol: str,
+    start_date: datetime,
+    end_date: datetime,
+    initial_capital: float = 10000.0,
+    parameter_grid: Optional[Dict[str, List[Any]]] = None,
+    search_space: Optional[Dict[str, Any]] = None,
+    n_samples: int = 100,
+    rank_by: str = "sharpe_ratio",
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Fetch market data once and run a grid or random parameter sweep on it."""
+    parameter_sets = build_parameter_sets(parameter_grid, search_space, n_samples, seed)
+
+    data = get_historical_data(symbol=symbol, start_date=start_date, end_date=end_date)
+    if data.empty:
+        raise ValueError(f"No market data available for {symbol}")
+
+    sweep = run_parameter_sweep(
+        algorithm_type=algorithm_type,
+        data=data,
+        parameter_sets=parameter_sets,
+        initial_capital=initial_capital,
+        rank_by=rank_by
+    )
+    sweep["symbol"] = symbol
+
+    return sweep
+
+def generate_walk_forward_windows(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    step_bars: Optional[int] = None
+) -> List[Tuple[int, int, int]]:
+    """
+    Split a series into rolling train/test windows.
+
+    Returns (train_start, test_start, test_end) bar positions; each test slice
+    directly follows its train slice and the windows advance by step_bars
+    (the test length by default). Steps shorter than the test length are
+    rejected, so test slices do not overlap and no bar is stitched twice.
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive")
+
+    step_bars = step_bars or test_bars
+    if step_bars < test_bars:
+        raise ValueError("step_bars must be at least test_bars, so that test windows do not overlap")
+    windows = []
+    train_start = 0
+
+    while train_start + train_bars < n_bars:
+        test_start = train_start + train_bars
+        test_end = min(test_start + test_bars, n_bars)
+        windows.append((train_start, test_start, test_end))
+        train_start += step_bars
+
+    return windows
+
+def _run_walk_forward_window(
+    algorithm_type: str,
+    groups: List[List[Dict[str, Any]]],
+    window: Tuple[int, int, int],
+    initial_capital: float,
+    rank_by: str,
+    data: Optional[pd.DataFrame] = None
+) -> Dict[str, Any]:
+    """Optimize on one train slice and evaluate the winner on the following test slice."""
+    if data is None:
+        data = _worker_data
+
+    train_start, test_start, test_end = window
+    train_data = data.iloc[train_start:test_start]
+
+    # In-sample optimization
+    optimize_start = time.perf_counter()
+    in_sample = []
+    for group in groups:
+        in_sample.extend(_evaluate_parameter_group(algorithm_type, group, initial_capital, train_data))
+    best = rank_results(in_sample, rank_by)[0]
+    optimize_seconds = time.perf_counter() - optimize_start
+
+    # Out-of-sample evaluation, with the train slice as indicator warm-up
+    evaluate_start = time.perf_counter()
+    algorithm = create_algorithm_instance(algorithm_type, best["parameters"])
+    signals = algorithm.generate_signals(data.iloc[train_start:test_end])
+    out_of_sample = algorithm.simulate_signals(signals.iloc[test_start - train_start:], initial_capital)
+    evaluate_seconds = time.perf_counter() - evaluate_start
+
+    return {
+        "train_start": data.index[train_start],
+        "train_end": data.index[test_start - 1],
+        "test_start": data.index[test_start],
+        "test_end": data.index[test_end - 1],
+        "best_parameters": best["parameters"],
+        "in_sample_metrics": best["metrics"],
+        "out_of_sample_metrics": out_of_sample["metrics"],
+        "equity_curve": out_of_sample["equity_curve"],
+        "optimize_seconds": optimize_seconds,
+        "evaluate_seconds": evaluate_seconds
+    }
+
+def stitch_equity_curves(
+    windows: List[Dict[str, Any]],
+    initial_capital: float
+) -> List[Dict[str, Any]]:
+    """
+    Chain per-window out-of-sample equity curves into one curve.
+
+    Every window is simulated from initial_capital. Order sizes are
+    proportional to portfolio value, so a window started with more capital
+    scales linearly and each curve can be rescaled to start from the previous
+    window's final value.
+    """
+    stitched = []
+    capital = initial_capital
+
+    for window in windows:
+        scale = capital / initial_capital
+        for point in window["equity_curve"]:
+            stitched.append({
+                "timestamp": point["timestamp"],
+                "portfolio_value": point["portfolio_value"] * scale
+            })
+        if stitched:
+            capital = stitched[-1]["portfolio_value"]
+
+    return stitched
+
+def run_walk_forward(
+    algorithm_type: str,
+    data: pd.DataFrame,
+    parameter_sets: List[Dict[str, Any]],
+    train_bars: int,
+    test_bars: int,
+    step_bars: Optional[int] = None,
+    initial_capital: float = 10000.0,
+    rank_by: str = "sharpe_ratio",
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run walk-forward optimization over rolling train/test windows.
+
+    Each window is optimized and evaluated in its own worker process, and the
+    out-of-sample equity curves are stitched into one curve.
+    """
+    max_workers = max_workers or settings.OPTIMIZATION_MAX_WORKERS
+    windows = generate_walk_forward_windows(len(data), train_bars, test_bars, step_bars)
+    if not windows:
+        raise ValueError("Date range is too short for the requested train and test window sizes")
+
+    groups, invalid = group_parameter_sets(algorithm_type, parameter_sets)
+    if not groups:
+        raise ValueError("No valid parameter sets to optimize")
+
+    start_time = time.perf_counter()
+
+    if max_workers <= 1 or len(windows) == 1:
+        window_results = [
+            _run_walk_forward_window(algorithm_type, groups, window, initial_capital, rank_by, data)
+            for window in windows
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(windows)),
+            mp_context=pool_context(),
+            initializer=_init_sweep_worker,
+            initargs=(data,)
+        ) as executor:
+            futures = [
+                executor.submit(_run_walk_forward_window, algorithm_type, groups, window, initial_capital, rank_by)
+                for window in windows
+            ]
+            window_results = [future.result() for future in futures]
+
+    elapsed = time.perf_counter() - start_time
+    equity_curve = stitch_equity_curves(window_results, initial_capital)
+
+    total_trades = sum(window["out_of_sample_metrics"]["total_trades"] for window in window_results)
+
+    # Per-window curves are already part of the stitched curve
+    for window in window_results:
+        del window["equity_curve"]
+
+    logger.info(f"Walk-forward for {algorithm_type}: {len(windows)} windows in {elapsed:.2f}s")
+
+    return {
+        "algorithm_type": algorithm_type,
+        "invalid": invalid,
+        "elapsed_seconds": elapsed,
+        "rank_by": rank_by,
+        "windows": window_results,
+        "equity_curve": equity_curve,
+        "metrics": calculate_performance_metrics(
+            np.array([point["portfolio_value"] for point in equity_curve]),
+            initial_capital,
+            total_trades=total_trades
+        )
+    }
+
+def optimize_walk_forward(
+    algorithm_type: str,
+    symbol: str,
+    start_date: datetime,
+    end_date: datetime,
+    train_bars: int,
+    test_bars: int,
+    step_bars: Optional[int] = None,
+    initial_capital: float = 10000.0,
+    parameter_grid: Optional[Dict[str, List[Any]]] = None,
+    search_space: Optional[Dict[str, Any]] = None,
+    n_samples: int = 100,
+    rank_by: str = "sharpe_ratio",
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Fetch market data once and run walk-forward optimization on it."""
+    parameter_sets = build_parameter_sets(parameter_grid, search_space, n_samples, seed)
+
+    data = get_historical_data(symbol=symbol, start_date=start_date, end_date=end_date)
+    if data.empty:
+        raise ValueError(f"No market data available for {symbol}")
+
+    result = run_walk_forward(
+        algorithm_type=algorithm_type,
+        data=data,
+        parameter_sets=parameter_sets,
+        train_bars=train_bars,
+        test_bars=test_bars,
+        step_bars=step_bars,
+        initial_capital=initial_capital,
+        rank_by=rank_by
+    )
+    result["symbol"] = symbol
+
+    return result
@@ -0,0 +1,154 @@
+"""
+Live progress of running backtests.
+
+Workers publish progress snapshots (status, completed fraction, current
+simulated date and a decimated partial equity curve) for each backtest, and
+streaming endpoints read the latest snapshot. Snapshots are kept in Redis when
+it is available, so API processes see progress from separate worker
+processes, and in process memory otherwise. Publishing is throttled so that
+frequent progress reports cost little more than a clock read.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from redis.exceptions import RedisError
+
+from backend.config import settings
+from backend.data.cache import redis_client
+from backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Snapshots of finished backtests only need to outlive the streams watching them
+SNAPSHOT_TTL_SECONDS = 3600
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+_lock = threading.Lock()
+_snapshots: Dict[int, Dict[str, Any]] = {}
+_last_published: Dict[int, float] = {}
+_finished_at: Dict[int, float] = {}
+
+def _key(backtest_id: int) -> str:
+    return f"progress:backtest:{backtest_id}"
+
+def decimate_equity_curve(
+    timestamps: List[Any],
+    values: np.ndarray,
+    max_points: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Reduce an equity curve to at most max_points evenly spaced points.
+
+    The last point is always kept so the partial curve ends at the current
+    simulated date.
+
+    Args:
+        timestamps: Timestamps of the curve
+        values: Portfolio values of the curve
+        max_points: Maximum number of points (defaults to PROGRESS_MAX_POINTS)
+
+    Returns:
+        List of equity curve points with ISO timestamps
+    """
+    max_points = max_points or settings.PROGRESS_MAX_POINTS
+    n = len(values)
+    if n == 0:
+        return []
+
+    step = max(1, -(-n // max_points))
+    positions = np.arange(0, n, step)
+    if positions[-1] != n - 1:
+        positions = np.append(positions, n - 1)
+
+    return [
+        {"timestamp": pd.Timestamp(timestamps[i]).isoformat(), "portfolio_value": float(values[i])}
+        for i in positions
+    ]
+
+def should_publish(backtest_id: int) -> bool:
+    """Check whether the throttle interval has passed since the last snapshot."""
+    last = _last_published.get(backtest_id)
+    return last is None or time.monotonic() - last >= settings.PROGRESS_MIN_INTERVAL
+
+def publish_progress(
+    backtest_id: int,
+    status: str,
+    progress: float,
+    current_date: Optional[datetime] = None,
+    equity_curve: Optional[List[Dict[str, Any]]] = None,
+    error_message: Optional[str] = None,
+    force: bool = False
+) -> bool:
+    """
+    Publish a progress snapshot for a backtest.
+
+    Args:
+        backtest_id: ID of the backtest
+        status: Current backtest status
+        progress: Fraction of the run completed (0-1)
+        current_date: Latest simulated date (optional)
+        equity_curve: Decimated partial equity curve (optional, kept from
+            the previous snapshot when omitted)
+        error_message: Error message of a failed backtest (optional)
+        force: Publish even within the throttle interval, e.g. for status changes
+
+    Returns:
+        True if the snapshot was published, False if it was throttled
+    """
+    if not force and not should_publish(backtest_id):
+        return False
+
+    with _lock:
+        previous = _snapshots.get(backtest_id, {})
+        snapshot = {
+            "backtest_id": backtest_id,
+            "status": str(getattr(status, "value", status)),
+            "progress": progress,
+            "current_date": pd.Timestamp(current_date).isoformat() if current_date is not None else previous.get("current_date"),
+            "equity_curve": equity_curve if equity_curve is not None else previous.get("equity_curve", []),
+            "error_message": error_message,
+            "sequence": previous.get("sequence", 0) + 1
+        }
+        _snapshots[backtest_id] = snapshot
+        _last_published[backtest_id] = time.monotonic()
+
+        if snapshot["status"] in FINISHED_STATUSES:
+            _finished_at[backtest_id] = time.monotonic()
+            _prune_finished()
+
+    if redis_client is not None:
+        try:
+            redis_client.set(_key(backtest_id), json.dumps(snapshot), ex=SNAPSHOT_TTL_SECONDS)
+        except RedisError as e:
+            logger.error(f"Redis progress publish error: {str(e)}")
+
+    return True
+
+def get_progress(backtest_id: int) -> Optional[Dict[str, Any]]:
+    """Get the latest progress snapshot of a backtest, if any has been published."""
+    if redis_client is not None:
+        try:
+            stored = redis_client.get(_key(backtest_id))
+            if stored is not None:
+                return json.loads(stored)
+        except RedisError as e:
+            logger.error(f"Redis progress read error: {str(e)}")
+
+    with _lock:
+        snapshot = _snapshots.get(backtest_id)
+        return dict(snapshot) if snapshot is not None else None
+
+def _prune_finished() -> None:
+    # Callers hold _lock
+    cutoff = time.monotonic() - SNAPSHOT_TTL_SECONDS
+    for backtest_id in [i for i, finished in _finished_at.items() if finished < cutoff]:
+        _snapshots.pop(backtest_id, None)
+        _last_published.pop(backtest_id, None)
+        del _finished_at[backtest_id]
@@ -0,0 +1,187 @@
+"""
+Content-addressed cache of backtest results.
+
+A completed backtest is identified by a hash of everything that determines
+its output: algorithm type, normalized parameters, symbols, date range,
+capital, portfolio settings and a fingerprint of the market data it ran on.
+A new backtest with the same key reuses the stored results of the earlier
+one instead of running the simulation again.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session
+
+from backend.data.bar_store import BarSlice
+from backend.data.cache import redis_client
+from backend.models.backtest import Backtest, BacktestResultData, BacktestStatus
+from backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when a change to the simulation engine or metrics changes results
+RESULT_CACHE_VERSION = 2
+
+_STATS_KEY = "stats:backtest_result_cache"
+
+def data_fingerprint(data: Dict[str, pd.DataFrame]) -> str:
+    """
+    Fingerprint the market data a backtest runs on.
+
+    Args:
+        data: Dictionary mapping symbols to OHLCV DataFrames, or to
+            BarSlice views of stored intraday bars
+
+    Returns:
+        Hex digest that changes whenever any bar, column or timestamp changes
+    """
+    digest = hashlib.sha256()
+
+    for symbol, frame in data.items():
+        digest.update(symbol.encode())
+        if isinstance(frame, BarSlice):
+            # Stored bars are identified without reading them
+            digest.update(frame.fingerprint().encode())
+            continue
+        digest.update(json.dumps([str(column) for column in frame.columns]).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+
+    return digest.hexdigest()
+
+def compute_cache_key(
+    algorithm_type: str,
+    parameters: Dict[str, Any],
+    symbols: List[str],
+    start_date: datetime,
+    end_date: datetime,
+    initial_capital: float,
+    fingerprint: str,
+    mode: Optional[str] = None,
+    max_position_pct: Optional[float] = None,
+    max_gross_exposure: Optional[float] = None,
+    timeframe: str = "1Day"
+) -> str:
+    """
+    Compute the cache key of a backtest.
+
+    Args:
+        algorithm_type: Type of algorithm
+        parameters: Algorithm parameters after defaults have been applied
+        symbols: Symbols in the backtest
+        start_date: Start of the backtest period
+        end_date: End of the backtest period
+        initial_capital: Starting capital
+        fingerprint: Fingerprint of the market data from data_fingerprint
+        mode: Backtest mode (optional)
+        max_position_pct: Per-symbol position limit in portfolio mode (optional)
+        max_gross_exposure: Gross exposure limit in portfolio mode (optional)
+        timeframe: Bar timeframe of the market data
+
+    Returns:
+        Hex digest identifying the backtest's inputs
+    """
+    payload = {
+        "version": RESULT_CACHE_VERSION,
+        "algorithm_type": algorithm_type,
+        "parameters": parameters,
+        "symbols": list(symbols),
+        "start_date": pd.Timestamp(start_date).isoformat(),
+        "end_date": pd.Timestamp(end_date).isoformat(),
+        "initial_capital": float(initial_capital),
+        "mode": str(mode.value if hasattr(mode, "value") else mode),
+        "max_position_pct": max_position_pct,
+        "max_gross_exposure": max_gross_exposure,
+        "timeframe": timeframe,
+        "data": fingerprint
+    }
+
+    # Sorted keys make the key independent of parameter order
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def find_cached_result(db: Session, cache_key: str, exclude_id: Optional[int] = None) -> Optional[Backtest]:
+    """Find the most recent completed backtest with the given cache key."""
+    query = db.query(Backtest).filter(
+        Backtest.cache_key == cache_key,
+        Backtest.status == BacktestStatus.COMPLETED
+    )
+
+    if exclude_id is not None:
+        query = query.filter(Backtest.id != exclude_id)
+
+    return query.order_by(Backtest.completed_at.desc()).first()
+
+def copy_cached_result(source: Backtest, target: Backtest) -> None:
+    """Copy the stored results and metrics of one backtest onto another."""
+    target.results = source.results
+
+    if source.result_data is not None:
+        target.result_data = BacktestResultData(
+            equity_curve=source.result_data.equity_curve,
+            trades=source.result_data.trades,
+            equity_points=source.result_data.equity_points,
+            trade_count=source.result_data.trade_count
+        )
+
+    for column in (
+        "annualized_return", "sharpe_ratio", "sortino_ratio", "max_drawdown",
+        "win_rate", "total_trades", "profit_factor", "final_equity"
+    ):
+        setattr(target, column, getattr(source, column))
+
+    target.cache_hit = True
+
+class ResultCacheStats:
+    """Hit and miss counters, shared through Redis when it is available."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0}
+
+    def record_hit(self) -> None:
+        """Count a backtest served from the cache."""
+        self._record("hits")
+
+    def record_miss(self) -> None:
+        """Count a backtest that had to be computed."""
+        self._record("misses")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current counters and hit rate."""
+        counts = None
+
+        if redis_client is not None:
+            try:
+                stored = redis_client.hgetall(_STATS_KEY)
+                counts = {name: int(stored.get(name, 0)) for name in ("hits", "misses")}
+            except RedisError as e:
+                logger.error(f"Redis stats error: {str(e)}")
+
+        if counts is None:
+            with self._lock:
+                counts = dict(self._counts)
+
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "lookups": lookups,
+            "hit_rate": counts["hits"] / lookups if lookups else 0.0
+        }
+
+    def _record(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+        if redis_client is not None:
+            try:
+                redis_client.hincrby(_STATS_KEY, name, 1)
+            except RedisError as e:
+                logger.error(f"Redis stats error: {str(e)}")
+
+result_cache_stats = ResultCacheStats()
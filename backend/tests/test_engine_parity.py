@@ -0,0 +1,88 @@
+"""Vectorized sizing and the array engine match a bar-by-bar replay of calculate_position_sizes."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.algorithms.base import BaseAlgorithm
+from backend.algorithms.engine import simulate
+from backend.algorithms.mean_reversion import MeanReversionStrategy
+from backend.algorithms.trend_following import TrendFollowingStrategy
+from backend.benchmarks.indicators import make_bars
+
+INITIAL_CAPITAL = 10000.0
+
+# Bars whose close is missing or not positive, after the indicators have warmed up
+MISSING_BARS = [150, 151, 260]
+NON_POSITIVE_BARS = {200: 0.0, 320: -1.0}
+
+STRATEGIES = [
+    pytest.param(TrendFollowingStrategy({"fast_ma_window": 5, "slow_ma_window": 20}), id="trend_following"),
+    pytest.param(MeanReversionStrategy({"bollinger_window": 10, "rsi_window": 5, "rsi_oversold": 40, "rsi_overbought": 60}), id="mean_reversion")
+]
+
+@pytest.fixture(scope="module")
+def bars() -> pd.DataFrame:
+    # Large moves so that both strategies trade within a few hundred bars
+    data = make_bars(400, seed=3)
+    data[["open", "high", "low", "close"]] = data[["open", "high", "low", "close"]].pow(4) / 100 ** 3
+    data.iloc[MISSING_BARS, data.columns.get_loc("close")] = np.nan
+    for bar, price in NON_POSITIVE_BARS.items():
+        data.iloc[bar, data.columns.get_loc("close")] = price
+    return data
+
+def _replay(algorithm: BaseAlgorithm, data: pd.DataFrame, initial_capital: float) -> np.ndarray:
+    # Size each bar from every bar up to it and the portfolio value at that moment
+    close = data["close"].to_numpy(dtype=np.float64)
+    cash, position, mark = initial_capital, 0.0, 0.0
+    equity = np.zeros(len(data))
+
+    for i in range(len(data)):
+        price = close[i]
+        tradable = np.isfinite(price) and price > 0
+        if tradable:
+            mark = price
+
+        value = cash + position * mark
+        if tradable and value > 0:
+            quantity = algorithm.calculate_position_sizes(data.iloc[:i + 1], value)["position_size"].iloc[-1]
+            if np.isfinite(quantity) and quantity != 0:
+                cash -= quantity * price
+                position += quantity
+
+        equity[i] = cash + position * mark
+
+    return equity
+
+@pytest.mark.parametrize("algorithm", STRATEGIES)
+def test_position_units_match_prefix_replay(algorithm, bars):
+    signals = algorithm.generate_signals(bars)
+    units = algorithm.calculate_position_units(signals).to_numpy(dtype=np.float64)
+    replayed = BaseAlgorithm.calculate_position_units(algorithm, signals).to_numpy(dtype=np.float64)
+
+    close = signals["close"].to_numpy()
+    tradable = np.isfinite(close) & (close > 0)
+    assert np.count_nonzero(np.nan_to_num(units)) > 2
+    # Orders on bars without a tradable close are dropped by the engine either way
+    np.testing.assert_allclose(np.nan_to_num(units[tradable]), np.nan_to_num(replayed[tradable]), rtol=1e-12)
+
+@pytest.mark.parametrize("algorithm", STRATEGIES)
+def test_simulation_matches_prefix_replay(algorithm, bars):
+    signals = algorithm.generate_signals(bars)
+    simulation = simulate(
+        signals["close"].to_numpy(dtype=np.float64),
+        algorithm.calculate_position_units(signals).to_numpy(dtype=np.float64),
+        INITIAL_CAPITAL
+    )
+
+    assert np.count_nonzero(simulation["fills"]) > 2
+    assert np.isfinite(simulation["equity"]).all()
+    np.testing.assert_allclose(simulation["equity"], _replay(algorithm, signals, INITIAL_CAPITAL), rtol=1e-9)
+
+@pytest.mark.parametrize("algorithm", STRATEGIES)
+def test_backtest_matches_prefix_replay(algorithm, bars):
+    results = algorithm.backtest(bars, INITIAL_CAPITAL, columnar=True)
+    expected = _replay(algorithm, algorithm.generate_signals(bars), INITIAL_CAPITAL)
+
+    np.testing.assert_allclose(results["equity_curve"]["portfolio_value"].to_numpy(), expected, rtol=1e-9)
+    assert results["metrics"]["final_portfolio_value"] == pytest.approx(expected[-1], rel=1e-9)
@@ -0,0 +1,60 @@
+"""Indicator plans give the same values whatever the indicator cache holds."""
+
+import numpy as np
+import pytest
+
+from backend.algorithms.utils import indicator_graph as graph
+from backend.algorithms.utils.indicator_cache import DEFAULT_MAX_BYTES, indicator_cache
+from backend.benchmarks.indicators import make_bars
+from backend.utils.precision import price_dtype, set_price_dtype
+
+@pytest.fixture
+def float32_cache():
+    configured = price_dtype().name
+    cache_bytes, cache_remote = indicator_cache.max_bytes, indicator_cache.remote
+
+    set_price_dtype("float32")
+    indicator_cache.configure(DEFAULT_MAX_BYTES)
+    indicator_cache.clear()
+    yield
+    indicator_cache.clear()
+    indicator_cache.configure(cache_bytes, cache_remote)
+    set_price_dtype(configured)
+
+def _outputs(names, nodes):
+    return dict(zip(names, nodes))
+
+PLANS = {
+    # Upper and lower bands are computed from the middle band
+    "bollinger": (
+        _outputs(("middle_band", "upper_band", "lower_band"), graph.bollinger_bands(graph.column("close"))),
+        ["middle_band"]
+    ),
+    # The signal line and histogram are computed from the MACD line
+    "macd": (
+        _outputs(("macd", "macd_signal", "macd_histogram"), graph.macd(graph.column("close"))),
+        ["macd"]
+    ),
+    "stochastic": (
+        _outputs(("stoch_k", "stoch_d"), graph.stochastic(graph.column("high"), graph.column("low"), graph.column("close"))),
+        ["stoch_k"]
+    )
+}
+
+@pytest.mark.parametrize("name", PLANS)
+def test_partially_warm_cache_matches_cold_run(name, float32_cache):
+    outputs, warmed = PLANS[name]
+    plan = graph.plan_indicators(outputs)
+    data = make_bars(5000, seed=11)
+
+    cold = plan.evaluate(data)
+    indicator_cache.clear()
+
+    plan.evaluate(data, warmed)
+    hits = indicator_cache.stats()["hits"]
+    warm = plan.evaluate(data)
+
+    assert indicator_cache.stats()["hits"] == hits + len(warmed)
+    for output, values in cold.items():
+        assert warm[output].dtype == np.float32
+        np.testing.assert_array_equal(warm[output], values, err_msg=output)
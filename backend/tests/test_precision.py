@@ -0,0 +1,16 @@
+"""Float32 drift from float64 stays within the precision budgets."""
+
+from backend.benchmarks.indicators import make_bars
+from backend.benchmarks.precision import DRIFT_BUDGETS, compare_policies, measure_drift
+from backend.utils.precision import price_dtype
+
+def test_float32_drift_within_budgets():
+    universe = {f"SYM{i}": make_bars(20_000, seed=i) for i in range(5)}
+    configured = price_dtype()
+
+    full, reduced = compare_policies(universe, repeat=1)
+    drift = measure_drift(reduced, full)
+
+    for name, budget in DRIFT_BUDGETS.items():
+        assert drift[name] <= budget, f"{name} drift {drift[name]:.3g} exceeds {budget:g}"
+    assert price_dtype() == configured
@@ -0,0 +1,85 @@
+"""Streaming indicators and signal streams reproduce their batch versions bar for bar."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.algorithms.mean_reversion import MeanReversionStrategy
+from backend.algorithms.trend_following import TrendFollowingStrategy
+from backend.algorithms.utils import kernels, streaming
+from backend.benchmarks.indicators import make_bars
+
+# Single missing bars and a gap longer than every window
+GAPS = [300, 301, 650, *range(900, 960)]
+
+@pytest.fixture(scope="module", params=[False, True], ids=["complete", "gaps"])
+def bars(request) -> pd.DataFrame:
+    data = make_bars(2000, seed=7)
+    if request.param:
+        data.iloc[GAPS, [data.columns.get_loc(name) for name in ("high", "low", "close")]] = np.nan
+    return data
+
+def _stream(indicator: streaming.StreamingIndicator, data: pd.DataFrame) -> np.ndarray:
+    # One row per bar, one column per output of the indicator
+    values = [indicator.update(row) for row in data.to_dict("records")]
+    return np.array(values, dtype=np.float64).reshape(len(data), -1)
+
+def _batch(*outputs: np.ndarray) -> np.ndarray:
+    return np.column_stack(outputs)
+
+INDICATORS = {
+    "sma": (lambda: streaming.StreamingSMA(20), lambda df: _batch(kernels.sma(df["close"].to_numpy(), 20))),
+    "ema": (lambda: streaming.StreamingEMA(20), lambda df: _batch(kernels.ema(df["close"].to_numpy(), 20))),
+    "bollinger": (
+        lambda: streaming.StreamingBollingerBands(20, 2.0),
+        lambda df: _batch(*kernels.bollinger_bands(df["close"].to_numpy(), 20, 2.0))
+    ),
+    "rsi": (lambda: streaming.StreamingRSI(14), lambda df: _batch(kernels.rsi(df["close"].to_numpy(), 14))),
+    "rsi_wilder": (
+        lambda: streaming.StreamingRSI(14, smoothing="wilder"),
+        lambda df: _batch(kernels.rsi(df["close"].to_numpy(), 14, smoothing="wilder"))
+    ),
+    "macd": (lambda: streaming.StreamingMACD(12, 26, 9), lambda df: _batch(*kernels.macd(df["close"].to_numpy(), 12, 26, 9))),
+    "atr": (
+        lambda: streaming.StreamingATR(14),
+        lambda df: _batch(kernels.atr(df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), 14))
+    ),
+    "stochastic": (
+        lambda: streaming.StreamingStochastic(14, 3, 3),
+        lambda df: _batch(*kernels.stochastic(df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), 14, 3, 3))
+    )
+}
+
+@pytest.mark.parametrize("name", INDICATORS)
+def test_indicator_updates_match_kernels(name, bars):
+    create, batch = INDICATORS[name]
+
+    np.testing.assert_array_equal(_stream(create(), bars), batch(bars))
+
+STRATEGIES = [
+    pytest.param(TrendFollowingStrategy({"ma_type": "sma"}), id="trend_following_sma"),
+    pytest.param(TrendFollowingStrategy({"ma_type": "ema"}), id="trend_following_ema"),
+    pytest.param(MeanReversionStrategy({"rsi_oversold": 40, "rsi_overbought": 60}), id="mean_reversion")
+]
+
+@pytest.mark.parametrize("algorithm", STRATEGIES)
+def test_signal_stream_matches_generate_signals(algorithm, bars):
+    expected = algorithm.generate_signals(bars)
+    stream = algorithm.create_signal_stream()
+
+    signals = [stream.update(row) for row in bars.to_dict("records")]
+
+    assert np.count_nonzero(expected["signal"]) > 0
+    np.testing.assert_array_equal(signals, expected["signal"].to_numpy())
+    # The stream's latest indicators are those generate_signals computed for the last bar
+    for column, value in stream.indicators.items():
+        np.testing.assert_array_equal(value, expected[column].iloc[-1])
+
+@pytest.mark.parametrize("algorithm", STRATEGIES)
+def test_warm_up_continues_like_the_full_series(algorithm, bars):
+    expected = algorithm.generate_signals(bars)["signal"].to_numpy()
+    stream = algorithm.create_signal_stream()
+
+    assert stream.warm_up(bars.iloc[:1500]) == expected[1499]
+    signals = [stream.update(row) for row in bars.iloc[1500:].to_dict("records")]
+    np.testing.assert_array_equal(signals, expected[1500:])
@@ -9,9 +9,13 @@ that are used across different parts of the application.
 from backend.utils import validation
 from backend.utils import security
 from backend.utils import logging
+from backend.utils import memory
+from backend.utils import precision
 
 __all__ = [
     "validation",
     "security",
-    "logging"
+    "logging",
+    "memory",
+    "precision"
 ]
\ No newline at end of file
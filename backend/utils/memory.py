@@ -0,0 +1,79 @@
+# backend/utils/memory.py
+"""Resident memory measurement for long-running jobs."""
+
+import os
+import sys
+import threading
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+MB = 1024 * 1024
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Get the current resident set size of this process.
+
+    Returns:
+        Resident memory in bytes, or None if it cannot be measured
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    # Without /proc only the lifetime peak is available
+    return _lifetime_peak_bytes()
+
+def _lifetime_peak_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class PeakMemoryTracker:
+    """
+    Track the peak resident memory of this process while a job runs.
+
+    The peak is the largest of the samples taken with sample(), so callers
+    sample at the points where the job holds the most memory. The kernel's
+    high-water mark is not used: resetting it is process-wide and would
+    clear the peak of jobs running concurrently in other threads. Without a
+    current measurement the process lifetime peak is used instead. Memory is
+    measured for the whole process, so jobs running concurrently in other
+    threads are included, while child processes are not.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sampled_peak = current_rss_bytes() or 0
+
+    def sample(self) -> Optional[int]:
+        """
+        Measure the current resident memory and include it in the peak.
+
+        Returns:
+            Current resident memory in bytes, or None if it cannot be measured
+        """
+        current = current_rss_bytes()
+        if current is not None:
+            with self._lock:
+                self._sampled_peak = max(self._sampled_peak, current)
+        return current
+
+    @property
+    def peak_bytes(self) -> Optional[int]:
+        """Peak resident memory in bytes since tracking started."""
+        self.sample()
+        return self._sampled_peak or None
+
+    @property
+    def peak_mb(self) -> Optional[float]:
+        """Peak resident memory in megabytes since tracking started."""
+        peak = self.peak_bytes
+        return round(peak / MB, 1) if peak is not None else None
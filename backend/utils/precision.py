@@ -0,0 +1,83 @@
+# backend/utils/precision.py
+"""
+Floating-point precision policy for market data and indicators.
+
+PRICE_DTYPE selects float32 or float64 storage for the price columns of
+market data and for indicator columns. Float32 halves the memory and
+bandwidth of large universes. Indicators are still computed in float64 and
+only stored in the policy's dtype, and the simulation engine accumulates
+cash, positions and PnL in float64 whatever the policy.
+
+Float32 can still change backtest outcomes materially: a signal whose
+indicator lies within rounding of its threshold may flip, and the trades
+after it differ. Use float32 where results are not compared trade for trade
+with float64 ones, such as screening and indicator research.
+"""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+
+PRICE_DTYPES = ("float32", "float64")
+
+# Counts that float32 cannot represent exactly stay in float64
+EXCLUDED_COLUMNS = ("volume",)
+
+def _validate(dtype: str) -> np.dtype:
+    if str(dtype) not in PRICE_DTYPES:
+        raise ValueError(f"Unsupported price dtype: {dtype}")
+    return np.dtype(str(dtype))
+
+_price_dtype = _validate(settings.PRICE_DTYPE)
+
+def price_dtype() -> np.dtype:
+    """Get the dtype of price and indicator columns."""
+    return _price_dtype
+
+def set_price_dtype(dtype: str) -> None:
+    """
+    Set the dtype of price and indicator columns for this process.
+
+    Args:
+        dtype: 'float32' or 'float64'
+    """
+    global _price_dtype
+    _price_dtype = _validate(dtype)
+
+def to_price_dtype(values: np.ndarray) -> np.ndarray:
+    """
+    Cast a floating-point array to the price dtype.
+
+    Args:
+        values: Array of prices or indicator values
+
+    Returns:
+        The array itself if it already has the price dtype or is not
+        floating-point, otherwise a cast copy
+    """
+    if values.dtype.kind != "f":
+        return values
+    return values.astype(_price_dtype, copy=False)
+
+def cast_price_columns(df: pd.DataFrame, exclude: Sequence[str] = EXCLUDED_COLUMNS) -> pd.DataFrame:
+    """
+    Cast the floating-point columns of market data to the price dtype.
+
+    Args:
+        df: DataFrame with market data
+        exclude: Columns left unchanged
+
+    Returns:
+        DataFrame with cast columns, or df itself if nothing needs casting
+    """
+    dtypes = {
+        column: _price_dtype
+        for column, dtype in df.dtypes.items()
+        if column not in exclude and dtype.kind == "f" and dtype != _price_dtype
+    }
+    if not dtypes:
+        return df
+    return df.astype(dtypes, copy=False)
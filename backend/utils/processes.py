@@ -0,0 +1,21 @@
+# backend/utils/processes.py
+"""Start method for worker process pools."""
+
+import multiprocessing
+from multiprocessing.context import BaseContext
+
+def pool_context() -> BaseContext:
+    """
+    Get the multiprocessing context for worker process pools.
+
+    Pools are created from backtest worker and request threads while other
+    threads may hold logging, database or Redis locks. A forked child would
+    inherit such a lock held, with no thread left to release it, so children
+    are started by a fork server where available and spawned otherwise. Pool
+    functions and their arguments must therefore be picklable.
+
+    Returns:
+        Context to pass as mp_context to ProcessPoolExecutor
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
@@ -0,0 +1,33 @@
+"""
+Standalone backtest worker.
+
+Run with `python -m backend.worker` alongside an API started with
+RUN_EMBEDDED_WORKERS=False and BACKTEST_QUEUE=redis, so backtests execute
+outside the API processes.
+"""
+
+import signal
+import threading
+
+from backend.config import settings
+from backend.services.job_service import start_worker_pool, stop_worker_pool
+from backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+def main():
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}, stopping backtest workers")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    start_worker_pool(settings.BACKTEST_WORKERS)
+    stop_event.wait()
+    stop_worker_pool()
+
+if __name__ == "__main__":
+    main()
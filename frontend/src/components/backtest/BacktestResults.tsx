@@ -14,8 +14,8 @@ import {
 } from 'chart.js';
 import { format } from 'date-fns';
 
-import api from '../../services/api';
-import { Backtest, BacktestTrade } from '../../types/backtest';
+import api, { streamEvents } from '../../services/api';
+import { Backtest, BacktestProgress, BacktestTrade, EquityCurvePoint, ResultPage } from '../../types/backtest';
 
 // Register Chart.js components
 ChartJS.register(
@@ -29,6 +29,8 @@ ChartJS.register(
   Filler
 );
 
+const TRADES_PAGE_SIZE = 100;
+
 // Types
 interface BacktestResultsProps {
   backtestId: number;
@@ -39,38 +41,86 @@ const BacktestResults: React.FC<BacktestResultsProps> = ({ backtestId }) => {
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const [activeTab, setActiveTab] = useState<'overview' | 'trades' | 'metrics'>('overview');
+  const [equityCurve, setEquityCurve] = useState<EquityCurvePoint[]>([]);
+  const [trades, setTrades] = useState<BacktestTrade[]>([]);
+  const [totalTrades, setTotalTrades] = useState<number>(0);
+  const [liveProgress, setLiveProgress] = useState<BacktestProgress | null>(null);
+  
+  const fetchBacktest = async () => {
+    try {
+      const data = await api.get<Backtest>(`/backtesting/${backtestId}`);
+      setBacktest(data);
+    } catch (err: any) {
+      setError(err.message || 'Failed to load backtest results');
+    } finally {
+      setLoading(false);
+    }
+  };
   
   useEffect(() => {
-    const fetchBacktest = async () => {
-      try {
-        const data = await api.get<Backtest>(`/backtesting/${backtestId}`);
-        setBacktest(data);
-      } catch (err: any) {
-        setError(err.message || 'Failed to load backtest results');
-      } finally {
-        setLoading(false);
-      }
-    };
-    
     fetchBacktest();
+  }, [backtestId]);
+  
+  // Stream live progress while the backtest is pending or running
+  const isActive = backtest?.status === 'pending' || backtest?.status === 'running';
+  
+  useEffect(() => {
+    if (!isActive) {
+      return;
+    }
     
-    // Poll for updates if the backtest is still running
-    const interval = setInterval(async () => {
-      if (backtest && (backtest.status === 'pending' || backtest.status === 'running')) {
-        const data = await api.get<Backtest>(`/backtesting/${backtestId}`);
-        setBacktest(data);
+    const close = streamEvents<BacktestProgress>(
+      `/backtesting/${backtestId}/stream`,
+      (snapshot) => {
+        setLiveProgress(snapshot);
         
-        if (data.status === 'completed' || data.status === 'failed') {
-          clearInterval(interval);
+        // Reload the full backtest once it has finished
+        if (snapshot.status !== 'pending' && snapshot.status !== 'running') {
+          fetchBacktest();
         }
-      } else {
-        clearInterval(interval);
+      },
+      (err) => setError(err.message || 'Lost connection to the backtest progress stream')
+    );
+    
+    return close;
+  }, [backtestId, isActive]);
+  
+  // Load the equity curve and first page of trades once the backtest has completed
+  useEffect(() => {
+    if (backtest?.status !== 'completed') {
+      return;
+    }
+    
+    const fetchResults = async () => {
+      try {
+        const [curve, firstTrades] = await Promise.all([
+          api.get<ResultPage<EquityCurvePoint>>(`/backtesting/${backtestId}/equity-curve`),
+          api.get<ResultPage<BacktestTrade>>(`/backtesting/${backtestId}/trades`, { limit: TRADES_PAGE_SIZE }),
+        ]);
+        setEquityCurve(curve.items);
+        setTrades(firstTrades.items);
+        setTotalTrades(firstTrades.total);
+      } catch (err: any) {
+        setError(err.message || 'Failed to load backtest results');
       }
-    }, 5000);
+    };
     
-    return () => clearInterval(interval);
+    fetchResults();
   }, [backtestId, backtest?.status]);
   
+  const loadMoreTrades = async () => {
+    try {
+      const page = await api.get<ResultPage<BacktestTrade>>(`/backtesting/${backtestId}/trades`, {
+        skip: trades.length,
+        limit: TRADES_PAGE_SIZE,
+      });
+      setTrades([...trades, ...page.items]);
+      setTotalTrades(page.total);
+    } catch (err: any) {
+      setError(err.message || 'Failed to load trades');
+    }
+  };
+  
   if (loading) {
     return (
       <div className="bg-white rounded-lg shadow-card p-6">
@@ -106,19 +156,62 @@ const BacktestResults: React.FC<BacktestResultsProps> = ({ backtestId }) => {
   }
   
   if (backtest.status === 'pending' || backtest.status === 'running') {
+    const status = liveProgress?.status || backtest.status;
+    const progress = liveProgress?.progress ?? backtest.progress ?? 0;
+    const partialCurve = liveProgress?.equity_curve || [];
+    
     return (
       <div className="bg-white rounded-lg shadow-card p-6">
         <div className="flex flex-col items-center justify-center py-12">
           <div className="w-12 h-12 border-4 border-primary-500 border-t-transparent rounded-full animate-spin mb-4"></div>
           <h3 className="text-lg font-medium text-neutral-800">
-            Backtest {backtest.status === 'pending' ? 'Pending' : 'Running'}...
+            Backtest {status === 'pending' ? 'Pending' : 'Running'}...
           </h3>
           <p className="text-sm text-neutral-500 mt-2">
-            {backtest.status === 'pending' 
+            {status === 'pending' 
               ? 'Your backtest is in the queue and will start soon.' 
               : 'Your backtest is running. Results will appear automatically when complete.'}
           </p>
+          {status === 'running' && (
+            <div className="w-full max-w-md mt-6">
+              <div className="flex justify-between text-sm text-neutral-600 mb-1">
+                <span>
+                  {liveProgress?.current_date
+                    ? `Simulated through ${format(new Date(liveProgress.current_date), 'MMM d, yyyy')}`
+                    : 'Preparing data'}
+                </span>
+                <span>{(progress * 100).toFixed(0)}%</span>
+              </div>
+              <div className="w-full bg-neutral-200 rounded-full h-2">
+                <div
+                  className="bg-primary-500 h-2 rounded-full transition-all"
+                  style={{ width: `${Math.min(100, progress * 100)}%` }}
+                ></div>
+              </div>
+            </div>
+          )}
         </div>
+        {partialCurve.length > 1 && (
+          <div className="h-64">
+            <Line
+              data={{
+                labels: partialCurve.map(point => format(new Date(point.timestamp), 'MMM d, yyyy')),
+                datasets: [
+                  {
+                    label: 'Portfolio Value (partial)',
+                    data: partialCurve.map(point => point.portfolio_value),
+                    borderColor: 'rgb(59, 130, 246)',
+                    backgroundColor: 'rgba(59, 130, 246, 0.1)',
+                    fill: true,
+                    tension: 0.1,
+                    pointRadius: 0,
+                  },
+                ],
+              }}
+              options={{ responsive: true, maintainAspectRatio: false, animation: false }}
+            />
+          </div>
+        )}
       </div>
     );
   }
@@ -136,13 +229,13 @@ const BacktestResults: React.FC<BacktestResultsProps> = ({ backtestId }) => {
   
   // Prepare chart data for equity curve
   const equityCurveData = {
-    labels: backtest.results?.equity_curve.map(point => 
+    labels: equityCurve.map(point => 
       format(new Date(point.timestamp), 'MMM d, yyyy')
-    ) || [],
+    ),
     datasets: [
       {
         label: 'Portfolio Value',
-        data: backtest.results?.equity_curve.map(point => point.portfolio_value) || [],
+        data: equityCurve.map(point => point.portfolio_value),
         borderColor: 'rgb(59, 130, 246)',
         backgroundColor: 'rgba(59, 130, 246, 0.1)',
         fill: true,
@@ -369,7 +462,7 @@ const BacktestResults: React.FC<BacktestResultsProps> = ({ backtestId }) => {
           <div>
             <h3 className="text-lg font-medium text-neutral-900 mb-4">Trade History</h3>
             
-            {backtest.results?.trades && backtest.results.trades.length > 0 ? (
+            {trades.length > 0 ? (
               <div className="overflow-x-auto">
                 <table className="min-w-full divide-y divide-neutral-200">
                   <thead className="bg-neutral-50">
@@ -384,7 +477,7 @@ const BacktestResults: React.FC<BacktestResultsProps> = ({ backtestId }) => {
                     </tr>
                   </thead>
                   <tbody className="bg-white divide-y divide-neutral-200">
-                    {backtest.results.trades.map((trade: BacktestTrade, index: number) => (
+                    {trades.map((trade: BacktestTrade, index: number) => (
                       <tr key={index}>
                         <td className="px-6 py-4 whitespace-nowrap text-sm text-neutral-900">
                           {format(new Date(trade.timestamp), 'MMM d, yyyy')}
@@ -421,6 +514,16 @@ const BacktestResults: React.FC<BacktestResultsProps> = ({ backtestId }) => {
                     ))}
                   </tbody>
                 </table>
+                {trades.length < totalTrades && (
+                  <div className="mt-4 text-center">
+                    <button
+                      onClick={loadMoreTrades}
+                      className="px-4 py-2 text-sm font-medium text-primary-600 hover:text-primary-700"
+                    >
+                      Load more trades ({trades.length} of {totalTrades})
+                    </button>
+                  </div>
+                )}
               </div>
             ) : (
               <div className="bg-neutral-50 p-6 rounded-md text-center">
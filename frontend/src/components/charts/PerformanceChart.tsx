@@ -68,8 +68,11 @@ const PerformanceChart: React.FC<PerformanceChartProps> = ({
           performanceData = response.performance_data;
           startValue = response.initial_value;
         } else if (backtestId) {
-          const response = await api.get(`/backtesting/${backtestId}`);
-          performanceData = response.results?.equity_curve;
+          const [response, curve] = await Promise.all([
+            api.get(`/backtesting/${backtestId}`),
+            api.get(`/backtesting/${backtestId}/equity-curve`),
+          ]);
+          performanceData = curve.items;
           startValue = response.initial_capital;
         } else if (strategyId) {
           const response = await api.get(`/strategies/${strategyId}/performance?timeframe=${selectedTimeframe}`);
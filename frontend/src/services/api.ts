@@ -77,4 +77,70 @@ export const api = {
   },
 };
 
+// Subscribe to a Server-Sent Events endpoint. EventSource cannot send the
+// Authorization header, so the stream is read with fetch instead.
+// Returns a function that closes the stream.
+export const streamEvents = <T>(
+  url: string,
+  onEvent: (data: T) => void,
+  onError?: (error: Error) => void
+): (() => void) => {
+  const controller = new AbortController();
+  
+  const read = async () => {
+    const token = localStorage.getItem('auth_token');
+    const response = await fetch(`${API_BASE_URL}${url}`, {
+      headers: {
+        Accept: 'text/event-stream',
+        ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      },
+      signal: controller.signal,
+    });
+    
+    if (!response.ok || !response.body) {
+      throw new Error(`Stream request failed with status ${response.status}`);
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) {
+        break;
+      }
+      
+      buffer += decoder.decode(value, { stream: true });
+      
+      // Events are separated by a blank line; comments (keep-alives) start with ':'
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        
+        const data = frame
+          .split('\n')
+          .filter(line => line.startsWith('data:'))
+          .map(line => line.slice(5).trim())
+          .join('\n');
+        
+        if (data) {
+          onEvent(JSON.parse(data) as T);
+        }
+        
+        boundary = buffer.indexOf('\n\n');
+      }
+    }
+  };
+  
+  read().catch((error) => {
+    if (!controller.signal.aborted && onError) {
+      onError(error);
+    }
+  });
+  
+  return () => controller.abort();
+};
+
 export default api;
\ No newline at end of file
@@ -11,8 +11,15 @@ export interface Backtest {
     end_date: string; // ISO date string
     symbols: string[];
     initial_capital: number;
+    mode?: BacktestMode;
+    max_position_pct?: number;
+    max_gross_exposure?: number;
     status: BacktestStatus;
     error_message?: string;
+    progress?: number; // Fraction of the run completed (0-1)
+    cache_hit?: boolean; // Results were reused from an identical backtest
+    peak_memory_mb?: number; // Peak resident memory of the worker during the run
+    timeframe?: '1Day' | '1Hour' | '1Min'; // Intraday bars come from the local bar store
     created_at: string; // ISO date string
     started_at?: string; // ISO date string
     completed_at?: string; // ISO date string
@@ -31,7 +38,12 @@ export interface Backtest {
   /**
    * Possible statuses for a backtest
    */
-  export type BacktestStatus = 'pending' | 'running' | 'completed' | 'failed';
+  export type BacktestStatus = 'pending' | 'running' | 'completed' | 'failed' | 'cancelled';
+  
+  /**
+   * How a multi-symbol backtest allocates capital
+   */
+  export type BacktestMode = 'independent' | 'portfolio';
   
   /**
    * Interface for backtest creation request
@@ -42,17 +54,29 @@ export interface Backtest {
     end_date: string; // ISO date string
     symbols: string[];
     initial_capital?: number;
+    mode?: BacktestMode;
+    max_position_pct?: number;
+    max_gross_exposure?: number;
   }
   
   /**
-   * Interface for complete backtest results
+   * Interface for summary backtest results
+   * (equity curve and trades are fetched from their own paged endpoints)
    */
   export interface BacktestResults {
-    equity_curve: EquityCurvePoint[];
-    trades: BacktestTrade[];
     metrics: BacktestMetrics;
   }
   
+  /**
+   * Interface for a page of equity curve points or trades
+   */
+  export interface ResultPage<T> {
+    total: number;
+    skip: number;
+    limit?: number;
+    items: T[];
+  }
+  
   /**
    * Interface for a point in the equity curve
    */
@@ -83,9 +107,14 @@ export interface Backtest {
    */
   export interface BacktestMetrics {
     annualized_return: number;
+    cagr?: number;
     sharpe_ratio: number;
     sortino_ratio?: number;
+    calmar_ratio?: number;
     max_drawdown: number;
+    max_drawdown_duration?: number; // Bars
+    exposure?: number; // Fraction of bars with an open position
+    turnover?: number; // Annual traded value relative to average equity
     win_rate: number;
     total_trades: number;
     profit_factor?: number;
@@ -118,4 +147,55 @@ export interface Backtest {
     symbols: string[];
     start_date: string;
     end_date: string;
-  }
\ No newline at end of file
+  }  
+  /**
+   * Interface for a Monte Carlo robustness analysis request
+   */
+  export interface RobustnessRequest {
+    method?: 'block_bootstrap' | 'trade_shuffle';
+    n_paths?: number;
+    block_size?: number;
+    confidence_level?: number;
+    seed?: number;
+  }
+  
+  /**
+   * Interface for the resampled distribution of one metric
+   */
+  export interface MetricInterval {
+    observed: number;
+    mean: number;
+    median: number;
+    std: number;
+    lower: number;
+    upper: number;
+  }
+  
+  /**
+   * Interface for Monte Carlo robustness analysis results
+   */
+  export interface RobustnessResult {
+    method: 'block_bootstrap' | 'trade_shuffle';
+    n_paths: number;
+    block_size?: number;
+    confidence_level: number;
+    probability_of_loss: number;
+    metrics: {
+      sharpe_ratio: MetricInterval;
+      max_drawdown: MetricInterval;
+      final_equity: MetricInterval;
+    };
+  }
+  
+  /**
+   * Interface for a live progress snapshot of a running backtest
+   */
+  export interface BacktestProgress {
+    backtest_id: number;
+    status: BacktestStatus;
+    progress: number;
+    current_date?: string;
+    equity_curve: EquityCurvePoint[];
+    error_message?: string;
+    sequence: number;
+  }